@@ -21,8 +21,11 @@ from django.shortcuts import redirect
 from django.conf import settings
 from django.conf.urls.static import static
 
+from core import views as core_views
+
 urlpatterns = [
     path('', lambda request: redirect('login'), name='home'),  # 👈 Root redirect
+    path('admin/portal-stats/', core_views.portal_stats_view, name='portal_stats'),
     path('admin/', admin.site.urls),
     path('', include('core.urls')),  # 👈 Include your app's routes
 ]
@@ -0,0 +1,113 @@
+from django.db.models import Case, CharField, DateField, F, Func, Value, When
+from django.db.models.functions import Coalesce
+
+from .models import (
+    JournalPublication, ConferencePublication, ResearchProjects, Patents, CopyRights, PhdGuidance, BookChapter, Book, ConsultancyProjects, EditorialRoles, ReviewerRoles, Awards, IndustryCollaboration, FacultySubmission
+)
+
+
+class MonthStart(Func):
+    """
+    DATE of the first day of `year`/`month` (integer expressions, month 1-12),
+    NULL when the year is NULL; for models that record a year rather than a date.
+    """
+    arity = 2
+    output_field = DateField()
+
+    def _compile_parts(self, compiler):
+        parts, params = [], []
+        for expression in self.get_source_expressions():
+            sql, part_params = compiler.compile(expression)
+            parts.append(sql)
+            params.extend(part_params)
+        return parts, params
+
+    def as_sql(self, compiler, connection, **extra_context):
+        (year, month), params = self._compile_parts(compiler)
+        return f"make_date({year}, {month}, 1)", params
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        (year, month), params = self._compile_parts(compiler)
+        return f"date({year} || '-01-01', '+' || ({month} - 1) || ' months')", params
+
+    def as_mysql(self, compiler, connection, **extra_context):
+        (year, month), params = self._compile_parts(compiler)
+        return f"DATE_ADD(MAKEDATE({year}, 1), INTERVAL ({month}) - 1 MONTH)", params
+
+
+def publication_month(field='month'):
+    """JournalPublication's month name as 1-12; January when it was left blank."""
+    return Case(
+        *[When(**{field: value}, then=Value(number)) for number, (value, label) in enumerate(JournalPublication.month_of_publication, start=1)],
+        default=Value(1),
+    )
+
+
+# (kind, model, title field, date) for every research-output category.
+# `kind` matches the FacultySubmission.SUBMISSION_TYPE_CHOICES keys so labels stay in one place.
+# The date is a DateField name or, for models that only store a year, a MonthStart
+# expression; consultancy projects and reviewer roles record no date at all and project NULL.
+ACTIVITY_SOURCES = [
+    ('journal_publication', JournalPublication, 'title_of_paper', MonthStart(F('year_of_publication'), publication_month())),
+    ('conference_publication', ConferencePublication, 'title_of_paper', 'date_of_conference'),
+    ('research_projects', ResearchProjects, 'project_title', 'duration_from'),
+    ('patents', Patents, 'title_of_patent', 'date_of_published'),
+    ('copyrights', CopyRights, 'title_of_work', 'date_of_grant'),
+    ('phd_guidance', PhdGuidance, 'thesis_title', 'date_of_completion'),
+    ('book_chapter', BookChapter, 'chap_title', MonthStart(F('publication_year'), Value(1))),
+    ('book', Book, 'title_of_book', MonthStart(F('publication_year'), Value(1))),
+    ('consultancy_projects', ConsultancyProjects, 'project_title', None),
+    ('editorial_roles', EditorialRoles, 'journal_name', 'start_date'),
+    ('reviewer_roles', ReviewerRoles, 'journal_name', None),
+    ('awards', Awards, 'title_of_award', 'date_of_award'),
+    ('industry_collaboration', IndustryCollaboration, 'industry_name', 'start_date'),
+]
+
+ACTIVITY_LABELS = dict(FacultySubmission.SUBMISSION_TYPE_CHOICES)
+
+# Public sort keys mapped to the ORDER BY applied on the combined query.
+# Every ordering ends on (kind, object_id) so pages are stable.
+ACTIVITY_SORTS = {
+    'date': [F('date').asc(nulls_last=True), 'kind', 'object_id'],
+    '-date': [F('date').desc(nulls_last=True), 'kind', '-object_id'],
+    'title': ['title', 'kind', 'object_id'],
+    '-title': ['-title', 'kind', '-object_id'],
+    'kind': ['kind', F('date').desc(nulls_last=True), '-object_id'],
+}
+
+DEFAULT_ACTIVITY_SORT = '-date'
+
+
+def _activity_branch(user, kind, model, title_field, date_field):
+    """
+    Project one category model onto the common (kind, title, date, object_id) shape.
+    """
+    if date_field is None:
+        date = Value(None, output_field=DateField())
+    elif isinstance(date_field, str):
+        date = F(date_field)
+    else:
+        date = date_field
+
+    return model.objects.filter(user=user).order_by().annotate(
+        kind=Value(kind, output_field=CharField()),
+        title=Coalesce(F(title_field), Value(''), output_field=CharField()),
+        date=date,
+        object_id=F('pk'),
+    ).values('kind', 'title', 'date', 'object_id')
+
+
+def user_activity_feed(user, sort=DEFAULT_ACTIVITY_SORT):
+    """
+    Return every research-output record owned by `user` as a single UNION ALL queryset.
+
+    Rows are dicts with `kind`, `title`, `date` and `object_id` keys. The result is
+    lazy, so slicing it (e.g. through Paginator) issues one COUNT and one SELECT
+    no matter how many categories are registered in ACTIVITY_SOURCES.
+    """
+    branches = [_activity_branch(user, *source) for source in ACTIVITY_SOURCES]
+    feed = branches[0].union(*branches[1:], all=True)
+
+    if sort not in ACTIVITY_SORTS:
+        sort = DEFAULT_ACTIVITY_SORT
+    return feed.order_by(*ACTIVITY_SORTS[sort])
@@ -2,7 +2,7 @@ from django.contrib import admin
 from core.models import (
     CustomUser, UserOTP, JournalPublication, ConferencePublication, ResearchProjects,
     Patents, CopyRights, PhdGuidance, BookChapter, Book, ConsultancyProjects,
-    EditorialRoles, ReviewerRoles, Awards, IndustryCollaboration, UserFormProgress, AnnualFacultyReport, ResearchGrantApplication, ConferenceTravelRequest, PublicationsUpdate, CurriculumDevelopment, Task
+    EditorialRoles, ReviewerRoles, Awards, IndustryCollaboration, UserFormProgress, AnnualFacultyReport, ResearchGrantApplication, ConferenceTravelRequest, PublicationsUpdate, CurriculumDevelopment, Task, UserActivityCounters, OutgoingEmail
 )
 
 admin.site.register(CustomUser)
@@ -26,4 +26,6 @@ admin.site.register(ResearchGrantApplication)
 admin.site.register(ConferenceTravelRequest)
 admin.site.register(PublicationsUpdate)
 admin.site.register(CurriculumDevelopment)
-admin.site.register(Task)
\ No newline at end of file
+admin.site.register(Task)
+admin.site.register(UserActivityCounters)
+admin.site.register(OutgoingEmail)
\ No newline at end of file
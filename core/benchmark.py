@@ -0,0 +1,233 @@
+import gc
+import math
+import statistics
+import threading
+from itertools import cycle
+from time import perf_counter
+
+from django.contrib.auth.tokens import default_token_generator
+from django.db import connections
+from django.test import Client
+from django.urls import URLPattern, reverse
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+
+from . import urls as core_urls
+from .models import FacultySubmission, SubmissionReview
+from .profiling import query_timer, template_timer
+
+
+BENCHMARK_ROLES = ('faculty', 'cluster_head', 'dean')
+# Routes that would end the benchmark session part-way through.
+SKIPPED_URL_NAMES = {'logout'}
+# A route is only flagged as slower when its p95 grows by this fraction and this many ms.
+LATENCY_TOLERANCE = 0.25
+LATENCY_FLOOR_MS = 2.0
+# Statuses the write benchmark cycles each submission through.
+WRITE_ACTIONS = ('under_review', 'needs_revision', 'approved')
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[max(math.ceil(fraction * len(ordered)) - 1, 0)]
+
+
+def route_kwargs(pattern, user, submission):
+    """URL kwargs for the parameterized routes in core/urls.py."""
+    values = {
+        'submission_id': submission.pk,
+        'uidb64': urlsafe_base64_encode(force_bytes(user.pk)),
+        'token': default_token_generator.make_token(user),
+    }
+    return {name: values[name] for name in pattern.pattern.regex.groupindex}
+
+
+def benchmark_routes(names=None):
+    """Named GET-able routes of core/urls.py in declaration order, optionally limited to `names`."""
+    return [
+        pattern for pattern in core_urls.urlpatterns
+        if isinstance(pattern, URLPattern) and pattern.name
+        and pattern.name not in SKIPPED_URL_NAMES
+        and (names is None or pattern.name in names)
+    ]
+
+
+def measure(client, url):
+    """One GET: wall time, SQL count, SQL time and template time, all in ms."""
+    with query_timer() as queries, template_timer() as rendering:
+        start = perf_counter()
+        response = client.get(url)
+        if response.streaming:
+            for _ in response.streaming_content:
+                pass
+        elapsed = perf_counter() - start
+        response.close()
+    return {
+        'status': response.status_code,
+        'queries': queries.count,
+        'db_ms': queries.seconds * 1000,
+        'render_ms': rendering['seconds'] * 1000,
+        'wall_ms': elapsed * 1000,
+    }
+
+
+def benchmark_url(client, url, repeat=10, warmup=1):
+    """
+    Request `url` warmup + repeat times and summarise the measured runs.
+    With fewer than 20 runs p95 is the slowest run.
+    """
+    gc.collect()
+    for _ in range(warmup):
+        measure(client, url)
+    runs = [measure(client, url) for _ in range(repeat)]
+    wall = [run['wall_ms'] for run in runs]
+    return {
+        'url': url,
+        'status': runs[-1]['status'],
+        'queries': max(run['queries'] for run in runs),
+        'db_ms': round(statistics.median(run['db_ms'] for run in runs), 3),
+        'render_ms': round(statistics.median(run['render_ms'] for run in runs), 3),
+        'p50_ms': round(percentile(wall, 0.50), 3),
+        'p95_ms': round(percentile(wall, 0.95), 3),
+    }
+
+
+def benchmark_subjects(institution):
+    """
+    One user per role from a seeded institution, plus a submission by that
+    faculty member which the cluster head and the dean can both open.
+    """
+    faculty = institution.faculty[0]
+    head = next(user for user in institution.cluster_heads if user.department == faculty.department)
+    submission = (
+        FacultySubmission.objects.filter(user=faculty, reviewed_by__isnull=False).order_by('pk').first()
+        or FacultySubmission.objects.filter(user=faculty).order_by('pk').first()
+    )
+    return {'faculty': faculty, 'cluster_head': head, 'dean': institution.deans[0]}, submission
+
+
+def run_benchmark(users, submission, names=None, repeat=10, warmup=1):
+    """
+    Benchmark every route for every role. `users` maps role -> user and
+    `submission` is a FacultySubmission the cluster head and dean may review.
+    Returns {url_name: {role: result}}.
+    """
+    results = {}
+    clients = {}
+    for role, user in users.items():
+        # a failing view is reported as a 500, not raised
+        clients[role] = Client(raise_request_exception=False)
+        clients[role].force_login(user)
+    for pattern in benchmark_routes(names):
+        for role, user in users.items():
+            url = reverse(pattern.name, kwargs=route_kwargs(pattern, user, submission))
+            results.setdefault(pattern.name, {})[role] = benchmark_url(clients[role], url, repeat, warmup)
+    return results
+
+
+def compare_reports(report, baseline, tolerance=LATENCY_TOLERANCE, floor_ms=LATENCY_FLOOR_MS):
+    """
+    Regressions in `report` against `baseline` as readable strings: any change
+    of status code, any extra query, and p95 latency up by more than
+    `tolerance` (and `floor_ms`). Routes or roles absent from either side are skipped.
+    """
+    regressions = []
+    for name, roles in report['routes'].items():
+        for role, current in roles.items():
+            previous = baseline.get('routes', {}).get(name, {}).get(role)
+            if previous is None:
+                continue
+            label = f"{name} [{role}]"
+            if current['status'] != previous['status']:
+                regressions.append(f"{label}: status {previous['status']} -> {current['status']}")
+            if current['queries'] > previous['queries']:
+                regressions.append(f"{label}: queries {previous['queries']} -> {current['queries']}")
+            slower = current['p95_ms'] - previous['p95_ms']
+            if slower > floor_ms and current['p95_ms'] > previous['p95_ms'] * (1 + tolerance):
+                regressions.append(f"{label}: p95 {previous['p95_ms']:.1f}ms -> {current['p95_ms']:.1f}ms")
+    return regressions
+
+
+def review_writer(client, submission_ids, start, timings):
+    """POST review actions for `submission_ids` once `start` opens, appending (ms, status) to `timings`."""
+    actions = cycle(WRITE_ACTIONS)
+    start.wait()
+    try:
+        for pk in submission_ids:
+            url = reverse('review_submission', kwargs={'submission_id': pk})
+            began = perf_counter()
+            response = client.post(url, {'action': next(actions), 'comments': 'benchmark'})
+            timings.append(((perf_counter() - began) * 1000, response.status_code))
+    finally:
+        # each thread opened its own connection
+        connections.close_all()
+
+
+def dashboard_reader(client, start, done, timings):
+    """GET review_dashboard from when `start` opens until `done` is set, appending (ms, status) to `timings`."""
+    url = reverse('review_dashboard')
+    start.wait()
+    try:
+        while not done.is_set():
+            began = perf_counter()
+            response = client.get(url)
+            timings.append(((perf_counter() - began) * 1000, response.status_code))
+    finally:
+        connections.close_all()
+
+
+def timing_summary(timings, ok_status, elapsed):
+    latencies = [ms for ms, _ in timings]
+    errors = sum(status != ok_status for _, status in timings)
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'per_second': round((len(latencies) - errors) / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 0.50), 3) if latencies else None,
+        'p95_ms': round(percentile(latencies, 0.95), 3) if latencies else None,
+    }
+
+
+def run_write_benchmark(reviewers, submission_ids, writers, per_writer, readers=0):
+    """
+    `writers` threads, each logged in as the next of `reviewers` in turn, POST
+    review_submission for `per_writer` submissions of their own at the same
+    time, while `readers` more threads keep loading review_dashboard. A 302 is
+    a saved review and a 200 a served dashboard; anything else (a 500 from
+    "database is locked", say) counts as an error. Returns throughput and
+    latency for the writes, and under 'reads' for the dashboard loads.
+    """
+    if writers * per_writer > len(submission_ids):
+        raise ValueError(f"{writers} writers x {per_writer} reviews needs {writers * per_writer} submissions.")
+    reviews_before = SubmissionReview.objects.count()
+    start = threading.Barrier(writers + readers + 1)
+    done = threading.Event()
+    write_timings = [[] for _ in range(writers)]
+    read_timings = [[] for _ in range(readers)]
+    writer_threads, reader_threads = [], []
+    for number, reviewer in zip(range(writers + readers), cycle(reviewers)):
+        client = Client(raise_request_exception=False)
+        client.force_login(reviewer)
+        if number < writers:
+            batch = submission_ids[number * per_writer:(number + 1) * per_writer]
+            writer_threads.append(threading.Thread(target=review_writer, args=(client, batch, start, write_timings[number])))
+        else:
+            reader_threads.append(threading.Thread(target=dashboard_reader, args=(client, start, done, read_timings[number - writers])))
+    for thread in writer_threads + reader_threads:
+        thread.start()
+    start.wait()
+    began = perf_counter()
+    for thread in writer_threads:
+        thread.join()
+    elapsed = perf_counter() - began
+    done.set()
+    for thread in reader_threads:
+        thread.join()
+
+    result = {'writers': writers, 'readers': readers, 'seconds': round(elapsed, 3)}
+    result.update(timing_summary([timing for writer in write_timings for timing in writer], 302, elapsed))
+    result['saved'] = SubmissionReview.objects.count() - reviews_before
+    if readers:
+        result['reads'] = timing_summary([timing for reader in read_timings for timing in reader], 200, elapsed)
+    return result
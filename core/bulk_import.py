@@ -0,0 +1,249 @@
+import csv
+import io
+import os
+import zipfile
+from datetime import datetime
+
+from django.conf import settings
+from django.db import DatabaseError, transaction
+
+from .forms import (
+    JournalPublicationForm, ConferencePublicationForm, ResearchProjectsForm, PatentsForm, CopyRightsForm, PhdGuidanceForm, BookChapterForm, BookForm, ConsultancyProjectsForm, EditorialRolesForm, ReviewerRolesForm, AwardsForm, IndustryCollaborationForm
+)
+from .categories import submission_content, submission_title
+from .models import FacultySubmission, SubmissionContentValue, UserActivityCounters, UserFormProgress
+from .review_queue import invalidate_review_queue
+from .seeding import bulk_insert_returning
+
+
+# Research-output kinds that can be imported, keyed like ACTIVITY_SOURCES.
+# Each row is validated by the same ModelForm the single-record view uses.
+IMPORT_FORMS = {
+    'journal_publication': JournalPublicationForm,
+    'conference_publication': ConferencePublicationForm,
+    'research_projects': ResearchProjectsForm,
+    'patents': PatentsForm,
+    'copyrights': CopyRightsForm,
+    'phd_guidance': PhdGuidanceForm,
+    'book_chapter': BookChapterForm,
+    'book': BookForm,
+    'consultancy_projects': ConsultancyProjectsForm,
+    'editorial_roles': EditorialRolesForm,
+    'reviewer_roles': ReviewerRolesForm,
+    'awards': AwardsForm,
+    'industry_collaboration': IndustryCollaborationForm,
+}
+
+# Valid rows per chunk; each chunk is bulk_created and committed in its own transaction.
+IMPORT_BATCH_SIZE = getattr(settings, 'BULK_IMPORT_BATCH_SIZE', 500)
+
+# Invalid rows beyond this many are counted but their messages are dropped.
+MAX_REPORTED_ERRORS = 200
+
+
+class BulkImportError(Exception):
+    """The upload as a whole cannot be imported (unknown format, bad header, ...)."""
+
+
+class ImportResult:
+    """Totals for one import plus the per-row validation errors."""
+
+    def __init__(self):
+        self.created = 0
+        self.failed = 0
+        self.errors = []  # (line number, {field: [messages]})
+        self.chunks = 0  # chunks committed
+        self.imported_through = None  # last line of the last committed chunk
+        self.stopped = None  # why the import ended early, after some chunks were committed
+
+    def add_error(self, line, errors):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line, errors))
+
+    @property
+    def truncated(self):
+        return self.failed > len(self.errors)
+
+
+def read_rows(fileobj, filename):
+    """
+    Yield (line number, {header: value}) for every data row of a CSV or XLSX file.
+    Rows are produced one at a time, so large uploads are never held in memory.
+    A file that cannot be decoded or opened raises BulkImportError, even part-way.
+    """
+    extension = os.path.splitext(filename)[1].lower()
+    if extension == '.csv':
+        reader = csv.DictReader(io.TextIOWrapper(fileobj, encoding='utf-8-sig', newline=''))
+        try:
+            for row in reader:
+                yield reader.line_num, row
+        except UnicodeDecodeError:
+            raise BulkImportError(f"Line {reader.line_num + 1} is not valid UTF-8; save the file as CSV UTF-8 and upload it again.")
+        except csv.Error as e:
+            raise BulkImportError(f"Line {reader.line_num} could not be read as CSV: {e}")
+    elif extension == '.xlsx':
+        try:
+            import openpyxl
+            from openpyxl.utils.exceptions import InvalidFileException
+        except ImportError:
+            raise BulkImportError("Excel import needs the openpyxl package; upload a CSV file instead.")
+        try:
+            workbook = openpyxl.load_workbook(fileobj, read_only=True, data_only=True)
+        except (zipfile.BadZipFile, InvalidFileException, KeyError, OSError):
+            raise BulkImportError(f"{filename} is not a valid Excel workbook; save it as .xlsx and upload it again.")
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = [str(cell or '').strip() for cell in next(rows, ())]
+            for line, values in enumerate(rows, start=2):
+                yield line, dict(zip(header, values))
+        finally:
+            workbook.close()
+    else:
+        raise BulkImportError(f"Unsupported file type {extension or filename!r}; use .csv or .xlsx.")
+
+
+def _column_map(form):
+    """Accept either the field name or its label as a column header (case-insensitive)."""
+    columns = {}
+    for name, field in form.fields.items():
+        columns[name.lower()] = name
+        if field.label:
+            columns[str(field.label).strip().lower()] = name
+    return columns
+
+
+def _choice_map(form):
+    """field -> {label or value (lowercased): value} so spreadsheets may use display labels."""
+    choices = {}
+    for name, field in form.fields.items():
+        options = getattr(field, 'choices', None)
+        if options and not hasattr(field, 'queryset'):
+            mapping = {}
+            for value, label in options:
+                if value not in ('', None):
+                    mapping[str(value).lower()] = value
+                    mapping[str(label).lower()] = value
+            choices[name] = mapping
+    return choices
+
+
+def _row_data(row, columns, choices):
+    data = {}
+    for header, value in row.items():
+        name = columns.get(str(header or '').strip().lower())
+        if name is None:
+            continue
+        if value is None:
+            value = ''
+        elif isinstance(value, datetime):
+            value = value.date()
+        elif isinstance(value, str):
+            value = value.strip()
+        if name in choices and isinstance(value, str):
+            value = choices[name].get(value.lower(), value)
+        data[name] = value
+    return data
+
+
+def _import_form(form_class, instance, data):
+    form = form_class(data=data, instance=instance)
+    # the owner is fixed by the import, never read from the file
+    form.fields.pop('user', None)
+    return form
+
+
+def _review_submissions(kind, user, records, field_names):
+    """
+    Pending FacultySubmission rows for freshly imported records, written in bulk
+    so imports reach the review dashboard like single-record posts do.
+    """
+    # the content values need the submissions' ids, which MySQL's bulk insert does not return
+    submissions = bulk_insert_returning(FacultySubmission, [
+        FacultySubmission(
+            user=user,
+            submission_type=kind,
+            title=submission_title(kind, record),
+            content=submission_content(record, field_names),
+            department=user.department,
+            school=user.school,
+            status='pending',
+        )
+        for record in records
+    ], len(records), user=user, submission_type=kind)
+    # bulk_create skips post_save, so promote content keys here as sync_promoted_content would
+    SubmissionContentValue.objects.bulk_create(
+        [row for submission in submissions for row in SubmissionContentValue.extract(submission)]
+    )
+
+
+def import_records(kind, user, rows, batch_size=IMPORT_BATCH_SIZE):
+    """
+    Validate `rows` (as produced by read_rows) with the ModelForm for `kind` and
+    create the valid ones for `user`, each with a pending FacultySubmission for review.
+
+    Valid rows are written in chunks of `batch_size`, each bulk_created and committed
+    in its own transaction, so a large file never holds one long write transaction.
+    If the file turns out unreadable part-way (BulkImportError from read_rows) or a
+    chunk cannot be saved, the chunks before it stay imported and the result's
+    `stopped` says where the import ended; when that happens before any chunk was
+    committed, BulkImportError is raised and nothing is imported. Invalid rows are
+    reported in the returned ImportResult and never block the rest of the file.
+    """
+    if kind not in IMPORT_FORMS:
+        raise BulkImportError(f"Unknown record type {kind!r}.")
+    form_class = IMPORT_FORMS[kind]
+    model = form_class._meta.model
+
+    template = _import_form(form_class, model(user=user), None)
+    columns = _column_map(template)
+    choices = _choice_map(template)
+    counter_field = next(field for field, counted in UserActivityCounters.COUNTED_MODELS.items() if counted is model)
+
+    result = ImportResult()
+    batch = []  # (line number, unsaved record)
+
+    def flush():
+        chunk = result.chunks + 1
+        first, last = batch[0][0], batch[-1][0]
+        records = [record for line, record in batch]
+        try:
+            with transaction.atomic():
+                model.objects.bulk_create(records, batch_size=batch_size)
+                _review_submissions(kind, user, records, template.fields)
+                # bulk_create skips post_save, so bump the activity counter here
+                UserActivityCounters.adjust(user.pk, counter_field, len(records))
+                invalidate_review_queue()
+        except DatabaseError as e:
+            raise BulkImportError(f"Chunk {chunk} (lines {first}-{last}) could not be saved: {e}")
+        result.chunks = chunk
+        result.created += len(records)
+        result.imported_through = last
+        batch.clear()
+
+    try:
+        for line, row in rows:
+            data = _row_data(row, columns, choices)
+            if not any(value not in ('', None) for value in data.values()):
+                continue  # blank spreadsheet row
+            form = _import_form(form_class, model(user=user), data)
+            if form.is_valid():
+                batch.append((line, form.save(commit=False)))
+                if len(batch) >= batch_size:
+                    flush()
+            else:
+                result.add_error(line, {field: list(messages) for field, messages in form.errors.items()})
+
+        if batch:
+            flush()
+    except BulkImportError as e:
+        if not result.chunks:
+            raise
+        result.stopped = (
+            f"{e} The {result.chunks} chunk(s) through line {result.imported_through} were imported; "
+            f"upload the rows after line {result.imported_through} again."
+        )
+
+    if result.created:
+        UserFormProgress.objects.update_or_create(user=user, defaults={f'{kind}_progress': True})
+    return result
@@ -0,0 +1,101 @@
+import json
+from typing import NamedTuple, Optional
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models.fields.files import FieldFile
+
+from .forms import (
+    JournalPublicationForm, ConferencePublicationForm, ResearchProjectsForm, PatentsForm, CopyRightsForm, PhdGuidanceForm, BookChapterForm, BookForm, ConsultancyProjectsForm, EditorialRolesForm, ReviewerRolesForm, AwardsForm, IndustryCollaborationForm, AnnualFacultyReportForm, ResearchGrantApplicationForm, ConferenceTravelRequestForm, PublicationsUpdateForm, CurriculumDevelopmentForm
+)
+from .models import FacultySubmission
+
+
+class SubmissionCategory(NamedTuple):
+    form_class: type
+    template_name: str
+    # model field used as the FacultySubmission title; None falls back to the category label
+    title_field: Optional[str]
+    # UserFormProgress flag set by a successful post; None for categories without one
+    progress_field: Optional[str]
+    success_message: str
+
+
+# Every faculty form, keyed by FacultySubmission.submission_type.
+SUBMISSION_CATEGORIES = {
+    'journal_publication': SubmissionCategory(
+        JournalPublicationForm, 'journal_publication.html', 'title_of_paper',
+        'journal_publication_progress', 'Journal publication details saved successfully.'),
+    'conference_publication': SubmissionCategory(
+        ConferencePublicationForm, 'conference_publication.html', 'title_of_paper',
+        'conference_publication_progress', 'Conference publication details saved successfully.'),
+    'research_projects': SubmissionCategory(
+        ResearchProjectsForm, 'research_projects.html', 'project_title',
+        'research_projects_progress', 'Research project details saved successfully.'),
+    'patents': SubmissionCategory(
+        PatentsForm, 'patents.html', 'title_of_patent',
+        'patents_progress', 'Patent details saved successfully.'),
+    'copyrights': SubmissionCategory(
+        CopyRightsForm, 'copy_rights.html', 'title_of_work',
+        'copyrights_progress', 'Copyright details saved successfully.'),
+    'phd_guidance': SubmissionCategory(
+        PhdGuidanceForm, 'phd_guidance_form.html', 'thesis_title',
+        'phd_guidance_progress', 'PhD guidance details saved successfully.'),
+    'book_chapter': SubmissionCategory(
+        BookChapterForm, 'bookchapter_form.html', 'chap_title',
+        'book_chapter_progress', 'Book chapter details saved successfully.'),
+    'book': SubmissionCategory(
+        BookForm, 'book_form.html', 'title_of_book',
+        'book_progress', 'Book details saved successfully.'),
+    'consultancy_projects': SubmissionCategory(
+        ConsultancyProjectsForm, 'consultancy_project.html', 'project_title',
+        'consultancy_projects_progress', 'Consultancy project details saved successfully.'),
+    'editorial_roles': SubmissionCategory(
+        EditorialRolesForm, 'editorial_roles.html', 'journal_name',
+        'editorial_roles_progress', 'Editorial role details saved successfully.'),
+    'reviewer_roles': SubmissionCategory(
+        ReviewerRolesForm, 'reviewer_roles.html', 'journal_name',
+        'reviewer_roles_progress', 'Reviewer role details saved successfully.'),
+    'awards': SubmissionCategory(
+        AwardsForm, 'award_form.html', 'title_of_award',
+        'awards_progress', 'Award details saved successfully.'),
+    'industry_collaboration': SubmissionCategory(
+        IndustryCollaborationForm, 'industry_collaboration.html', 'industry_name',
+        'industry_collaboration_progress', 'Industry collaboration details saved successfully.'),
+    'annual_faculty_report': SubmissionCategory(
+        AnnualFacultyReportForm, 'Annual_faculty.html', None,
+        None, 'Annual faculty report details saved successfully.'),
+    'research_grant_application': SubmissionCategory(
+        ResearchGrantApplicationForm, 'Research_grant.html', 'title_of_research_proposal',
+        None, 'Research grant application details saved successfully.'),
+    'conference_travel_request': SubmissionCategory(
+        ConferenceTravelRequestForm, 'Conference_travel.html', 'title_of_conference',
+        None, 'Conference travel request details saved successfully.'),
+    'publications_update': SubmissionCategory(
+        PublicationsUpdateForm, 'Publications_update.html', 'title_of_publication',
+        None, 'Publications update details saved successfully.'),
+    'curriculum_development': SubmissionCategory(
+        CurriculumDevelopmentForm, 'curriculum_development.html', 'program_title',
+        None, 'Curriculum development details saved successfully.'),
+}
+
+CATEGORY_LABELS = dict(FacultySubmission.SUBMISSION_TYPE_CHOICES)
+
+
+def submission_title(kind, instance):
+    category = SUBMISSION_CATEGORIES[kind]
+    title = getattr(instance, category.title_field, None) if category.title_field else None
+    return (str(title) if title else CATEGORY_LABELS[kind])[:255]
+
+
+def submission_content(instance, field_names):
+    """
+    JSON-safe copy of the submitted fields for FacultySubmission.content:
+    dates and decimals become strings and uploaded files their stored name.
+    """
+    content = {}
+    for name in field_names:
+        value = getattr(instance, name, None)
+        if isinstance(value, FieldFile):
+            value = value.name or None
+        content[name] = value
+    return json.loads(json.dumps(content, cls=DjangoJSONEncoder))
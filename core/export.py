@@ -0,0 +1,151 @@
+import csv
+import json
+import tempfile
+from datetime import datetime
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+from .activity import ACTIVITY_SOURCES
+
+
+# Rows fetched per round trip while streaming an export.
+EXPORT_CHUNK_SIZE = getattr(settings, 'EXPORT_CHUNK_SIZE', 2000)
+
+# Excel caps a sheet at 1,048,576 rows; longer exports continue on a new sheet.
+XLSX_ROWS_PER_SHEET = 1_000_000
+
+SUBMISSION_EXPORT_FIELDS = [
+    'id', 'submission_type', 'title', 'description', 'status',
+    'user__username', 'user__email', 'department', 'school',
+    'submitted_at', 'updated_at',
+    'reviewed_by__username', 'reviewed_at', 'review_comments',
+]
+
+EXPORT_MODELS = {kind: model for kind, model, title_field, date_field in ACTIVITY_SOURCES}
+
+
+def content_keys(queryset):
+    """
+    Every top-level key used in `content` across `queryset`, sorted.
+    Worked out in the database where possible so the rows are not read twice in Python.
+    """
+    sql, params = queryset.order_by().values('content').query.sql_with_params()
+    if connection.vendor == 'sqlite':
+        keys_sql = f"SELECT DISTINCT j.key FROM ({sql}) s, json_each(s.content) j WHERE json_type(s.content) = 'object'"
+    elif connection.vendor == 'postgresql':
+        keys_sql = f"SELECT DISTINCT jsonb_object_keys(s.content) FROM ({sql}) s WHERE jsonb_typeof(s.content) = 'object'"
+    else:
+        keys = set()
+        for content in queryset.order_by().values_list('content', flat=True).iterator(chunk_size=EXPORT_CHUNK_SIZE):
+            if isinstance(content, dict):
+                keys.update(content)
+        return sorted(keys)
+
+    with connection.cursor() as cursor:
+        cursor.execute(keys_sql, params)
+        return sorted(row[0] for row in cursor.fetchall())
+
+
+def _flat(value):
+    """Nested JSON (lists, objects) goes into a single cell as JSON text."""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+def submission_rows(queryset):
+    """
+    (header, rows) for a FacultySubmission export with one `content.<key>` column per content key.
+    `rows` is a generator over values_list(...).iterator(), so only one chunk is held at a time.
+    """
+    keys = content_keys(queryset)
+    header = SUBMISSION_EXPORT_FIELDS + [f'content.{key}' for key in keys]
+
+    def rows():
+        values = queryset.order_by('pk').values_list(*SUBMISSION_EXPORT_FIELDS, 'content')
+        for row in values.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+            content = row[-1] if isinstance(row[-1], dict) else {}
+            yield row[:-1] + tuple(_flat(content.get(key)) for key in keys)
+
+    return header, rows()
+
+
+def category_rows(model, queryset):
+    """(header, rows) for one research-output model: every concrete column plus the owner."""
+    fields = [
+        field.attname if field.is_relation else field.name
+        for field in model._meta.concrete_fields
+    ]
+    fields += ['user__username', 'user__department']
+
+    def rows():
+        values = queryset.order_by('pk').values_list(*fields)
+        yield from values.iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+    return fields, rows()
+
+
+# A cell starting with one of these is run as a formula by Excel and Sheets.
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def spreadsheet_safe(value):
+    """
+    Neutralise faculty-entered text that a spreadsheet would evaluate (CSV/formula
+    injection) by prefixing it with an apostrophe. Used by both writers below.
+    """
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+class Echo:
+    """File-like object whose write() hands the line back, for csv.writer in a streaming response."""
+
+    def write(self, value):
+        return value
+
+
+def csv_stream(header, rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(header)
+    for row in rows:
+        yield writer.writerow([spreadsheet_safe(value) for value in row])
+
+
+def _xlsx_cell(value):
+    if isinstance(value, datetime) and timezone.is_aware(value):
+        # Excel has no time zones
+        return timezone.make_naive(value)
+    return value
+
+
+def xlsx_file(header, rows):
+    """
+    Write the export with openpyxl's write-only workbook, which spools rows to disk
+    instead of keeping them in memory, and return the finished file rewound.
+    """
+    import openpyxl
+    from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet, written = None, XLSX_ROWS_PER_SHEET
+    for row in rows:
+        if written >= XLSX_ROWS_PER_SHEET:
+            sheet = workbook.create_sheet()
+            sheet.append(header)
+            written = 0
+        sheet.append([
+            ILLEGAL_CHARACTERS_RE.sub('', spreadsheet_safe(value)) if isinstance(value, str) else _xlsx_cell(value)
+            for value in row
+        ])
+        written += 1
+    if sheet is None:
+        workbook.create_sheet().append(header)
+
+    output = tempfile.TemporaryFile()
+    workbook.save(output)
+    output.seek(0)
+    return output
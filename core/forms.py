@@ -925,4 +925,30 @@ class SubmissionFilterForm(forms.Form):
     date_to = forms.DateField(
         required=False,
         widget=forms.DateInput(attrs={'type': 'date', 'class': 'form-control'})
-    )
\ No newline at end of file
+    )
+    q = forms.CharField(
+        max_length=200,
+        required=False,
+        widget=forms.TextInput(attrs={
+            'class': 'form-control',
+            'placeholder': 'Search title, description or content'
+        })
+    )
+
+class BulkImportForm(forms.Form):
+    """
+    Upload form for importing many research-output records at once.
+    - `record_type` selects the category (and the ModelForm used to validate each row).
+    - `file` is a CSV or Excel (.xlsx) sheet whose header row holds field names or labels.
+    """
+    record_type = forms.ChoiceField(
+        choices=[
+            (kind, label) for kind, label in FacultySubmission.SUBMISSION_TYPE_CHOICES
+            if kind in ('journal_publication', 'conference_publication', 'research_projects', 'patents', 'copyrights', 'phd_guidance', 'book_chapter', 'book', 'consultancy_projects', 'editorial_roles', 'reviewer_roles', 'awards', 'industry_collaboration')
+        ],
+        widget=forms.Select(attrs={'class': 'form-control'})
+    )
+    file = forms.FileField(
+        help_text="CSV or .xlsx; the first row must contain the column names.",
+        widget=forms.ClearableFileInput(attrs={'class': 'form-control', 'accept': '.csv,.xlsx'})
+    )
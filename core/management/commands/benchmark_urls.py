@@ -0,0 +1,87 @@
+import json
+import logging
+import platform
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.utils import timezone
+
+from core.benchmark import LATENCY_TOLERANCE, benchmark_subjects, compare_reports, run_benchmark
+from core.seeding import seed_institution
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a synthetic institution into a throwaway test database, GET every route in core/urls.py "
+        "as a faculty member, cluster head and dean, and report query count, DB time, render time and "
+        "p50/p95 latency as JSON. With --baseline, exit non-zero on regressions."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--schools', type=int, default=2)
+        parser.add_argument('--departments', type=int, default=3, help="Departments per school.")
+        parser.add_argument('--faculty', type=int, default=60, help="Faculty members across all departments.")
+        parser.add_argument('--submissions-per-user', type=int, default=36)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--repeat', type=int, default=10, help="Measured requests per route and role.")
+        parser.add_argument('--warmup', type=int, default=1)
+        parser.add_argument('--route', action='append', dest='routes', help="Only benchmark this URL name (repeatable).")
+        parser.add_argument('--output', help="Write the JSON report here instead of stdout.")
+        parser.add_argument('--baseline', help="Earlier report to compare against.")
+        parser.add_argument('--tolerance', type=float, default=LATENCY_TOLERANCE, help="Allowed relative p95 growth.")
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options['baseline']:
+            try:
+                with open(options['baseline']) as fileobj:
+                    baseline = json.load(fileobj)
+            except (OSError, ValueError) as e:
+                raise CommandError(f"Cannot read baseline: {e}")
+
+        params = {key: options[key] for key in ('schools', 'departments', 'faculty', 'submissions_per_user', 'seed')}
+        setup_test_environment()
+        # 4xx/5xx responses are part of the report; keep their log lines off the terminal
+        request_logger = logging.getLogger('django.request')
+        request_logger.disabled = True
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            institution = seed_institution(**params)
+            users, submission = benchmark_subjects(institution)
+            routes = run_benchmark(users, submission, options['routes'], options['repeat'], options['warmup'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+            request_logger.disabled = False
+
+        report = {
+            'meta': {
+                'created_at': timezone.now().isoformat(),
+                'seed': params,
+                'rows': dict(institution.rows),
+                'repeat': options['repeat'],
+                'database': connection.vendor,
+                'django': django.get_version(),
+                'python': platform.python_version(),
+            },
+            'routes': routes,
+        }
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as fileobj:
+                fileobj.write(output + '\n')
+            self.stderr.write(f"Wrote {options['output']}.")
+        else:
+            self.stdout.write(output)
+
+        if baseline is not None:
+            if baseline.get('meta', {}).get('seed') != params:
+                self.stderr.write(self.style.WARNING("Baseline was seeded differently; query counts may not be comparable."))
+            regressions = compare_reports(report, baseline, options['tolerance'])
+            for regression in regressions:
+                self.stderr.write(regression)
+            if regressions:
+                raise CommandError(f"{len(regressions)} regression(s) against {options['baseline']}.")
+            self.stderr.write(self.style.SUCCESS("No regressions against the baseline."))
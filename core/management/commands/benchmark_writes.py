@@ -0,0 +1,116 @@
+import json
+import logging
+import os
+import platform
+import tempfile
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+from django.utils import timezone
+
+from core.benchmark import run_write_benchmark
+from core.models import FacultySubmission
+from core.seeding import seed_institution
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway test database on the configured backend (DATABASE_URL), then have 1, 2, 4 ... "
+        "concurrent reviewers POST review_submission, optionally while --readers threads load "
+        "review_dashboard, and report requests per second, errors and p50/p95 latency as JSON. Run it "
+        "once per backend (or per --sqlite-pragmas); --compare prints two reports side by side."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--writers', type=int, nargs='+', default=[1, 2, 4, 8], help="Concurrent writer counts to run.")
+        parser.add_argument('--reviews', type=int, default=50, help="Reviews posted by each writer.")
+        parser.add_argument('--readers', type=int, default=0, help="Threads loading review_dashboard during each run.")
+        parser.add_argument(
+            '--sqlite-pragmas', choices=['settings', 'stock'], default='settings',
+            help="'stock' runs SQLite with its default rollback journal instead of settings.SQLITE_PRAGMAS.",
+        )
+        parser.add_argument('--faculty', type=int, default=40)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', help="Write the JSON report here instead of stdout.")
+        parser.add_argument('--compare', help="Earlier report (e.g. from another backend) to print alongside.")
+
+    def handle(self, *args, **options):
+        other = None
+        if options['compare']:
+            try:
+                with open(options['compare']) as fileobj:
+                    other = json.load(fileobj)
+            except (OSError, ValueError) as e:
+                raise CommandError(f"Cannot read report: {e}")
+
+        # every run reviews fresh submissions
+        needed = sum(options['writers']) * options['reviews']
+        per_user = -(-needed // options['faculty'])
+        setup_test_environment()
+        # lock waits are what is being measured; keep their log lines off the terminal
+        quiet = [logging.getLogger(name) for name in ('django.request', 'core.slow_queries')]
+        for logger in quiet:
+            logger.disabled = True
+        scratch = None
+        pragmas = override_settings()
+        if options['sqlite_pragmas'] == 'stock':
+            pragmas = override_settings(SQLITE_PRAGMAS={'journal_mode': 'DELETE', 'synchronous': 'FULL'})
+        pragmas.enable()
+        if connection.vendor == 'sqlite':
+            # the default in-memory test database cannot be shared by writer threads
+            scratch = tempfile.TemporaryDirectory()
+            connection.settings_dict['TEST']['NAME'] = os.path.join(scratch.name, 'benchmark_writes.sqlite3')
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            institution = seed_institution(1, 2, options['faculty'], per_user, options['seed'])
+            submission_ids = list(FacultySubmission.objects.order_by('pk').values_list('pk', flat=True))
+            runs = []
+            for writers in options['writers']:
+                runs.append(run_write_benchmark(institution.deans, submission_ids, writers, options['reviews'], options['readers']))
+                submission_ids = submission_ids[writers * options['reviews']:]
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            pragmas.disable()
+            teardown_test_environment()
+            for logger in quiet:
+                logger.disabled = False
+            if scratch is not None:
+                scratch.cleanup()
+
+        report = {
+            'meta': {
+                'created_at': timezone.now().isoformat(),
+                'database': connection.vendor,
+                'conn_max_age': connection.settings_dict['CONN_MAX_AGE'],
+                'sqlite_pragmas': options['sqlite_pragmas'] if connection.vendor == 'sqlite' else None,
+                'readers': options['readers'],
+                'reviews_per_writer': options['reviews'],
+                'django': django.get_version(),
+                'python': platform.python_version(),
+            },
+            'runs': runs,
+        }
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as fileobj:
+                fileobj.write(output + '\n')
+            self.stderr.write(f"Wrote {options['output']}.")
+        else:
+            self.stdout.write(output)
+
+        if other is not None:
+            previous = {run['writers']: run for run in other.get('runs', [])}
+            meta = other.get('meta', {})
+            theirs = f"{meta.get('database', '?')} {meta.get('sqlite_pragmas') or ''}".strip()
+            ours = f"{connection.vendor} {report['meta']['sqlite_pragmas'] or ''}".strip()
+            self.stderr.write(f"{'':>8}  {ours:^28}  {theirs:^28}")
+            self.stderr.write(f"{'writers':>8}" + f"  {'writes/s':>9} {'reads/s':>9} {'errors':>8}" * 2)
+            for run in runs:
+                self.stderr.write(f"{run['writers']:>8}" + self.columns(run) + self.columns(previous.get(run['writers'], {})))
+
+    def columns(self, run):
+        reads = run.get('reads', {})
+        errors = run.get('errors', 0) + reads.get('errors', 0) if run else '-'
+        return f"  {run.get('per_second', '-'):>9} {reads.get('per_second', '-'):>9} {errors:>8}"
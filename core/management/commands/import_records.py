@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.bulk_import import IMPORT_BATCH_SIZE, IMPORT_FORMS, BulkImportError, import_records, read_rows
+from core.models import CustomUser
+
+
+class Command(BaseCommand):
+    help = "Import research-output records for one user from a CSV or .xlsx file, validating each row with the category form."
+
+    def add_arguments(self, parser):
+        parser.add_argument('record_type', choices=sorted(IMPORT_FORMS))
+        parser.add_argument('path', help="CSV or .xlsx file whose first row holds field names or labels.")
+        parser.add_argument('--user', required=True, help="Username that will own the imported records.")
+        parser.add_argument('--batch-size', type=int, default=IMPORT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        try:
+            user = CustomUser.objects.get(username=options['user'])
+        except CustomUser.DoesNotExist:
+            raise CommandError(f"No user named {options['user']!r}.")
+
+        try:
+            with open(options['path'], 'rb') as fileobj:
+                result = import_records(
+                    options['record_type'], user, read_rows(fileobj, options['path']),
+                    batch_size=options['batch_size'],
+                )
+        except (OSError, BulkImportError) as e:
+            raise CommandError(str(e))
+
+        for line, errors in result.errors:
+            problems = '; '.join(f"{field}: {' '.join(messages)}" for field, messages in errors.items())
+            self.stderr.write(f"Row {line}: {problems}")
+        if result.truncated:
+            self.stderr.write(f"... {result.failed - len(result.errors)} more rejected row(s) not shown.")
+
+        self.stdout.write(self.style.SUCCESS(f"Imported {result.created} record(s); {result.failed} row(s) rejected."))
@@ -0,0 +1,82 @@
+import json
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from core.models import FacultySubmission
+from core.slow_queries import candidate_columns, existing_indexes, index_candidates, plan_problems, submission_probes
+
+
+class Command(BaseCommand):
+    help = (
+        "EXPLAIN the FacultySubmission queries behind the review and submissions pages and list "
+        "missing-index candidates. With --log, also rank the statements recorded in a "
+        "SLOW_QUERY_LOG_FILE by total time and analyse their captured plans."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default')
+        parser.add_argument('--log', help="JSON-lines slow query log to include.")
+        parser.add_argument('--top', type=int, default=20, help="Slow-log statements to analyse.")
+        parser.add_argument('--json', action='store_true')
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        table = FacultySubmission._meta.db_table
+        findings = index_candidates(connection, table, submission_probes())
+        if options['log']:
+            findings += self.logged_findings(options['log'], table, existing_indexes(connection, table), options['top'])
+
+        if options['json']:
+            self.stdout.write(json.dumps(findings, indent=2))
+            return
+        if not findings:
+            self.stdout.write(self.style.SUCCESS(f"No full scans or unindexed sorts on {table}."))
+            return
+
+        for finding in findings:
+            self.stdout.write(self.style.WARNING(f"{finding['label']}: {', '.join(finding['problems'])}"))
+            for line in finding['plan']:
+                self.stdout.write(f"    {line}")
+            if not finding['candidate']:
+                continue
+            columns = ', '.join(finding['candidate'])
+            if finding['covered']:
+                self.stdout.write(f"    an index on ({columns}) exists but was not chosen; check table statistics")
+            else:
+                self.stdout.write(f"    candidate: models.Index(fields=[{', '.join(repr(c) for c in finding['candidate'])}])  # ({columns})")
+
+    def logged_findings(self, path, table, indexes, top):
+        """Slow-log entries grouped by statement (parameters aside), slowest in total first."""
+        groups = defaultdict(lambda: {'count': 0, 'total_ms': 0.0, 'entry': None})
+        try:
+            with open(path) as fileobj:
+                for line in fileobj:
+                    if not line.strip():
+                        continue
+                    entry = json.loads(line)
+                    group = groups[entry['sql']]
+                    group['count'] += 1
+                    group['total_ms'] += entry['duration_ms']
+                    group['entry'] = entry
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Cannot read {path}: {e}")
+
+        findings = []
+        ranked = sorted(groups.values(), key=lambda group: group['total_ms'], reverse=True)[:top]
+        for group in ranked:
+            entry = group['entry']
+            problems = plan_problems(entry['plan'], table)
+            if not problems:
+                continue
+            candidate = candidate_columns(entry['sql'], table)
+            findings.append({
+                'label': f"slow log: {group['count']}x, {group['total_ms']:.0f} ms total, from {entry['origin'] or '?'}",
+                'problems': problems,
+                'plan': entry['plan'],
+                'candidate': candidate,
+                'covered': any(index[:len(candidate)] == candidate for index in indexes) if candidate else True,
+                'sql': entry['sql'],
+            })
+        return findings
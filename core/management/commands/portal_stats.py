@@ -0,0 +1,39 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from core.profiling import MEMORY_METRICS, TIMING_METRICS, recorder, summarize
+
+
+class Command(BaseCommand):
+    help = (
+        "Print the sampled per-view request profiles collected by RequestProfilingMiddleware. "
+        "Reads what each process has pushed to the cache, so it needs a shared cache backend."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sort', choices=TIMING_METRICS + MEMORY_METRICS, default='wall_ms')
+        parser.add_argument('--json', action='store_true', help="Print the raw summary as JSON.")
+        parser.add_argument('--reset', action='store_true', help="Discard every collected histogram.")
+
+    def handle(self, *args, **options):
+        if options['reset']:
+            recorder.reset()
+            self.stdout.write(self.style.SUCCESS("Profiling histograms cleared."))
+            return
+
+        rows = summarize(recorder.collect(), options['sort'])
+        if options['json']:
+            self.stdout.write(json.dumps(rows, indent=2))
+            return
+        if not rows:
+            self.stdout.write("No samples yet. Is PORTAL_PROFILING on, and has the cache table been created (manage.py createcachetable)?")
+            return
+
+        self.stdout.write(f"{'view':<34}{'samples':>8}{'p50 ms':>9}{'p95 ms':>9}{'sql':>6}{'sql ms':>9}{'render ms':>11}{'peak KiB':>10}")
+        for row in rows:
+            wall, sql, sql_ms, render, memory = (row.get(metric, {}) for metric in TIMING_METRICS + MEMORY_METRICS)
+            self.stdout.write(
+                f"{row['view'][:33]:<34}{wall.get('count', 0):>8}{wall.get('p50', 0):>9.1f}{wall.get('p95', 0):>9.1f}"
+                f"{sql.get('mean', 0):>6.1f}{sql_ms.get('p95', 0):>9.1f}{render.get('p95', 0):>11.1f}{memory.get('p95', 0):>10.0f}"
+            )
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from core.otp import get_otp_backend
+
+
+class Command(BaseCommand):
+    help = "Delete expired one-time codes and closed rate-limit windows (schedule it, e.g. hourly from cron)."
+
+    def handle(self, *args, **options):
+        purged = get_otp_backend().purge()
+        self.stdout.write(self.style.SUCCESS(f"Purged {purged} expired OTP record(s)."))
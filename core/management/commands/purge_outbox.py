@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from core.outbox import OUTBOX_RETENTION_DAYS, purge_outbox
+
+
+class Command(BaseCommand):
+    help = "Delete sent and failed outbox mail older than the retention period (schedule it, e.g. daily from cron)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=OUTBOX_RETENTION_DAYS, help="Keep messages from the last this many days.")
+
+    def handle(self, *args, **options):
+        purged = purge_outbox(options['days'])
+        self.stdout.write(self.style.SUCCESS(f"Purged {purged} outbox message(s)."))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from core.models import CustomUser, UserActivityCounters
+
+
+class Command(BaseCommand):
+    help = "Recount every category model into UserActivityCounters (run after bulk imports)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', action='append', dest='usernames', help="Only rebuild for this username (repeatable).")
+
+    def handle(self, *args, **options):
+        users = CustomUser.objects.all()
+        if options['usernames']:
+            users = users.filter(username__in=options['usernames'])
+
+        rebuilt = 0
+        for user_id in users.values_list('pk', flat=True).iterator():
+            UserActivityCounters.rebuild_for(user_id)
+            rebuilt += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt activity counters for {rebuilt} user(s)."))
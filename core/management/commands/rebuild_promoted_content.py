@@ -0,0 +1,38 @@
+from django.db import transaction
+from django.core.management.base import BaseCommand
+
+from core.models import FacultySubmission, SubmissionContentValue
+
+
+class Command(BaseCommand):
+    help = "Re-extract promoted content keys into SubmissionContentValue (run after bulk imports or registry changes)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--type', action='append', dest='types', help="Only rebuild this submission_type (repeatable).")
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        submissions = FacultySubmission.objects.order_by().only('pk', 'submission_type', 'content')
+        if options['types']:
+            submissions = submissions.filter(submission_type__in=options['types'])
+
+        batch_size = options['batch_size']
+        batch, rebuilt, written = [], 0, 0
+        for submission in submissions.iterator(chunk_size=batch_size):
+            batch.append(submission)
+            if len(batch) >= batch_size:
+                written += self.rebuild(batch)
+                rebuilt += len(batch)
+                batch = []
+        if batch:
+            written += self.rebuild(batch)
+            rebuilt += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {written} promoted value(s) for {rebuilt} submission(s)."))
+
+    def rebuild(self, submissions):
+        rows = [row for submission in submissions for row in SubmissionContentValue.extract(submission)]
+        with transaction.atomic():
+            SubmissionContentValue.objects.filter(submission__in=[s.pk for s in submissions]).delete()
+            SubmissionContentValue.objects.bulk_create(rows)
+        return len(rows)
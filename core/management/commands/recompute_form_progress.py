@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from core.models import PROGRESS_FIELDS, UserFormProgress
+
+
+class Command(BaseCommand):
+    help = "Recompute UserFormProgress.completed_count and percent (run after adding or removing *_progress fields)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        batch, changed, total = [], 0, 0
+        rows = UserFormProgress.objects.order_by('pk').only('pk', 'completed_count', 'percent', *PROGRESS_FIELDS)
+        for progress in rows.iterator(chunk_size=batch_size):
+            total += 1
+            before = (progress.completed_count, progress.percent)
+            progress.recompute()
+            if (progress.completed_count, progress.percent) != before:
+                batch.append(progress)
+            if len(batch) >= batch_size:
+                changed += UserFormProgress.objects.bulk_update(batch, ['completed_count', 'percent'])
+                batch = []
+        if batch:
+            changed += UserFormProgress.objects.bulk_update(batch, ['completed_count', 'percent'])
+
+        self.stdout.write(self.style.SUCCESS(f"Recomputed progress for {total} user(s); {changed} changed."))
@@ -0,0 +1,46 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import CustomUser
+from core.seeding import SEED_BATCH_SIZE, SEED_PASSWORD, seed_institution
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill the database with a deterministic synthetic institution for load testing: users, "
+        "category records, FacultySubmissions, reviews, activity counters and form progress."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--faculty', type=int, default=100, help="Faculty members across all departments.")
+        parser.add_argument('--submissions-per-user', type=int, default=36)
+        parser.add_argument('--schools', type=int, default=5)
+        parser.add_argument('--departments', type=int, default=6, help="Departments per school.")
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--prefix', default='', help="Username prefix, to seed the same database more than once.")
+        parser.add_argument('--batch-size', type=int, default=SEED_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        prefix = options['prefix']
+        if CustomUser.objects.filter(username__in=[f"{prefix}dean-s1", f"{prefix}faculty-000001"]).exists():
+            raise CommandError("Seeded users already exist; pass a different --prefix or use an empty database.")
+
+        started = time.monotonic()
+
+        def progress(done, total):
+            if options['verbosity'] >= 2 or done == total:
+                self.stderr.write(f"{done}/{total} faculty seeded ({time.monotonic() - started:.1f}s)")
+
+        institution = seed_institution(
+            schools=options['schools'], departments=options['departments'], faculty=options['faculty'],
+            submissions_per_user=options['submissions_per_user'], seed=options['seed'],
+            prefix=prefix, batch_size=options['batch_size'], progress=progress,
+        )
+
+        for model, count in sorted(institution.rows.items()):
+            self.stdout.write(f"{count:>10} {model}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded {sum(institution.rows.values())} rows in {time.monotonic() - started:.1f}s. "
+            f"Every seeded account's password is {SEED_PASSWORD!r}."
+        ))
@@ -0,0 +1,26 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.outbox import send_queued
+
+
+class Command(BaseCommand):
+    help = "Deliver mail from the OutgoingEmail outbox, retrying failures with backoff. Runs until stopped unless --once is given."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help="Send what is due now and exit.")
+        parser.add_argument('--batch-size', type=int, default=100, help="Messages sent per connection.")
+        parser.add_argument('--interval', type=float, default=2.0, help="Seconds to sleep when the outbox is empty.")
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        while True:
+            sent, failed = send_queued(limit=batch_size)
+            if sent or failed:
+                self.stdout.write(f"Sent {sent} message(s), {failed} failed.")
+            if options['once']:
+                break
+            # a full batch means more may be waiting; otherwise poll again later
+            if sent + failed < batch_size:
+                time.sleep(options['interval'])
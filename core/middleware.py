@@ -1,28 +1,124 @@
+import random
+import re
+
+from django.conf import settings
+from django.contrib.auth import SESSION_KEY
+from django.core.exceptions import MiddlewareNotUsed
 from django.shortcuts import redirect
 from django.urls import reverse
 
+from .profiling import PROFILING_MEMORY_RATE, PROFILING_SAMPLE_RATE, profile_request
+from .routers import REPLICA_DATABASE, REPLICA_PIN_COOKIE, REPLICA_PIN_SECONDS, REPLICA_URL_NAMES, request_routing
+
+# URL names a user with an incomplete profile may still visit.
+EXEMPT_URL_NAMES = ['login', 'signup', 'verify_otp', 'profile_completion', 'logout']
+EXEMPT_PREFIXES = ['/admin/']
+
+# Session key holding the id of the logged-in user once their profile is known to be complete.
+PROFILE_COMPLETE_SESSION_KEY = '_profile_complete_user_id'
+
+
+def remember_profile_complete(request, user):
+    """
+    Record in the session that `user` has a complete profile, so later requests
+    can skip loading the user just to check. Call this wherever the flag is set.
+    """
+    request.session[PROFILE_COMPLETE_SESSION_KEY] = user._meta.pk.value_to_string(user)
+
+
 class ForceProfileCompletionMiddleware:
     """
     Middleware to ensure users complete their profile before accessing certain views.
+
+    Exempt prefixes (the pages above, /admin/, static and media files) are reversed
+    once and compiled into a single anchored regex, so a request costs one match and,
+    for exempt paths, never touches the session or the user.
+
+    Otherwise the session decides: anonymous sessions and sessions already marked
+    complete (see remember_profile_complete) pass without evaluating the lazy
+    request.user, so views that never read the user never query for it.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self._exempt = None
+
+    @property
+    def exempt(self):
+        # built on the first request rather than in __init__ so the URLconf is fully loaded
+        if self._exempt is None:
+            prefixes = [reverse(name) for name in EXEMPT_URL_NAMES] + EXEMPT_PREFIXES
+            prefixes += [url for url in (settings.STATIC_URL, settings.MEDIA_URL) if url and url.startswith('/')]
+            self._exempt = re.compile('|'.join(re.escape(prefix) for prefix in sorted(set(prefixes))))
+        return self._exempt
+
+    def __call__(self, request):
+        if not self.exempt.match(request.path):
+            session = request.session
+            user_id = session.get(SESSION_KEY)
+            if user_id is not None and session.get(PROFILE_COMPLETE_SESSION_KEY) != user_id:
+                user = request.user
+                if user.is_authenticated:
+                    if not user.is_profile_complete:
+                        return redirect('profile_completion')
+                    remember_profile_complete(request, user)
+
+        return self.get_response(request)
+
+
+class RequestProfilingMiddleware:
+    """
+    Opt-in sampling profiler: with settings.PORTAL_PROFILING on, a random
+    PORTAL_PROFILING_SAMPLE_RATE share of requests has its wall time, SQL count,
+    SQL time and template render time (or, for a few, peak memory) added to
+    per-URL-name histograms in core/profiling.py. Unsampled requests pay one
+    random() call; with the setting off the middleware removes itself.
+
+    Read the numbers at /admin/portal-stats/ or with `manage.py portal_stats`.
+    """
+    def __init__(self, get_response):
+        if not getattr(settings, 'PORTAL_PROFILING', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = PROFILING_SAMPLE_RATE
+        self.memory_rate = PROFILING_SAMPLE_RATE * PROFILING_MEMORY_RATE
+
+    def __call__(self, request):
+        roll = random.random()
+        if roll >= self.sample_rate:
+            return self.get_response(request)
+        return profile_request(request, self.get_response, trace_memory=roll < self.memory_rate)
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Lets the read-only pages in REPLICA_URL_NAMES read from the replica (see
+    core/routers.py). Any request that writes, and any POST, gets a short-lived
+    cookie that keeps the client on the primary for REPLICA_PIN_SECONDS, so the
+    redirect after a form post shows the new row. Removes itself when no
+    replica is configured.
     """
+    SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
     def __init__(self, get_response):
+        if REPLICA_DATABASE not in settings.DATABASES:
+            raise MiddlewareNotUsed
         self.get_response = get_response
 
     def __call__(self, request):
-        # Skip middleware for unauthenticated users or certain paths
-        exempt_paths = [
-            reverse('login'),
-            reverse('signup'), 
-            reverse('verify_otp'),
-            reverse('profile_completion'), 
-            reverse('logout'),
-            '/admin/'
-        ]
-        
-        if request.user.is_authenticated and not request.user.is_profile_complete:
-            # Don't redirect if user is on an exempt path
-            if not any(request.path.startswith(path) for path in exempt_paths):
-                return redirect('profile_completion')
-        
-        response = self.get_response(request)
-        return response
\ No newline at end of file
+        with request_routing() as state:
+            request._replica_routing = state
+            response = self.get_response(request)
+        if state['wrote'] or request.method not in self.SAFE_METHODS:
+            response.set_cookie(REPLICA_PIN_COOKIE, '1', max_age=REPLICA_PIN_SECONDS, httponly=True, samesite='Lax')
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if (
+            request.method in self.SAFE_METHODS
+            and request.resolver_match.url_name in REPLICA_URL_NAMES
+            and REPLICA_PIN_COOKIE not in request.COOKIES
+        ):
+            # these views all need the user; load it from the primary so an
+            # account the replica has not caught up with is not logged out
+            request.user.pk
+            request._replica_routing['replica'] = True
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.3 on 2026-10-17 19:40
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0029_annualfacultyreport_user_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='customuser',
+            name='role',
+            field=models.CharField(choices=[('vice chancellor', 'Vice Chancellor'), ('dean', 'Dean'), ('cluster_head', 'Cluster Head'), ('faculty', 'Faculty')], default='faculty', max_length=20),
+        ),
+        migrations.CreateModel(
+            name='UserActivityCounters',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('journal_publications', models.PositiveIntegerField(default=0)),
+                ('conference_publications', models.PositiveIntegerField(default=0)),
+                ('research_projects', models.PositiveIntegerField(default=0)),
+                ('patents', models.PositiveIntegerField(default=0)),
+                ('copyrights', models.PositiveIntegerField(default=0)),
+                ('phd_guidance', models.PositiveIntegerField(default=0)),
+                ('book_chapters', models.PositiveIntegerField(default=0)),
+                ('books', models.PositiveIntegerField(default=0)),
+                ('consultancy_projects', models.PositiveIntegerField(default=0)),
+                ('editorial_roles', models.PositiveIntegerField(default=0)),
+                ('reviewer_roles', models.PositiveIntegerField(default=0)),
+                ('awards', models.PositiveIntegerField(default=0)),
+                ('industry_collaborations', models.PositiveIntegerField(default=0)),
+                ('annual_reports', models.PositiveIntegerField(default=0)),
+                ('research_grants', models.PositiveIntegerField(default=0)),
+                ('conference_travels', models.PositiveIntegerField(default=0)),
+                ('publications_updates', models.PositiveIntegerField(default=0)),
+                ('curriculum_developments', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='activity_counters', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.3 on 2026-10-17 19:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0030_alter_customuser_role_useractivitycounters'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='facultysubmission',
+            index=models.Index(fields=['-submitted_at', '-id'], name='core_facult_submitt_2a9dae_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='facultysubmission',
+            index=models.Index(fields=['user', '-submitted_at', '-id'], name='core_facult_user_id_02a1fe_idx'),
+        ),
+    ]
@@ -0,0 +1,87 @@
+# Full-text search index for FacultySubmission (see core/search.py)
+# The SQL is inlined so later edits to core/search.py cannot change this migration.
+
+from django.db import migrations
+
+
+# Text that goes into the index: title, description and every string value of content.
+SQLITE_FTS_SETUP = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS core_submission_fts
+    USING fts5(title, description, content, tokenize = 'porter unicode61')
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS core_submission_fts_ai AFTER INSERT ON core_facultysubmission BEGIN
+        INSERT INTO core_submission_fts (rowid, title, description, content) VALUES (
+            new.id, new.title, coalesce(new.description, ''),
+            (SELECT coalesce(group_concat(value, ' '), '') FROM json_tree(new.content) WHERE type = 'text')
+        );
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS core_submission_fts_ad AFTER DELETE ON core_facultysubmission BEGIN
+        DELETE FROM core_submission_fts WHERE rowid = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS core_submission_fts_au
+    AFTER UPDATE OF title, description, content ON core_facultysubmission BEGIN
+        DELETE FROM core_submission_fts WHERE rowid = old.id;
+        INSERT INTO core_submission_fts (rowid, title, description, content) VALUES (
+            new.id, new.title, coalesce(new.description, ''),
+            (SELECT coalesce(group_concat(value, ' '), '') FROM json_tree(new.content) WHERE type = 'text')
+        );
+    END
+    """,
+    """
+    INSERT INTO core_submission_fts (rowid, title, description, content)
+    SELECT id, title, coalesce(description, ''),
+        (SELECT coalesce(group_concat(value, ' '), '') FROM json_tree(core_facultysubmission.content) WHERE type = 'text')
+    FROM core_facultysubmission
+    WHERE id NOT IN (SELECT rowid FROM core_submission_fts)
+    """,
+]
+
+SQLITE_FTS_TEARDOWN = [
+    "DROP TRIGGER IF EXISTS core_submission_fts_ai",
+    "DROP TRIGGER IF EXISTS core_submission_fts_ad",
+    "DROP TRIGGER IF EXISTS core_submission_fts_au",
+    "DROP TABLE IF EXISTS core_submission_fts",
+]
+
+# Must match core.search.POSTGRES_VECTOR_SQL for the planner to use the index.
+POSTGRES_INDEX_SETUP = [
+    "CREATE INDEX IF NOT EXISTS core_submission_search_idx ON core_facultysubmission USING GIN (("
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B') || "
+    "setweight(jsonb_to_tsvector('english', content, '[\"string\"]'), 'C')"
+    "))",
+]
+
+POSTGRES_INDEX_TEARDOWN = [
+    "DROP INDEX IF EXISTS core_submission_search_idx",
+]
+
+
+def run_statements(schema_editor, statements_by_vendor):
+    for statement in statements_by_vendor.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(statement)
+
+
+def create_search_index(apps, schema_editor):
+    run_statements(schema_editor, {'sqlite': SQLITE_FTS_SETUP, 'postgresql': POSTGRES_INDEX_SETUP})
+
+
+def drop_search_index(apps, schema_editor):
+    run_statements(schema_editor, {'sqlite': SQLITE_FTS_TEARDOWN, 'postgresql': POSTGRES_INDEX_TEARDOWN})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0031_facultysubmission_core_facult_submitt_2a9dae_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.3 on 2026-10-17 19:59
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0032_facultysubmission_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SubmissionContentValue',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('submission_type', models.CharField(max_length=50)),
+                ('key', models.CharField(max_length=50)),
+                ('number', models.FloatField(blank=True, null=True)),
+                ('date', models.DateField(blank=True, null=True)),
+                ('submission', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='promoted_values', to='core.facultysubmission')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['submission_type', 'key', 'number'], name='core_submis_submiss_878aa5_idx'), models.Index(fields=['submission_type', 'key', 'date'], name='core_submis_submiss_9a5c2a_idx')],
+                'constraints': [models.UniqueConstraint(fields=('submission', 'key'), name='unique_submission_content_key')],
+            },
+        ),
+    ]
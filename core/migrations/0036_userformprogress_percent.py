@@ -0,0 +1,35 @@
+# Generated by Django 5.2.3 on 2026-10-17 20:09
+
+from django.db import migrations, models
+
+
+def fill_progress_percent(apps, schema_editor):
+    UserFormProgress = apps.get_model('core', 'UserFormProgress')
+    fields = [f.name for f in UserFormProgress._meta.concrete_fields if f.name.endswith('_progress')]
+    rows = []
+    for progress in UserFormProgress.objects.iterator():
+        progress.completed_count = sum(1 for field in fields if getattr(progress, field))
+        progress.percent = progress.completed_count * 100 // len(fields)
+        rows.append(progress)
+    UserFormProgress.objects.bulk_update(rows, ['completed_count', 'percent'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0035_userotp_email_expiry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userformprogress',
+            name='completed_count',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='userformprogress',
+            name='percent',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.RunPython(fill_progress_percent, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.3 on 2026-10-17 21:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0036_userformprogress_percent'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='facultysubmission',
+            name='core_facult_user_id_a04ce4_idx',
+        ),
+        migrations.AddIndex(
+            model_name='facultysubmission',
+            index=models.Index(fields=['user', 'status', '-submitted_at', '-id'], name='core_facult_user_id_69c9c7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='facultysubmission',
+            index=models.Index(fields=['status', '-submitted_at', '-id'], name='core_facult_status_5b8873_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='facultysubmission',
+            index=models.Index(fields=['reviewed_by', '-submitted_at', '-id'], name='core_facult_reviewe_9c1dae_idx'),
+        ),
+    ]
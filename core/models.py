@@ -1,7 +1,13 @@
-from django.db import models
+from datetime import date
+
+from django.db import models, transaction
+from django.db.models import DEFERRED, F
+from django.db.models.functions import Floor, Greatest
 from django.contrib.auth.models import AbstractUser, User
 import random
 from django.conf import settings
+from django.utils import timezone
+from django.utils.dateparse import parse_date
 
 def user_directory_path(instance, filename):
     return f'profile_pics/user_{instance.id}/{filename}'
@@ -49,14 +55,27 @@ class UserOTP(models.Model):
 
     """
     Model to store OTP for user authentication.
+    Signup codes are keyed by email because the user does not exist yet;
+    see core/otp.py for issuing, checking and expiring them.
     """
 
-    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete = models.CASCADE)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete = models.CASCADE, null=True, blank=True)
+    email = models.EmailField(unique=True, null=True, blank=True)
     otp = models.CharField(max_length=6, blank=True, null=True)
-    created_at = models.DateTimeField(auto_now_add = True)
+    # when the current code was issued; codes older than OTP_TTL are rejected
+    created_at = models.DateTimeField(default=timezone.now)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    # fixed-window rate limit on how many codes one email may request
+    issue_count = models.PositiveSmallIntegerField(default=0)
+    window_started_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at']),
+        ]
 
     def __str__(self):
-        return f"{self.user.username} - {self.otp}"
+        return f"{self.email or self.user} - {self.otp}"
     
     def generate_otp(self):
         """Generate a new OTP for the user"""
@@ -65,6 +84,39 @@ class UserOTP(models.Model):
         return self.otp
 
 
+class OutgoingEmail(models.Model):
+    """
+    Outbox row for mail that is sent by `manage.py send_queued_mail` instead of
+    inside the request. The body is cleared once sent and old rows are deleted
+    by `manage.py purge_outbox`. See core/outbox.py.
+    """
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=255, blank=True)
+    recipients = models.JSONField(default=list)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='queued')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    # earliest time the worker may (re)try; also used as a short lease while sending
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {', '.join(self.recipients)} ({self.status})"
+
+
 class JournalPublication(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     title_of_paper = models.CharField(max_length = 255)
@@ -643,6 +695,37 @@ class UserFormProgress(models.Model):
     awards_progress = models.BooleanField(default=False)
     industry_collaboration_progress = models.BooleanField(default=False)
 
+    # derived from the *_progress flags on every save(); see recompute()
+    completed_count = models.PositiveSmallIntegerField(default=0)
+    percent = models.PositiveSmallIntegerField(default=0)
+
+    def recompute(self):
+        """Refresh completed_count and percent from the step flags (no query)."""
+        self.completed_count = sum(1 for field in PROGRESS_FIELDS if getattr(self, field))
+        self.percent = self.completed_count * 100 // len(PROGRESS_FIELDS) if PROGRESS_FIELDS else 0
+
+    def save(self, *args, **kwargs):
+        self.recompute()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'completed_count', 'percent'}
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def mark_complete(cls, user, field):
+        """
+        Set one step flag in a single conditional UPDATE that also bumps the counts.
+        Nothing is written when the flag is already set; the row is created on first use.
+        """
+        completed = F('completed_count') + 1
+        updated = cls.objects.filter(user=user, **{field: False}).update(**{
+            field: True,
+            'completed_count': completed,
+            'percent': Floor(completed * 100 / len(PROGRESS_FIELDS)),
+        })
+        if not updated:
+            cls.objects.get_or_create(user=user, defaults={field: True})
+
     # def calculate_progress(self):
     #     fields = [
     #         self.journal_publication_progress,
@@ -665,7 +748,13 @@ class UserFormProgress(models.Model):
     
     # def __str__(self):
     #     return f"{self.user.username} - {self.calculate_progress()}%"
-    
+
+
+# Step flags counted towards UserFormProgress.percent, worked out once at import.
+PROGRESS_FIELDS = tuple(
+    field.name for field in UserFormProgress._meta.concrete_fields if field.name.endswith('_progress')
+)
+
 
 class AnnualFacultyReport(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
@@ -794,6 +883,95 @@ class CurriculumDevelopment(models.Model):
     dean_approval = models.BooleanField(default=False, help_text="I confirm that I have obtained the necessary approvals for this program.")
 
 
+class UserActivityCounters(models.Model):
+    """
+    Denormalized per-user record counts for every category model.
+    Kept in step by the post_save/post_delete receivers in core/signals.py;
+    run `manage.py rebuild_activity_counters` after bulk imports.
+    """
+
+    # counter field -> model it counts
+    COUNTED_MODELS = {
+        'journal_publications': JournalPublication,
+        'conference_publications': ConferencePublication,
+        'research_projects': ResearchProjects,
+        'patents': Patents,
+        'copyrights': CopyRights,
+        'phd_guidance': PhdGuidance,
+        'book_chapters': BookChapter,
+        'books': Book,
+        'consultancy_projects': ConsultancyProjects,
+        'editorial_roles': EditorialRoles,
+        'reviewer_roles': ReviewerRoles,
+        'awards': Awards,
+        'industry_collaborations': IndustryCollaboration,
+        'annual_reports': AnnualFacultyReport,
+        'research_grants': ResearchGrantApplication,
+        'conference_travels': ConferenceTravelRequest,
+        'publications_updates': PublicationsUpdate,
+        'curriculum_developments': CurriculumDevelopment,
+    }
+
+    user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='activity_counters')
+    journal_publications = models.PositiveIntegerField(default=0)
+    conference_publications = models.PositiveIntegerField(default=0)
+    research_projects = models.PositiveIntegerField(default=0)
+    patents = models.PositiveIntegerField(default=0)
+    copyrights = models.PositiveIntegerField(default=0)
+    phd_guidance = models.PositiveIntegerField(default=0)
+    book_chapters = models.PositiveIntegerField(default=0)
+    books = models.PositiveIntegerField(default=0)
+    consultancy_projects = models.PositiveIntegerField(default=0)
+    editorial_roles = models.PositiveIntegerField(default=0)
+    reviewer_roles = models.PositiveIntegerField(default=0)
+    awards = models.PositiveIntegerField(default=0)
+    industry_collaborations = models.PositiveIntegerField(default=0)
+    annual_reports = models.PositiveIntegerField(default=0)
+    research_grants = models.PositiveIntegerField(default=0)
+    conference_travels = models.PositiveIntegerField(default=0)
+    publications_updates = models.PositiveIntegerField(default=0)
+    curriculum_developments = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Activity counters for user {self.user_id}"
+
+    def as_dict(self):
+        return {field: getattr(self, field) for field in self.COUNTED_MODELS}
+
+    @classmethod
+    def counts_for(cls, user_id):
+        """Count every category from scratch (one COUNT per model)."""
+        return {
+            field: model.objects.filter(user_id=user_id).count()
+            for field, model in cls.COUNTED_MODELS.items()
+        }
+
+    @classmethod
+    def rebuild_for(cls, user_id):
+        counters, created = cls.objects.update_or_create(user_id=user_id, defaults=cls.counts_for(user_id))
+        return counters
+
+    @classmethod
+    def for_user(cls, user):
+        """Single-row lookup; the row is built from scratch the first time it is needed."""
+        try:
+            return cls.objects.get(user=user)
+        except cls.DoesNotExist:
+            return cls.rebuild_for(user.pk)
+
+    @classmethod
+    def adjust(cls, user_id, field, delta):
+        """
+        Apply `delta` to one counter in a single UPDATE, bumping updated_at,
+        which versions the cached activity table on the submissions page.
+        Users without a row are skipped; `for_user` builds the row on first read.
+        """
+        return cls.objects.filter(user_id=user_id).update(
+            **{field: Greatest(F(field) + delta, 0)}, updated_at=timezone.now()
+        )
+
+
 class Task(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     title = models.CharField(max_length=255)
@@ -849,6 +1027,27 @@ class FacultySubmission(models.Model):
         ('curriculum_development', 'Curriculum Development'),
     ]
     
+    # content keys copied into SubmissionContentValue on save so they can be
+    # filtered through an index; key -> 'number' or 'date' column
+    PROMOTED_CONTENT_KEYS = {
+        'journal_publication': {'year_of_publication': 'number', 'impact_factor': 'number'},
+        'conference_publication': {'date_of_conference': 'date'},
+        'research_projects': {'amount_sanctioned': 'number', 'duration_from': 'date'},
+        'patents': {'date_of_published': 'date', 'date_of_granted': 'date'},
+        'copyrights': {'date_of_grant': 'date'},
+        'phd_guidance': {'date_of_completion': 'date'},
+        'book_chapter': {'publication_year': 'number'},
+        'book': {'publication_year': 'number'},
+        'consultancy_projects': {'amount_received': 'number'},
+        'editorial_roles': {'start_date': 'date'},
+        'awards': {'date_of_award': 'date'},
+        'industry_collaboration': {'start_date': 'date'},
+        'research_grant_application': {'start_date': 'date'},
+        'conference_travel_request': {'from_date': 'date', 'total_amount': 'number'},
+        'publications_update': {'year_of_publication': 'number'},
+        'curriculum_development': {'program_budget': 'number'},
+    }
+
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='submissions')
     submission_type = models.CharField(max_length=50, choices=SUBMISSION_TYPE_CHOICES)
     title = models.CharField(max_length=255)
@@ -877,10 +1076,25 @@ class FacultySubmission(models.Model):
         ordering = ['-submitted_at']
         indexes = [
             models.Index(fields=['status', 'submission_type']),
-            models.Index(fields=['user', 'status']),
             models.Index(fields=['department', 'status']),
+            # keyset pagination on (submitted_at, id): globally (the dean's queue), per
+            # user, per status filter and for the cluster heads' unreviewed queue
+            models.Index(fields=['-submitted_at', '-id']),
+            models.Index(fields=['user', '-submitted_at', '-id']),
+            models.Index(fields=['user', 'status', '-submitted_at', '-id']),
+            models.Index(fields=['status', '-submitted_at', '-id']),
+            models.Index(fields=['reviewed_by', '-submitted_at', '-id']),
         ]
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        submission = super().from_db(db, field_names, values)
+        # the review-queue scope as loaded, so a save that moves the submission to
+        # another department also expires the queue it left (core/review_queue.py)
+        loaded = {name: value for name, value in zip(field_names, values) if value is not DEFERRED}
+        submission._loaded_scope = (loaded.get('department'), loaded.get('reviewed_by_id'))
+        return submission
+
     def __str__(self):
         return f"{self.title} - {self.user.username} ({self.get_status_display()})"
     
@@ -900,6 +1114,99 @@ class FacultySubmission(models.Model):
         return False
 
 
+class SubmissionContentValue(models.Model):
+    """
+    One promoted FacultySubmission.content key, stored in a typed, indexed column.
+    Rows are rewritten by the post_save receiver in core/signals.py;
+    run `manage.py rebuild_promoted_content` after bulk imports or registry changes.
+    """
+    submission = models.ForeignKey(FacultySubmission, on_delete=models.CASCADE, related_name='promoted_values')
+    # copied from the submission so the indexes can lead with it
+    submission_type = models.CharField(max_length=50)
+    key = models.CharField(max_length=50)
+    number = models.FloatField(null=True, blank=True)
+    date = models.DateField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['submission', 'key'], name='unique_submission_content_key'),
+        ]
+        indexes = [
+            models.Index(fields=['submission_type', 'key', 'number']),
+            models.Index(fields=['submission_type', 'key', 'date']),
+        ]
+
+    def __str__(self):
+        return f"{self.key}={self.number if self.date is None else self.date} (submission {self.submission_id})"
+
+    @staticmethod
+    def coerce(kind, value):
+        """Parse a raw JSON value for a 'number' or 'date' column; None if it does not parse."""
+        if value is None or value == '' or isinstance(value, bool):
+            return None
+        if kind == 'number':
+            try:
+                return float(value)
+            except (TypeError, ValueError):
+                return None
+        if isinstance(value, date):
+            return value
+        try:
+            return parse_date(str(value)[:10])
+        except ValueError:
+            return None
+
+    @classmethod
+    def extract(cls, submission):
+        """Unsaved rows for every registered key present in `submission.content`."""
+        promoted = FacultySubmission.PROMOTED_CONTENT_KEYS.get(submission.submission_type, {})
+        content = submission.content if isinstance(submission.content, dict) else {}
+        rows = []
+        for key, kind in promoted.items():
+            value = cls.coerce(kind, content.get(key))
+            if value is not None:
+                rows.append(cls(
+                    submission_id=submission.pk,
+                    submission_type=submission.submission_type,
+                    key=key,
+                    **{kind: value},
+                ))
+        return rows
+
+    @classmethod
+    def sync_for(cls, submission):
+        """Bring the rows for one submission in line with its content; no writes if nothing changed."""
+        rows = cls.extract(submission)
+        wanted = {(row.submission_type, row.key, row.number, row.date) for row in rows}
+        existing = set(
+            cls.objects.filter(submission_id=submission.pk)
+            .values_list('submission_type', 'key', 'number', 'date')
+        )
+        if wanted == existing:
+            return
+        with transaction.atomic():
+            cls.objects.filter(submission_id=submission.pk).delete()
+            cls.objects.bulk_create(rows)
+
+    @classmethod
+    def filter_submissions(cls, queryset, submission_type, **lookups):
+        """
+        Narrow a FacultySubmission queryset on promoted keys, e.g.
+        filter_submissions(qs, 'journal_publication', impact_factor__gt=5, year_of_publication=2025).
+        Each key becomes an IN subquery served by the (submission_type, key, value) index.
+        """
+        promoted = FacultySubmission.PROMOTED_CONTENT_KEYS.get(submission_type, {})
+        queryset = queryset.filter(submission_type=submission_type)
+        for lookup, value in lookups.items():
+            key, _, operator = lookup.partition('__')
+            if key not in promoted:
+                raise ValueError(f"{key!r} is not a promoted content key for {submission_type!r}")
+            column = promoted[key] + (f'__{operator}' if operator else '')
+            matching = cls.objects.filter(submission_type=submission_type, key=key, **{column: value})
+            queryset = queryset.filter(pk__in=matching.values('submission_id'))
+        return queryset
+
+
 class SubmissionReview(models.Model):
     """
     Model to track detailed review history and comments
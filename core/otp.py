@@ -0,0 +1,150 @@
+import hashlib
+import hmac
+import secrets
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import UserOTP
+
+
+# A code is accepted for this many seconds after it was issued.
+OTP_TTL = getattr(settings, 'OTP_TTL', 300)
+# Wrong guesses allowed before the current code is thrown away.
+OTP_MAX_ATTEMPTS = getattr(settings, 'OTP_MAX_ATTEMPTS', 5)
+# At most OTP_RATE_LIMIT codes per email in any OTP_RATE_WINDOW seconds.
+OTP_RATE_LIMIT = getattr(settings, 'OTP_RATE_LIMIT', 5)
+OTP_RATE_WINDOW = getattr(settings, 'OTP_RATE_WINDOW', 3600)
+
+
+class OTPRateLimited(Exception):
+    """Too many codes were requested for one email address."""
+
+
+def generate_code():
+    return f"{secrets.randbelow(1000000):06d}"
+
+
+def normalize_email(email):
+    return (email or '').strip().lower()
+
+
+class BaseOTPBackend:
+    """
+    Issues and checks one-time codes keyed by email. Every backend must be
+    shared by all worker processes, so a code issued by one gunicorn worker
+    can be verified by another.
+    """
+
+    def issue(self, email):
+        """Store and return a fresh code for `email`, replacing any earlier one. Raises OTPRateLimited."""
+        raise NotImplementedError
+
+    def verify(self, email, code):
+        """True if `code` is the live code for `email`; a correct code is consumed."""
+        raise NotImplementedError
+
+    def purge(self):
+        """Delete expired state and return how many entries went; 0 where storage expires itself."""
+        return 0
+
+
+class DatabaseOTPBackend(BaseOTPBackend):
+    """UserOTP rows, one per email (unique index), expired lazily on read and by `purge_expired_otps`."""
+
+    def issue(self, email):
+        email = normalize_email(email)
+        now = timezone.now()
+        with transaction.atomic():
+            row, created = UserOTP.objects.select_for_update().get_or_create(
+                email=email, defaults={'window_started_at': now},
+            )
+            if now - row.window_started_at >= timedelta(seconds=OTP_RATE_WINDOW):
+                row.window_started_at, row.issue_count = now, 0
+            if row.issue_count >= OTP_RATE_LIMIT:
+                raise OTPRateLimited(email)
+            row.otp = generate_code()
+            row.created_at = now
+            row.attempts = 0
+            row.issue_count += 1
+            row.save()
+        return row.otp
+
+    def verify(self, email, code):
+        row = UserOTP.objects.filter(email=normalize_email(email)).first()
+        if row is None or not row.otp or not code:
+            return False
+        if timezone.now() - row.created_at > timedelta(seconds=OTP_TTL):
+            UserOTP.objects.filter(pk=row.pk, otp=row.otp).update(otp=None)
+            return False
+        if not hmac.compare_digest(row.otp, str(code).strip()):
+            UserOTP.objects.filter(pk=row.pk).update(attempts=F('attempts') + 1)
+            if row.attempts + 1 >= OTP_MAX_ATTEMPTS:
+                UserOTP.objects.filter(pk=row.pk, otp=row.otp).update(otp=None)
+            return False
+        # consume; the conditional update makes a replayed code lose the race
+        return bool(UserOTP.objects.filter(pk=row.pk, otp=row.otp).update(otp=None))
+
+    def purge(self):
+        # a row is only useful while its code is live or its rate window is open
+        cutoff = timezone.now() - timedelta(seconds=max(OTP_TTL, OTP_RATE_WINDOW))
+        deleted, _ = UserOTP.objects.filter(created_at__lt=cutoff, window_started_at__lt=cutoff).delete()
+        return deleted
+
+
+class CacheOTPBackend(BaseOTPBackend):
+    """
+    Codes in the Django cache with the TTL as the cache timeout. Only suitable
+    when CACHES points at a shared server (Redis, Memcached, database cache).
+    """
+
+    def key(self, kind, email):
+        digest = hashlib.sha256(normalize_email(email).encode()).hexdigest()
+        return f"otp:{kind}:{digest}"
+
+    def issue(self, email):
+        rate_key = self.key('rate', email)
+        cache.add(rate_key, 0, OTP_RATE_WINDOW)
+        try:
+            issued = cache.incr(rate_key)
+        except ValueError:  # expired between add() and incr()
+            cache.set(rate_key, 1, OTP_RATE_WINDOW)
+            issued = 1
+        if issued > OTP_RATE_LIMIT:
+            raise OTPRateLimited(email)
+
+        code = generate_code()
+        cache.set(self.key('code', email), {'code': code, 'attempts': 0, 'issued_at': timezone.now()}, OTP_TTL)
+        return code
+
+    def verify(self, email, code):
+        key = self.key('code', email)
+        entry = cache.get(key)
+        if entry is None or not code:
+            return False
+        if not hmac.compare_digest(entry['code'], str(code).strip()):
+            entry['attempts'] += 1
+            remaining = OTP_TTL - (timezone.now() - entry['issued_at']).total_seconds()
+            if entry['attempts'] >= OTP_MAX_ATTEMPTS or remaining <= 0:
+                cache.delete(key)
+            else:
+                cache.set(key, entry, remaining)
+            return False
+        cache.delete(key)
+        return True
+
+
+def get_otp_backend():
+    """
+    Return the backend named by settings.OTP_BACKEND (a dotted path), or the
+    database backend, which works across processes with no extra setup.
+    """
+    path = getattr(settings, 'OTP_BACKEND', None)
+    if path:
+        return import_string(path)()
+    return DatabaseOTPBackend()
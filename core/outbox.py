@@ -0,0 +1,127 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import OutgoingEmail
+
+
+# Give up on a message after this many failed sends.
+OUTBOX_MAX_ATTEMPTS = getattr(settings, 'EMAIL_OUTBOX_MAX_ATTEMPTS', 5)
+# Retry delay is BACKOFF * 2**(attempts - 1) seconds, capped at MAX_BACKOFF.
+OUTBOX_BACKOFF = getattr(settings, 'EMAIL_OUTBOX_BACKOFF', 30)
+OUTBOX_MAX_BACKOFF = getattr(settings, 'EMAIL_OUTBOX_MAX_BACKOFF', 3600)
+# A claimed message is hidden from other workers for this long while it is being sent.
+OUTBOX_LEASE = getattr(settings, 'EMAIL_OUTBOX_LEASE', 300)
+# Sent and failed rows older than this many days are deleted by `manage.py purge_outbox`.
+OUTBOX_RETENTION_DAYS = getattr(settings, 'EMAIL_OUTBOX_RETENTION_DAYS', 30)
+
+
+def queue_mail(subject, message, from_email, recipient_list):
+    """
+    Drop-in for send_mail() that only writes an outbox row; the request never
+    waits on SMTP. `manage.py send_queued_mail` delivers it.
+    """
+    return OutgoingEmail.objects.create(
+        subject=subject,
+        body=message,
+        from_email=from_email or '',
+        recipients=list(recipient_list),
+    )
+
+
+def retry_delay(attempts):
+    return timedelta(seconds=min(OUTBOX_BACKOFF * 2 ** (attempts - 1), OUTBOX_MAX_BACKOFF))
+
+
+def claim_due(limit):
+    """
+    Lease up to `limit` due messages to this worker. Each claim is a conditional
+    UPDATE, so two workers polling the same outbox never send the same row.
+    """
+    now = timezone.now()
+    claimed = []
+    due = OutgoingEmail.objects.filter(status='queued', next_attempt_at__lte=now).order_by('next_attempt_at', 'pk')
+    for email in due[:limit]:
+        leased = OutgoingEmail.objects.filter(
+            pk=email.pk, status='queued', next_attempt_at=email.next_attempt_at,
+        ).update(next_attempt_at=now + timedelta(seconds=OUTBOX_LEASE))
+        if leased:
+            claimed.append(email)
+    return claimed
+
+
+def send_queued(limit=100, connection=None):
+    """
+    Send up to `limit` due messages over a single backend connection.
+    Returns (sent, failed) counts for this pass. Failures are rescheduled with
+    exponential backoff and marked 'failed' after OUTBOX_MAX_ATTEMPTS.
+    """
+    emails = claim_due(limit)
+    if not emails:
+        return 0, 0
+
+    sent = failed = 0
+    connection = connection or get_connection()
+    try:
+        connection.open()
+    except Exception as e:
+        # the server is unreachable: count it against every claimed message
+        for email in emails:
+            _record_failure(email, e)
+        return 0, len(emails)
+
+    try:
+        for email in emails:
+            message = EmailMessage(
+                email.subject, email.body,
+                email.from_email or None, email.recipients,
+                connection=connection,
+            )
+            try:
+                message.send()
+            except Exception as e:
+                _record_failure(email, e)
+                failed += 1
+                # the connection may be dead after an error; start the next message on a fresh one
+                connection.close()
+                try:
+                    connection.open()
+                except Exception:
+                    pass  # send_messages() retries the connect for each remaining message
+            else:
+                # the body may hold a one-time code; nothing reads it once delivered
+                OutgoingEmail.objects.filter(pk=email.pk).update(
+                    status='sent', sent_at=timezone.now(), attempts=email.attempts + 1, last_error='', body='',
+                )
+                sent += 1
+    finally:
+        connection.close()
+
+    return sent, failed
+
+
+def purge_outbox(days=OUTBOX_RETENTION_DAYS):
+    """
+    Delete sent messages delivered more than `days` ago and failed ones queued
+    that long ago. Queued messages are never touched. Returns the number deleted.
+    """
+    cutoff = timezone.now() - timedelta(days=days)
+    purged, _ = OutgoingEmail.objects.filter(
+        Q(status='sent', sent_at__lt=cutoff) | Q(status='failed', created_at__lt=cutoff)
+    ).delete()
+    return purged
+
+
+def _record_failure(email, error):
+    attempts = email.attempts + 1
+    update = {'attempts': attempts, 'last_error': f"{type(error).__name__}: {error}"}
+    if attempts >= OUTBOX_MAX_ATTEMPTS:
+        # never retried, so a one-time code in the body is dropped now as for sent rows
+        update['status'] = 'failed'
+        update['body'] = ''
+    else:
+        update['next_attempt_at'] = timezone.now() + retry_delay(attempts)
+    OutgoingEmail.objects.filter(pk=email.pk).update(**update)
@@ -0,0 +1,108 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from django.db.models import Q
+
+
+class KeysetPage:
+    """
+    One page of a KeysetPaginator. Exposes the bits of django.core.paginator.Page
+    the templates use, plus opaque `next_token` / `previous_token` cursors.
+    """
+
+    def __init__(self, object_list, paginator, has_next, has_previous):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+    @property
+    def next_token(self):
+        if self._has_next and self.object_list:
+            return self.paginator.encode_cursor(self.object_list[-1])
+        return None
+
+    @property
+    def previous_token(self):
+        if self._has_previous and self.object_list:
+            return self.paginator.encode_cursor(self.object_list[0])
+        return None
+
+
+class KeysetPaginator:
+    """
+    Cursor pagination over a queryset ordered newest-first by (`field`, id).
+
+    Each page is a single indexed range scan of `per_page + 1` rows, so the cost
+    does not grow with how far back the reader has scrolled, unlike OFFSET.
+    `count` is optional and only used for display (e.g. the stats total).
+    """
+
+    def __init__(self, queryset, per_page, field='submitted_at', count=None):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.field = field
+        self.count = count
+
+    def encode_cursor(self, obj):
+        payload = json.dumps([getattr(obj, self.field).isoformat(), obj.pk])
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, token):
+        """Return (value, pk) for a token, or None if it is missing or malformed."""
+        if not token:
+            return None
+        try:
+            padded = token + '=' * (-len(token) % 4)
+            value, pk = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            return datetime.fromisoformat(value), int(pk)
+        except (ValueError, TypeError, binascii.Error):
+            return None
+
+    def get_page(self, after=None, before=None):
+        """
+        Return the page following the `after` cursor, preceding the `before` cursor,
+        or the first page when neither is a valid cursor.
+        """
+        field = self.field
+        after = self.decode_cursor(after)
+        before = self.decode_cursor(before) if after is None else None
+
+        if before is not None:
+            value, pk = before
+            rows = list(
+                self.queryset.filter(
+                    Q(**{f'{field}__gt': value}) | Q(**{field: value, 'pk__gt': pk})
+                ).order_by(field, 'pk')[:self.per_page + 1]
+            )
+            if rows:
+                has_previous = len(rows) > self.per_page
+                rows = rows[:self.per_page][::-1]
+                return KeysetPage(rows, self, has_next=True, has_previous=has_previous)
+
+        queryset = self.queryset
+        if after is not None:
+            value, pk = after
+            queryset = queryset.filter(
+                Q(**{f'{field}__lt': value}) | Q(**{field: value, 'pk__lt': pk})
+            )
+        rows = list(queryset.order_by(f'-{field}', '-pk')[:self.per_page + 1])
+        has_next = len(rows) > self.per_page
+        return KeysetPage(rows[:self.per_page], self, has_next=has_next, has_previous=after is not None)
@@ -0,0 +1,269 @@
+import bisect
+import os
+import socket
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import monotonic, perf_counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.template.base import Template
+
+
+# Fraction of requests RequestProfilingMiddleware measures.
+PROFILING_SAMPLE_RATE = getattr(settings, 'PORTAL_PROFILING_SAMPLE_RATE', 0.01)
+# Fraction of sampled requests that trace peak memory instead of timings: tracemalloc
+# slows the request it watches, so those requests are left out of the timing histograms.
+PROFILING_MEMORY_RATE = getattr(settings, 'PORTAL_PROFILING_MEMORY_RATE', 0.1)
+# Seconds between pushes of this process's histograms to the cache, where
+# the stats endpoint and `manage.py portal_stats` merge every process.
+PROFILING_FLUSH_INTERVAL = getattr(settings, 'PORTAL_PROFILING_FLUSH_INTERVAL', 30)
+PROFILING_CACHE_TIMEOUT = getattr(settings, 'PORTAL_PROFILING_CACHE_TIMEOUT', 24 * 3600)
+PROFILING_INDEX_KEY = 'portal_stats:processes'
+
+# Upper bucket bounds shared by every histogram (ms, queries or KiB); a last bucket catches the rest.
+HISTOGRAM_BOUNDS = tuple(base * 10 ** exp for exp in range(6) for base in (1, 2, 5))
+TIMING_METRICS = ('wall_ms', 'sql_count', 'sql_ms', 'render_ms')
+MEMORY_METRICS = ('peak_kib',)
+
+_template_timing = ContextVar('portal_template_timing', default=None)
+_template_depth = ContextVar('portal_template_depth', default=0)
+_timer_installed = False
+_timer_lock = threading.Lock()
+
+
+def _install_template_timer():
+    """Wrap Template.render once; the wrapper only measures while template_timer() is active in this context."""
+    global _timer_installed
+    with _timer_lock:
+        if _timer_installed:
+            return
+        original = Template.render
+
+        def render(self, context):
+            timing = _template_timing.get()
+            if timing is None or _template_depth.get():
+                return original(self, context)
+            token = _template_depth.set(1)
+            start = perf_counter()
+            try:
+                return original(self, context)
+            finally:
+                timing['seconds'] += perf_counter() - start
+                _template_depth.reset(token)
+
+        Template.render = render
+        _timer_installed = True
+
+
+@contextmanager
+def template_timer():
+    """
+    Add the time spent in top-level Template.render calls (includes run inside
+    their parent) to the yielded dict's 'seconds'. Safe under threads: other
+    requests render untimed.
+    """
+    _install_template_timer()
+    timing = {'seconds': 0.0}
+    token = _template_timing.set(timing)
+    try:
+        yield timing
+    finally:
+        _template_timing.reset(token)
+
+
+class QueryTimer:
+    """
+    Database execute wrapper counting statements and their wall time. Used
+    instead of connection.queries, which rounds each duration to the millisecond.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.seconds += perf_counter() - start
+
+
+@contextmanager
+def query_timer():
+    """Time every query run on any configured database inside the block."""
+    timer = QueryTimer()
+    wrappers = [connections[alias].execute_wrapper(timer) for alias in connections]
+    for wrapper in wrappers:
+        wrapper.__enter__()
+    try:
+        yield timer
+    finally:
+        for wrapper in reversed(wrappers):
+            wrapper.__exit__(None, None, None)
+
+
+class Histogram:
+    """Counts over HISTOGRAM_BOUNDS plus running sum and max; cheap to merge across processes."""
+
+    __slots__ = ('counts', 'sum', 'max')
+
+    def __init__(self, counts=None, total=0.0, maximum=0.0):
+        self.counts = list(counts) if counts else [0] * (len(HISTOGRAM_BOUNDS) + 1)
+        self.sum = total
+        self.max = maximum
+
+    @property
+    def count(self):
+        return sum(self.counts)
+
+    def add(self, value):
+        self.counts[bisect.bisect_left(HISTOGRAM_BOUNDS, value)] += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def merge(self, other):
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.sum += other.sum
+        self.max = max(self.max, other.max)
+
+    def percentile(self, fraction):
+        """Upper bound of the bucket holding the `fraction` quantile (the max for the last bucket)."""
+        wanted = fraction * self.count
+        seen = 0
+        for bound, count in zip(HISTOGRAM_BOUNDS, self.counts):
+            seen += count
+            if seen >= wanted and seen:
+                return min(bound, self.max)
+        return self.max
+
+    def as_dict(self):
+        return {'counts': self.counts, 'sum': self.sum, 'max': self.max}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['counts'], data['sum'], data['max'])
+
+
+class ProfileRecorder:
+    """
+    Per-process histograms keyed by URL name, pushed to the cache every
+    PROFILING_FLUSH_INTERVAL seconds so any process can report on all of them
+    through the shared CACHES backend configured in settings.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.views = {}
+        self.key = f"portal_stats:{socket.gethostname()}:{os.getpid()}"
+        self.flushed_at = monotonic()
+
+    def record(self, view_name, metrics):
+        with self.lock:
+            histograms = self.views.setdefault(view_name, {})
+            for metric, value in metrics.items():
+                histograms.setdefault(metric, Histogram()).add(value)
+            due = monotonic() - self.flushed_at >= PROFILING_FLUSH_INTERVAL
+        if due:
+            self.flush()
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                view: {metric: histogram.as_dict() for metric, histogram in histograms.items()}
+                for view, histograms in self.views.items()
+            }
+
+    def flush(self):
+        self.flushed_at = monotonic()
+        cache.set(self.key, self.snapshot(), PROFILING_CACHE_TIMEOUT)
+        keys = cache.get(PROFILING_INDEX_KEY) or []
+        if self.key not in keys:
+            cache.set(PROFILING_INDEX_KEY, keys + [self.key], PROFILING_CACHE_TIMEOUT)
+
+    def collect(self):
+        """Histograms merged across every process that has flushed, with this process's taken live."""
+        keys = [key for key in cache.get(PROFILING_INDEX_KEY) or [] if key != self.key]
+        snapshots = list(cache.get_many(keys).values()) + [self.snapshot()]
+        merged = {}
+        for snapshot in snapshots:
+            for view, histograms in snapshot.items():
+                target = merged.setdefault(view, {})
+                for metric, data in histograms.items():
+                    target.setdefault(metric, Histogram()).merge(Histogram.from_dict(data))
+        return merged
+
+    def reset(self):
+        with self.lock:
+            self.views = {}
+        cache.delete_many((cache.get(PROFILING_INDEX_KEY) or []) + [PROFILING_INDEX_KEY])
+
+
+recorder = ProfileRecorder()
+_memory_lock = threading.Lock()
+
+
+def profile_request(request, get_response, trace_memory=False):
+    """
+    Run the request and record its timings, or (with `trace_memory`) its peak
+    traced allocation, under the resolved URL name.
+    """
+    if trace_memory:
+        # tracemalloc is process-wide: trace one request at a time, and never over someone else's trace
+        if tracemalloc.is_tracing() or not _memory_lock.acquire(blocking=False):
+            return get_response(request)
+        try:
+            tracemalloc.start()
+            response = get_response(request)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+            _memory_lock.release()
+        recorder.record(view_name(request), {'peak_kib': peak / 1024})
+        return response
+
+    with query_timer() as queries, template_timer() as rendering:
+        start = perf_counter()
+        response = get_response(request)
+        elapsed = perf_counter() - start
+    # streamed bodies are produced after this returns, so only their setup is counted
+    recorder.record(view_name(request), {
+        'wall_ms': elapsed * 1000,
+        'sql_count': queries.count,
+        'sql_ms': queries.seconds * 1000,
+        'render_ms': rendering['seconds'] * 1000,
+    })
+    return response
+
+
+def view_name(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return '<unresolved>'
+    return match.view_name or match._func_path
+
+
+def summarize(views, sort='wall_ms'):
+    """Rows of count, mean, p50, p95 and max per metric for each view, busiest by `sort` first."""
+    rows = []
+    for view, histograms in views.items():
+        row = {'view': view}
+        for metric in TIMING_METRICS + MEMORY_METRICS:
+            histogram = histograms.get(metric)
+            if histogram is None or not histogram.count:
+                continue
+            row[metric] = {
+                'count': histogram.count,
+                'mean': round(histogram.sum / histogram.count, 3),
+                'p50': round(histogram.percentile(0.50), 3),
+                'p95': round(histogram.percentile(0.95), 3),
+                'max': round(histogram.max, 3),
+            }
+        rows.append(row)
+    rows.sort(key=lambda row: row.get(sort, {}).get('mean', 0) * row.get(sort, {}).get('count', 0), reverse=True)
+    return rows
@@ -0,0 +1,177 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q
+
+from .forms import SubmissionFilterForm
+from .models import FacultySubmission
+
+
+# Cached counts live this long at most, which bounds staleness for writes that
+# bypass signals (queryset.update).
+REVIEW_QUEUE_TIMEOUT = getattr(settings, 'REVIEW_QUEUE_CACHE_TIMEOUT', 300)
+REVIEW_QUEUE_VERSION_KEY = 'review_queue:version'
+REVIEW_QUEUE_FILTERS = ['status', 'submission_type', 'department', 'date_from', 'date_to']
+# FacultySubmission fields the scoping and filters read; saves touching none of them keep the counts.
+REVIEW_COUNT_FIELDS = {'status', 'submission_type', 'department', 'submitted_at', 'reviewed_by'}
+# The queues hold every submission not in one of these (pending, under review,
+# needs revision). Written as an exclusion because `status IN (three open values)`
+# makes the planner read the status index and sort the whole queue for each page;
+# without a status equality it walks a (..., submitted_at, id) index in page order.
+REVIEW_CLOSED_STATUSES = ['approved', 'rejected']
+
+
+def review_queryset(user, params):
+    """
+    Build the role-scoped, filtered review queue for a dean or cluster head.
+    Returns (queryset, filter_form); queryset is None for any other role.
+    """
+    filter_form = SubmissionFilterForm(params)
+    submissions = FacultySubmission.objects.all()
+
+    # Scope submissions based on role
+    if user.is_dean():
+        # Dean sees only submissions that have been touched by Cluster Head
+        submissions = submissions.filter(
+            reviewed_by__isnull=False,  # cluster head reviewed
+        ).exclude(status__in=REVIEW_CLOSED_STATUSES)  # still open
+    elif user.is_cluster_head():
+        dept = user.department or ''
+        submissions = submissions.filter(
+            Q(department=dept) | Q(department__isnull=True) | Q(department='')
+        ).filter(
+            reviewed_by__isnull=True  # not yet reviewed by dean
+        )
+    else:
+        return None, filter_form
+
+    # Apply default filter (pending-ish statuses)
+    if 'status' not in params or not params.get('status'):
+        submissions = submissions.exclude(status__in=REVIEW_CLOSED_STATUSES)
+    
+    # Apply filters from form
+    if filter_form.is_valid():
+        if filter_form.cleaned_data['status']:
+            submissions = submissions.filter(status=filter_form.cleaned_data['status'])
+        if filter_form.cleaned_data['submission_type']:
+            submissions = submissions.filter(submission_type=filter_form.cleaned_data['submission_type'])
+        if filter_form.cleaned_data['department']:
+            submissions = submissions.filter(department__icontains=filter_form.cleaned_data['department'])
+        if filter_form.cleaned_data['date_from']:
+            submissions = submissions.filter(submitted_at__gte=filter_form.cleaned_data['date_from'])
+        if filter_form.cleaned_data['date_to']:
+            submissions = submissions.filter(submitted_at__lte=filter_form.cleaned_data['date_to'])
+
+    return submissions, filter_form
+
+
+def _bump(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, None)
+
+
+def _department_version_key(department):
+    # department names contain spaces, which memcached keys may not, so they are hashed
+    return f"{REVIEW_QUEUE_VERSION_KEY}:department:{hashlib.md5((department or '').encode()).hexdigest()}"
+
+
+def _scope_version_keys(department, reviewed_by_id):
+    """Version keys of the queues a submission with this department and reviewer can appear in."""
+    if department:
+        keys = {_department_version_key(department)}
+    else:
+        keys = {f"{REVIEW_QUEUE_VERSION_KEY}:cluster_head"}
+    if reviewed_by_id is not None:
+        keys.add(f"{REVIEW_QUEUE_VERSION_KEY}:dean")
+    return keys
+
+
+def invalidate_review_queue(submission=None):
+    """
+    Expire cached review counts by bumping version numbers in the shared cache.
+    With a `submission`, only the queues that can contain it, as saved and as it
+    was loaded: its department's cluster heads (every cluster head for an
+    unassigned one) and, once a cluster head has reviewed it, the deans. Without
+    one, every queue. The bump waits for the current transaction to commit: made
+    earlier, a concurrent reader could cache the pre-commit counts under the new
+    version, and they would stay until the next write.
+    Called from core/signals.py when a FacultySubmission changes.
+    """
+    if submission is None:
+        keys = {REVIEW_QUEUE_VERSION_KEY}
+    else:
+        keys = _scope_version_keys(submission.department, submission.reviewed_by_id)
+        loaded = getattr(submission, '_loaded_scope', None)
+        if loaded is not None:
+            keys |= _scope_version_keys(*loaded)
+
+    def bump_versions():
+        for key in keys:
+            _bump(key)
+
+    transaction.on_commit(bump_versions)
+
+
+def review_counts_key(user, params):
+    scopes = [REVIEW_QUEUE_VERSION_KEY, f"{REVIEW_QUEUE_VERSION_KEY}:{user.role}"]
+    if user.is_cluster_head():
+        scopes.append(_department_version_key(user.department))
+    versions = cache.get_many(scopes)
+
+    filters = {name: params.get(name, '') for name in REVIEW_QUEUE_FILTERS}
+    filters['_department'] = user.department if user.is_cluster_head() else ''
+    filter_hash = hashlib.md5(json.dumps(filters, sort_keys=True).encode()).hexdigest()
+    version = '.'.join(str(versions.get(scope, 0)) for scope in scopes)
+    return f"review_queue:{version}:{user.role}:{filter_hash}"
+
+
+def submission_status_stats(submissions):
+    """
+    Count `submissions` per status in a single conditional-aggregate query.
+    Returns {'total': n, 'pending': n, 'under_review': n, ...} with a key for every status.
+    """
+    aggregates = {
+        status: Count('pk', filter=Q(status=status))
+        for status, label in FacultySubmission.STATUS_CHOICES
+    }
+    aggregates['total'] = Count('pk')
+    return submissions.order_by().aggregate(**aggregates)
+
+
+def cached_review_queue(user, params):
+    """
+    Return (submissions, counts, filter_form) for the reviewer: the scoped,
+    filtered queryset, to be paged with KeysetPaginator, and its per-status
+    totals. Only the counts are cached, per (role, department, filters);
+    submissions and counts are None for non-reviewer roles.
+    """
+    submissions, filter_form = review_queryset(user, params)
+    if submissions is None:
+        return None, None, filter_form
+
+    key = review_counts_key(user, params)
+    counts = cache.get(key)
+    if counts is None:
+        counts = submission_status_stats(submissions)
+        cache.set(key, counts, REVIEW_QUEUE_TIMEOUT)
+
+    return submissions, counts, filter_form
+
+
+def review_rows_version(rows):
+    """
+    Cache key for one rendered page of review rows: the row ids, their latest
+    updated_at and the faculty names shown. The template caches the whole page
+    as one fragment, so a page costs a single cache read whatever its size.
+    """
+    rows = list(rows)
+    return (
+        [row.pk for row in rows],
+        max((row.updated_at for row in rows), default=None),
+        [(row.user.username, row.user.first_name, row.user.last_name) for row in rows],
+    )
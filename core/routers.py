@@ -0,0 +1,66 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+
+# Alias of the read replica in settings.DATABASES (see DATABASE_REPLICA_URL).
+REPLICA_DATABASE = getattr(settings, 'REPLICA_DATABASE', 'replica')
+# URL names whose GET requests may read from the replica.
+REPLICA_URL_NAMES = getattr(settings, 'REPLICA_URL_NAMES', {
+    'review_dashboard', 'review_stats', 'my_submissions', 'my_submission_stats',
+    'submission_list', 'form_view', 'faculty_forms',
+})
+# Seconds a client keeps reading from the primary after a write, so the page it
+# is redirected to (and the next few) show what it just saved despite replica lag.
+REPLICA_PIN_SECONDS = getattr(settings, 'REPLICA_PIN_SECONDS', 15)
+REPLICA_PIN_COOKIE = 'portal_read_primary'
+# Always read from the primary: a lagging session table would log people out,
+# and a lagging DatabaseCache table would serve entries already invalidated.
+PRIMARY_ONLY_APPS = {'sessions', 'django_cache'}
+
+_routing = ContextVar('replica_routing', default=None)
+
+
+@contextmanager
+def request_routing():
+    """
+    Per-request routing state for PrimaryReplicaRouter: 'replica' is set by
+    ReplicaRoutingMiddleware for read-only views, 'wrote' by the first write.
+    Outside this block every query goes to the primary.
+    """
+    state = {'replica': False, 'wrote': False}
+    token = _routing.set(state)
+    try:
+        yield state
+    finally:
+        _routing.reset(token)
+
+
+class PrimaryReplicaRouter:
+    """
+    Writes always go to the primary. Reads go to REPLICA_DATABASE only inside
+    a request the middleware marked read-only and only until that request
+    writes anything; after that it reads its own writes from the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        state = _routing.get()
+        if state and state['replica'] and not state['wrote'] and model._meta.app_label not in PRIMARY_ONLY_APPS:
+            return REPLICA_DATABASE
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        state = _routing.get()
+        if state is not None:
+            state['wrote'] = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # the replica holds the same rows as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # the replica gets its schema through replication
+        return db != REPLICA_DATABASE
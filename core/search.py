@@ -0,0 +1,167 @@
+import re
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import BooleanField, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+
+# Ranked search never returns more than this many submissions; the dashboard says when it cut some.
+SEARCH_RESULT_LIMIT = getattr(settings, 'SUBMISSION_SEARCH_LIMIT', 50)
+
+# FTS5 table over title, description and content; it and the triggers that keep
+# it current are created by migration 0032.
+FTS_TABLE = 'core_submission_fts'
+
+# Weighted document used by the Postgres backend. The GIN index created in
+# migration 0032 is built on a copy of exactly this expression so the planner can use it.
+POSTGRES_VECTOR_SQL = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B') || "
+    "setweight(jsonb_to_tsvector('english', content, '[\"string\"]'), 'C')"
+)
+
+
+def search_terms(query):
+    """Split free text into plain word tokens, dropping any search-syntax characters."""
+    return re.findall(r'\w+', query or '')
+
+
+class BaseSearchBackend:
+    """
+    Matches and ranks FacultySubmission rows against a free-text query.
+    Backends narrow an existing queryset, so role scoping still applies.
+    """
+
+    def filter(self, queryset, query):
+        """Every row of `queryset` matching `query`, unordered."""
+        raise NotImplementedError
+
+    def rank(self, queryset, query):
+        """Annotate `search_rank` (higher is better) on rows already narrowed by filter()."""
+        raise NotImplementedError
+
+    def search(self, queryset, query, limit=SEARCH_RESULT_LIMIT):
+        """The best `limit` matches, highest rank first, each with `search_rank` set."""
+        matches = self.filter(queryset, query)
+        return self.rank(matches, query).order_by('-search_rank', '-submitted_at')[:limit]
+
+
+class SQLiteFTSBackend(BaseSearchBackend):
+    """
+    FTS5 virtual table kept current by triggers, ranked with bm25. bm25() only
+    works inside the full-text query itself, so ranking happens in search()
+    rather than as an annotation.
+    """
+
+    # bm25 column weights for (title, description, content)
+    weights = (10.0, 4.0, 1.0)
+
+    def match_expression(self, query):
+        terms = search_terms(query)
+        if not terms:
+            return None
+        # every term must appear; the last one may be a prefix of what the user is still typing
+        quoted = [f'"{term}"' for term in terms]
+        quoted[-1] += '*'
+        return ' '.join(quoted)
+
+    def filter(self, queryset, query):
+        match = self.match_expression(query)
+        if match is None:
+            return queryset.none()
+        return queryset.filter(pk__in=RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [match]))
+
+    def ranked_sql(self, queryset, query, limit):
+        """
+        (sql, params) returning the best `limit` (rowid, score) pairs in scope.
+        FTS5 matches and scores in a single pass; each match is then checked
+        against the role-scoped queryset with one primary-key seek, so nothing
+        is re-matched per submission row.
+        """
+        weights = ', '.join(str(weight) for weight in self.weights)
+        in_scope = queryset.filter(pk=RawSQL("ranked.rowid", [])).order_by().values('pk')
+        scope_sql, scope_params = in_scope.query.sql_with_params()
+        sql = (
+            f"SELECT ranked.rowid, ranked.score FROM ("
+            f"SELECT rowid, -bm25({FTS_TABLE}, {weights}) AS score FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s"
+            f") AS ranked WHERE EXISTS ({scope_sql}) "
+            f"ORDER BY ranked.score DESC, ranked.rowid DESC LIMIT %s"
+        )
+        return sql, [self.match_expression(query), *scope_params, limit]
+
+    def search(self, queryset, query, limit=SEARCH_RESULT_LIMIT):
+        """The best `limit` matches as a list, highest rank first, each with `search_rank` set."""
+        if self.match_expression(query) is None:
+            return []
+        with connection.cursor() as cursor:
+            cursor.execute(*self.ranked_sql(queryset, query, limit))
+            scores = dict(cursor.fetchall())
+        # the ids are already scope-checked; fetching them by pk alone keeps the
+        # planner on the primary key instead of the scope's status index
+        fetch = queryset.model._default_manager.using(queryset.db).all()
+        fetch.query.select_related = queryset.query.select_related
+        rows = fetch.in_bulk(list(scores))
+        results = []
+        for pk, score in scores.items():
+            if pk in rows:
+                rows[pk].search_rank = score
+                results.append(rows[pk])
+        return results
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """Weighted tsvector over an expression GIN index, ranked with ts_rank."""
+
+    def filter(self, queryset, query):
+        if not search_terms(query):
+            return queryset.none()
+        return queryset.filter(
+            RawSQL(
+                f"({POSTGRES_VECTOR_SQL}) @@ websearch_to_tsquery('english', %s)",
+                [query],
+                output_field=BooleanField(),
+            )
+        )
+
+    def rank(self, queryset, query):
+        return queryset.annotate(
+            search_rank=RawSQL(
+                f"ts_rank(({POSTGRES_VECTOR_SQL}), websearch_to_tsquery('english', %s))",
+                [query],
+                output_field=FloatField(),
+            )
+        )
+
+
+class SimpleSearchBackend(BaseSearchBackend):
+    """Unindexed fallback for other databases: every term must appear in title or description."""
+
+    def filter(self, queryset, query):
+        terms = search_terms(query)
+        if not terms:
+            return queryset.none()
+        for term in terms:
+            queryset = queryset.filter(Q(title__icontains=term) | Q(description__icontains=term))
+        return queryset
+
+    def rank(self, queryset, query):
+        return queryset.annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+
+VENDOR_BACKENDS = {
+    'sqlite': SQLiteFTSBackend,
+    'postgresql': PostgresSearchBackend,
+}
+
+
+def get_search_backend():
+    """
+    Return the backend named by settings.SUBMISSION_SEARCH_BACKEND (a dotted path),
+    or the default for the database vendor in use.
+    """
+    path = getattr(settings, 'SUBMISSION_SEARCH_BACKEND', None)
+    if path:
+        return import_string(path)()
+    return VENDOR_BACKENDS.get(connection.vendor, SimpleSearchBackend)()
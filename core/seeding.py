@@ -0,0 +1,313 @@
+import random
+from collections import Counter
+from contextlib import contextmanager
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import NamedTuple
+
+from django.contrib.auth.hashers import make_password
+from django.core.validators import URLValidator
+from django.db import models, transaction
+from django.utils import timezone
+
+from .categories import SUBMISSION_CATEGORIES, submission_content, submission_title
+from .models import CustomUser, FacultySubmission, SubmissionContentValue, SubmissionReview, UserActivityCounters, UserFormProgress
+from .review_queue import invalidate_review_queue
+
+
+# Rows per bulk_create statement, and roughly how many submissions are written per transaction.
+SEED_BATCH_SIZE = 2000
+# Every seeded account shares this password (hashed once per run).
+SEED_PASSWORD = 'portal-seed'
+# Submissions are spread over this many days before now.
+SEED_HISTORY_DAYS = 3 * 365
+# Share of optional fields left empty, as real forms are.
+SEED_BLANK_RATE = 0.15
+
+STATUS_WEIGHTS = {'pending': 5, 'under_review': 2, 'approved': 4, 'rejected': 1, 'needs_revision': 1}
+# SubmissionReview.action recorded by the cluster head for each status
+REVIEW_ACTIONS = {
+    'pending': 'reviewed',
+    'under_review': 'reviewed',
+    'approved': 'approved',
+    'rejected': 'rejected',
+    'needs_revision': 'revision_requested',
+}
+TITLE_WORDS = [
+    'adaptive', 'analysis', 'campus', 'climate', 'data', 'deep', 'digital', 'energy', 'framework',
+    'governance', 'health', 'learning', 'markets', 'model', 'network', 'policy', 'quantum', 'review',
+    'rural', 'secure', 'smart', 'study', 'supply', 'systems', 'urban', 'water',
+]
+
+# category model -> its UserActivityCounters field
+COUNTER_FIELDS = {model: field for field, model in UserActivityCounters.COUNTED_MODELS.items()}
+
+
+class SeededInstitution(NamedTuple):
+    faculty: list
+    cluster_heads: list
+    deans: list
+    # model name -> rows created
+    rows: Counter
+
+
+def school_name(school):
+    return f"School {school + 1}"
+
+
+def department_name(school, department):
+    return f"S{school + 1} Department {department + 1}"
+
+
+def seed_users(schools, departments, faculty, password_hash, prefix=''):
+    """
+    Unsaved users: one dean per school, one cluster head per department and
+    `faculty` faculty members dealt round-robin across all departments.
+    """
+    users = []
+
+    def add(username, role, school, department=None):
+        username = f"{prefix}{username}"
+        users.append(CustomUser(
+            username=username, email=f"{username}@iilm.edu", password=password_hash,
+            first_name=role.replace('_', ' ').title(), last_name=username,
+            role=role, school=school, department=department, is_profile_complete=True,
+        ))
+
+    places = [(s, d) for s in range(schools) for d in range(departments)]
+    for s in range(schools):
+        add(f"dean-s{s + 1}", 'dean', school_name(s))
+    for s, d in places:
+        add(f"head-s{s + 1}-d{d + 1}", 'cluster_head', school_name(s), department_name(s, d))
+    for n in range(faculty):
+        s, d = places[n % len(places)]
+        add(f"faculty-{n + 1:06d}", 'faculty', school_name(s), department_name(s, d))
+    return users
+
+
+def fake_words(rng, low, high):
+    return ' '.join(rng.choices(TITLE_WORDS, k=rng.randint(low, high)))
+
+
+def fake_title(rng):
+    return fake_words(rng, 3, 7).capitalize()
+
+
+def fake_date(rng):
+    return date(2015, 1, 1) + timedelta(days=rng.randrange(11 * 365))
+
+
+def value_maker(field):
+    """A function of `rng` returning a plausible value for `field`; built once per field."""
+    if field.choices:
+        values = [value for value, label in field.flatchoices if value not in ('', None)]
+        return lambda rng: rng.choice(values)
+    if isinstance(field, models.BooleanField):
+        return lambda rng: rng.random() < 0.5
+    if isinstance(field, models.FileField):
+        return lambda rng: ''
+    if isinstance(field, models.DateField):
+        make = fake_date
+    elif isinstance(field, models.DecimalField):
+        top, places = min(10 ** (field.max_digits - field.decimal_places) - 1, 100000), field.decimal_places
+        make = lambda rng: Decimal(f"{rng.uniform(0, top):.{places}f}")
+    elif isinstance(field, models.IntegerField):
+        low, high = (2000, 2025) if 'year' in field.name else (1, 10)
+        make = lambda rng: rng.randint(low, high)
+    elif isinstance(field, models.TextField):
+        make = lambda rng: fake_words(rng, 12, 40).capitalize() + '.'
+    elif isinstance(field, models.EmailField):
+        make = lambda rng: f"{fake_words(rng, 2, 2).replace(' ', '.')}@example.org"
+    elif isinstance(field, models.URLField) or any(isinstance(v, URLValidator) for v in field.validators):
+        make = lambda rng: f"https://example.org/{fake_words(rng, 3, 3).replace(' ', '-')}"
+    else:
+        length = field.max_length
+        make = lambda rng: fake_words(rng, 1, 4).title()[:length]
+    if not field.null:
+        return make
+    return lambda rng: None if rng.random() < SEED_BLANK_RATE else make(rng)
+
+
+def record_fields(model):
+    return [field for field in model._meta.concrete_fields if not field.primary_key and field.name != 'user']
+
+
+# category model -> [(attname, value maker)], filled on first use
+_RECORD_MAKERS = {}
+
+
+def fake_record(rng, kind, user):
+    """An unsaved category-model instance for `kind`, owned by `user`."""
+    spec = SUBMISSION_CATEGORIES[kind]
+    model = spec.form_class._meta.model
+    makers = _RECORD_MAKERS.get(model)
+    if makers is None:
+        makers = _RECORD_MAKERS[model] = [(field.attname, value_maker(field)) for field in record_fields(model)]
+    record = model(user=user, **{attname: make(rng) for attname, make in makers})
+    if spec.title_field:
+        setattr(record, spec.title_field, fake_title(rng)[:model._meta.get_field(spec.title_field).max_length])
+    return record
+
+
+@contextmanager
+def explicit_timestamps():
+    """
+    Let bulk_create keep the submitted_at/updated_at/created_at values set on
+    the instances instead of stamping every row with now(). Flips auto_now on
+    the shared field objects, so use it only from a single-threaded command.
+    """
+    fields = [
+        FacultySubmission._meta.get_field('submitted_at'),
+        FacultySubmission._meta.get_field('updated_at'),
+        SubmissionReview._meta.get_field('created_at'),
+    ]
+    saved = [(field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, (auto_now, auto_now_add) in zip(fields, saved):
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def chunked(objs, size=SEED_BATCH_SIZE):
+    batch = []
+    for obj in objs:
+        batch.append(obj)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def bulk_insert(model, objs, batch_size=SEED_BATCH_SIZE):
+    """bulk_create an iterable in batches of `batch_size`; returns how many rows went in."""
+    inserted = 0
+    for batch in chunked(objs, batch_size):
+        model.objects.bulk_create(batch)
+        inserted += len(batch)
+    return inserted
+
+
+def bulk_insert_returning(model, objs, batch_size=SEED_BATCH_SIZE, **scope):
+    """
+    bulk_create `objs` (a list) and return them with primary keys, re-reading them
+    where the backend cannot return ids (MySQL). `scope` narrows the re-read to rows
+    only this caller writes, for callers that run alongside other writers.
+    """
+    last_pk = model.objects.order_by('-pk').values_list('pk', flat=True).first() or 0
+    model.objects.bulk_create(objs, batch_size=batch_size)
+    if objs and objs[0].pk is None:
+        objs = list(model.objects.filter(pk__gt=last_pk, **scope).order_by('pk'))
+    return objs
+
+
+def seed_faculty_batch(rng, faculty, heads, deans, per_user, now, batch_size):
+    """Category records, submissions, reviews, counters and progress for a batch of faculty."""
+    rows = Counter()
+    kinds = list(SUBMISSION_CATEGORIES)
+    statuses, weights = list(STATUS_WEIGHTS), list(STATUS_WEIGHTS.values())
+    records, submissions, reviewers, counters, progress_rows = {}, [], [], [], []
+
+    for user in faculty:
+        counts = Counter()
+        done = set()
+        offset = rng.randrange(len(kinds))
+        for i in range(per_user):
+            kind = kinds[(offset + i) % len(kinds)]
+            spec = SUBMISSION_CATEGORIES[kind]
+            record = fake_record(rng, kind, user)
+            records.setdefault(type(record), []).append(record)
+            counts[type(record)] += 1
+            if spec.progress_field:
+                done.add(spec.progress_field)
+
+            submitted_at = now - timedelta(seconds=rng.randrange(SEED_HISTORY_DAYS * 86400))
+            status = rng.choices(statuses, weights)[0]
+            # anything past 'pending' has been looked at by the cluster head
+            head = heads[user.department] if status != 'pending' or rng.random() < 0.2 else None
+            reviewed_at = submitted_at + timedelta(hours=rng.randint(1, 24 * 30)) if head else None
+            submissions.append(FacultySubmission(
+                user=user, submission_type=kind, title=submission_title(kind, record),
+                description=f"{dict(FacultySubmission.SUBMISSION_TYPE_CHOICES)[kind]} by {user.username}",
+                content=submission_content(record, [field.name for field in record_fields(type(record))]),
+                status=status, reviewed_by=head, reviewed_at=reviewed_at,
+                submitted_at=submitted_at, updated_at=reviewed_at or submitted_at,
+                department=user.department, school=user.school,
+            ))
+            reviewers.append((head, deans[user.school] if status in ('approved', 'rejected') and rng.random() < 0.5 else None))
+
+        counters.append(UserActivityCounters(user=user, **{COUNTER_FIELDS[model]: n for model, n in counts.items()}))
+        progress = UserFormProgress(user=user, **{field: True for field in done})
+        progress.recompute()
+        progress_rows.append(progress)
+
+    for model, objs in records.items():
+        rows[model.__name__] += bulk_insert(model, objs, batch_size)
+    submissions = bulk_insert_returning(FacultySubmission, submissions, batch_size)
+    rows['FacultySubmission'] += len(submissions)
+
+    rows['SubmissionContentValue'] += bulk_insert(
+        SubmissionContentValue, (value for submission in submissions for value in SubmissionContentValue.extract(submission)), batch_size,
+    )
+    reviews = []
+    for submission, (head, dean) in zip(submissions, reviewers):
+        if head:
+            reviews.append(SubmissionReview(
+                submission=submission, reviewer=head, action=REVIEW_ACTIONS[submission.status],
+                comments=f"Reviewed by {head.username}", created_at=submission.reviewed_at,
+            ))
+        if dean:
+            reviews.append(SubmissionReview(
+                submission=submission, reviewer=dean, action=submission.status,
+                comments='', created_at=submission.reviewed_at + timedelta(days=1),
+            ))
+    rows['SubmissionReview'] += bulk_insert(SubmissionReview, reviews, batch_size)
+    rows['UserActivityCounters'] += bulk_insert(UserActivityCounters, counters, batch_size)
+    rows['UserFormProgress'] += bulk_insert(UserFormProgress, progress_rows, batch_size)
+    return rows
+
+
+def seed_institution(schools=2, departments=3, faculty=60, submissions_per_user=36, seed=0,
+                     prefix='', batch_size=SEED_BATCH_SIZE, progress=None):
+    """
+    Create a deterministic synthetic institution: the same arguments always
+    produce the same usernames, records, titles, statuses and timestamps
+    (relative to now). Submissions cycle through every category from a random
+    starting point, so each faculty member covers all 18 once they have 18.
+
+    Everything goes in with bulk_create, one transaction per batch of faculty,
+    so post_save receivers do not run: activity counters, form progress and
+    promoted content values are written here and the cached review queue counts
+    invalidated at the end. `progress(done, total)` is called after each batch.
+    """
+    rng = random.Random(seed)
+    now = timezone.now()
+    rows = Counter()
+
+    users = seed_users(schools, departments, faculty, make_password(SEED_PASSWORD), prefix)
+    with transaction.atomic():
+        rows['CustomUser'] += bulk_insert(CustomUser, users, batch_size)
+    # bulk_create does not return pks on every backend
+    saved = {}
+    for names in chunked([user.username for user in users], 500):
+        saved.update((user.username, user) for user in CustomUser.objects.filter(username__in=names))
+    users = [saved[user.username] for user in users]
+
+    by_role = {role: [user for user in users if user.role == role] for role in ('faculty', 'cluster_head', 'dean')}
+    heads = {user.department: user for user in by_role['cluster_head']}
+    deans = {user.school: user for user in by_role['dean']}
+
+    done = 0
+    with explicit_timestamps():
+        for batch in chunked(by_role['faculty'], max(batch_size // max(submissions_per_user, 1), 1)):
+            with transaction.atomic():
+                rows += seed_faculty_batch(rng, batch, heads, deans, submissions_per_user, now, batch_size)
+            done += len(batch)
+            if progress:
+                progress(done, len(by_role['faculty']))
+
+    invalidate_review_queue()
+    return SeededInstitution(by_role['faculty'], by_role['cluster_head'], by_role['dean'], rows)
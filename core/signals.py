@@ -1,7 +1,13 @@
 # signals.py
-from django.db.models.signals import post_save
+from django.conf import settings
+from django.contrib.auth.signals import user_logged_in
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
-from .models import SubmissionReview, FacultySubmission
+from .models import SubmissionReview, FacultySubmission, SubmissionContentValue, UserActivityCounters
+from .middleware import remember_profile_complete
+from .review_queue import REVIEW_COUNT_FIELDS, invalidate_review_queue
+from .slow_queries import install_slow_query_logger
 
 @receiver(post_save, sender=SubmissionReview)
 def update_submission_status(sender, instance, created, **kwargs):
@@ -16,4 +22,72 @@ def update_submission_status(sender, instance, created, **kwargs):
         new_status = status_map.get(instance.action)
         if new_status:
             instance.submission.status = new_status
-            instance.submission.save(update_fields=['status'])
+            # updated_at keys the cached review_dashboard rows
+            instance.submission.save(update_fields=['status', 'updated_at'])
+
+
+@receiver(post_save, sender=FacultySubmission)
+@receiver(post_delete, sender=FacultySubmission)
+def invalidate_cached_review_queues(sender, instance, update_fields=None, **kwargs):
+    # covers new submissions, reviews and deletes; saves that leave the counted
+    # fields alone (e.g. a content edit) keep the cached counts
+    if update_fields and not REVIEW_COUNT_FIELDS & set(update_fields):
+        return
+    invalidate_review_queue(instance)
+    # the next save of this instance moves it from where it is now
+    instance._loaded_scope = (instance.department, instance.reviewed_by_id)
+
+
+@receiver(post_save, sender=FacultySubmission)
+def sync_promoted_content(sender, instance, raw=False, update_fields=None, **kwargs):
+    # status-only saves (reviews) cannot change the promoted keys
+    if raw or (update_fields and not {'content', 'submission_type'} & set(update_fields)):
+        return
+    SubmissionContentValue.sync_for(instance)
+
+
+@receiver(connection_created)
+def log_slow_queries(sender, connection, **kwargs):
+    # no-op unless settings.SLOW_QUERY_THRESHOLD_MS is set
+    install_slow_query_logger(connection)
+
+
+@receiver(connection_created)
+def tune_sqlite(sender, connection, **kwargs):
+    # settings.SQLITE_PRAGMAS: WAL, synchronous, busy_timeout, mmap and cache size
+    if connection.vendor != 'sqlite':
+        return
+    tracked = {str(path) for path in getattr(settings, 'SQLITE_TRACKED_FILES', [])}
+    with connection.cursor() as cursor:
+        for pragma, value in getattr(settings, 'SQLITE_PRAGMAS', {}).items():
+            # journal_mode persists in the file header; see settings.SQLITE_TRACKED_FILES
+            if pragma == 'journal_mode' and str(connection.settings_dict['NAME']) in tracked:
+                continue
+            cursor.execute(f"PRAGMA {pragma} = {value}")
+
+
+@receiver(user_logged_in)
+def remember_profile_complete_on_login(sender, request, user, **kwargs):
+    # saves ForceProfileCompletionMiddleware a user lookup (and a session write) on the next request
+    if request is not None and hasattr(request, 'session') and user.is_profile_complete:
+        remember_profile_complete(request, user)
+
+
+def _counter_receivers(field):
+    """Build the post_save/post_delete pair that keeps one UserActivityCounters column current."""
+
+    def on_save(sender, instance, created, raw=False, **kwargs):
+        if not raw:
+            # an edit adjusts by 0, which still bumps updated_at for the cached feed
+            UserActivityCounters.adjust(instance.user_id, field, 1 if created else 0)
+
+    def on_delete(sender, instance, **kwargs):
+        UserActivityCounters.adjust(instance.user_id, field, -1)
+
+    return on_save, on_delete
+
+
+for field, model in UserActivityCounters.COUNTED_MODELS.items():
+    on_save, on_delete = _counter_receivers(field)
+    post_save.connect(on_save, sender=model, weak=False, dispatch_uid=f'activity_counters_save_{field}')
+    post_delete.connect(on_delete, sender=model, weak=False, dispatch_uid=f'activity_counters_delete_{field}')
@@ -0,0 +1,207 @@
+import json
+import logging
+import re
+import traceback
+from contextvars import ContextVar
+from datetime import timedelta
+from pathlib import Path
+from time import perf_counter
+
+from django.conf import settings
+from django.db import DatabaseError
+from django.utils import timezone
+
+
+# Statements slower than this are logged with their plan; None turns the hook off.
+SLOW_QUERY_THRESHOLD_MS = getattr(settings, 'SLOW_QUERY_THRESHOLD_MS', None)
+# Run EXPLAIN on slow SELECTs (one extra query each).
+SLOW_QUERY_EXPLAIN = getattr(settings, 'SLOW_QUERY_EXPLAIN', True)
+# Optional JSON-lines file that `manage.py index_report --log` reads back.
+SLOW_QUERY_LOG_FILE = getattr(settings, 'SLOW_QUERY_LOG_FILE', None)
+
+logger = logging.getLogger('core.slow_queries')
+
+PROJECT_ROOT = str(Path(settings.BASE_DIR).resolve())
+_explaining = ContextVar('slow_query_explaining', default=False)
+
+
+def explain(connection, sql, params):
+    """EXPLAIN plan lines for a SELECT on `connection`, or [] when it cannot be explained."""
+    if not sql.lstrip().upper().startswith('SELECT'):
+        return []
+    token = _explaining.set(True)
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(f"{connection.ops.explain_query_prefix()} {sql}", params)
+            rows = cursor.fetchall()
+    except DatabaseError:
+        return []
+    finally:
+        _explaining.reset(token)
+    # SQLite returns (id, parent, notused, detail); the others one text column per line
+    return [str(row[-1]) for row in rows]
+
+
+def query_origin():
+    """
+    (origin, frame) for the current query: the outermost and innermost project
+    frames on the stack, as "path:line in function". The outermost is normally
+    the view (or management command); the innermost is the line that ran the query.
+    """
+    frames = [
+        frame for frame in traceback.extract_stack()[:-3]
+        if frame.filename.startswith(PROJECT_ROOT) and 'site-packages' not in frame.filename
+        and not frame.filename.endswith(('slow_queries.py', 'manage.py'))
+    ]
+    if not frames:
+        return '', ''
+    describe = lambda frame: f"{Path(frame.filename).relative_to(PROJECT_ROOT)}:{frame.lineno} in {frame.name}"
+    return describe(frames[0]), describe(frames[-1])
+
+
+class SlowQueryLogger:
+    """
+    Execute wrapper that logs statements slower than `threshold_ms` to the
+    'core.slow_queries' logger with their EXPLAIN plan and where they came from,
+    and appends them to SLOW_QUERY_LOG_FILE when that is set. Installed on every
+    new connection by the connection_created receiver in core/signals.py.
+    """
+
+    def __init__(self, connection, threshold_ms):
+        self.connection = connection
+        self.threshold = threshold_ms / 1000
+
+    def __call__(self, execute, sql, params, many, context):
+        if _explaining.get():
+            return execute(sql, params, many, context)
+        start = perf_counter()
+        result = execute(sql, params, many, context)
+        elapsed = perf_counter() - start
+        if elapsed >= self.threshold:
+            self.record(sql, params, many, elapsed)
+        return result
+
+    def record(self, sql, params, many, elapsed):
+        origin, frame = query_origin()
+        plan = [] if many or not SLOW_QUERY_EXPLAIN else explain(self.connection, sql, params)
+        entry = {
+            'at': timezone.now().isoformat(),
+            'database': self.connection.alias,
+            'duration_ms': round(elapsed * 1000, 3),
+            'sql': sql,
+            'params': None if many else [str(param) for param in params or ()],
+            'plan': plan,
+            'origin': origin,
+            'frame': frame,
+        }
+        logger.warning(
+            "Slow query (%.1f ms) from %s at %s: %s%s", entry['duration_ms'], origin or '?', frame or '?', sql,
+            ''.join(f"\n    {line}" for line in plan), extra={'slow_query': entry},
+        )
+        if SLOW_QUERY_LOG_FILE:
+            with open(SLOW_QUERY_LOG_FILE, 'a') as fileobj:
+                fileobj.write(json.dumps(entry) + '\n')
+
+
+def install_slow_query_logger(connection):
+    if SLOW_QUERY_THRESHOLD_MS is None:
+        return
+    if not any(isinstance(wrapper, SlowQueryLogger) for wrapper in connection.execute_wrappers):
+        connection.execute_wrappers.append(SlowQueryLogger(connection, SLOW_QUERY_THRESHOLD_MS))
+
+
+# --- missing-index analysis ---------------------------------------------------
+
+def plan_problems(plan, table):
+    """Full scans of `table` and sorts that no index satisfies, read from SQLite or PostgreSQL plan text."""
+    problems = []
+    for line in plan:
+        text = line.strip()
+        if re.search(rf'\bSCAN {re.escape(table)}\b(?! USING (COVERING )?INDEX)', text) or f'Seq Scan on {table}' in text:
+            problems.append('full scan')
+        elif 'USE TEMP B-TREE FOR ORDER BY' in text or re.match(r'(->\s*)?(Incremental )?Sort\b', text):
+            problems.append('sort')
+    return sorted(set(problems))
+
+
+def candidate_columns(sql, table):
+    """
+    A candidate index for a Django-generated query on `table`: the columns
+    compared with = / IN / IS NULL, then the ORDER BY columns, or failing those
+    one range-filtered column (<, >, BETWEEN, IS NOT NULL).
+    """
+    column = rf'"?{re.escape(table)}"?\."?(\w+)"?'
+    head, _, order = sql.partition(' ORDER BY ')
+    _, _, where = head.partition(' WHERE ')
+
+    def unique(found, seen):
+        return [name for i, name in enumerate(found) if name not in seen and name not in found[:i]]
+
+    # values_list() queries order by select-list position ("ORDER BY 1 ASC")
+    selected = head.partition(' FROM ')[0].split(', ')
+    order_columns = []
+    for term in order.split(','):
+        position = re.match(r'\s*(\d+)\b', term)
+        if position and int(position.group(1)) <= len(selected):
+            term = selected[int(position.group(1)) - 1]
+        order_columns += re.findall(column, term)[:1]
+
+    equality = unique(re.findall(column + r'\s*(?:=|IN\b|IS NULL\b)', where), [])
+    ranges = unique(re.findall(column + r'\s*(?:[<>]=?|BETWEEN\b|IS NOT NULL\b)', where), equality)
+    ordering = unique(order_columns, equality)
+    return equality + (ordering or ranges[:1])
+
+
+def existing_indexes(connection, table):
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(cursor, table)
+    return [info['columns'] for info in constraints.values() if info['index'] or info['primary_key'] or info['unique']]
+
+
+def index_candidates(connection, table, queries):
+    """
+    For each (label, sql, params), EXPLAIN it and return findings as dicts with
+    label, problems, plan, candidate columns and whether an existing index on
+    `table` already starts with those columns (meaning the planner chose not to use it).
+    """
+    indexes = existing_indexes(connection, table)
+    findings = []
+    for label, sql, params in queries:
+        plan = explain(connection, sql, params)
+        problems = plan_problems(plan, table)
+        if not problems:
+            continue
+        candidate = candidate_columns(sql, table)
+        covered = any(index[:len(candidate)] == candidate for index in indexes) if candidate else True
+        findings.append({'label': label, 'problems': problems, 'plan': plan, 'candidate': candidate, 'covered': covered, 'sql': sql})
+    return findings
+
+
+def submission_probes():
+    """
+    (label, sql, params) for the FacultySubmission queries the review and
+    submissions pages run, built through the same helpers the views use.
+    """
+    from .models import CustomUser, FacultySubmission
+    from .review_queue import review_queryset
+
+    sample = FacultySubmission.objects.order_by('pk').values('user_id', 'department').first() or {'user_id': 0, 'department': ''}
+    dean = CustomUser(role='dean')
+    head = CustomUser(role='cluster_head', department=sample['department'])
+    queues = [
+        ('review queue (dean)', dean, {}),
+        ('review queue (dean, by type)', dean, {'submission_type': 'journal_publication'}),
+        ('review queue (dean, since date)', dean, {'date_from': (timezone.now() - timedelta(days=30)).date().isoformat()}),
+        ('review queue (cluster head)', head, {}),
+        ('review queue (cluster head, approved)', head, {'status': 'approved'}),
+    ]
+    querysets = [
+        (label, review_queryset(user, params)[0].order_by('-submitted_at', '-pk')[:11])
+        for label, user, params in queues
+    ]
+    mine = FacultySubmission.objects.filter(user_id=sample['user_id'])
+    querysets += [
+        ('my submissions page', mine.order_by('-submitted_at', '-id')[:11]),
+        ('my submissions page (by status)', mine.filter(status='pending').order_by('-submitted_at', '-id')[:11]),
+    ]
+    return [(label, *queryset.query.sql_with_params()) for label, queryset in querysets]
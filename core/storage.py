@@ -0,0 +1,23 @@
+import logging
+
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+
+
+logger = logging.getLogger(__name__)
+
+
+class PortalStaticFilesStorage(CompressedManifestStaticFilesStorage):
+    """
+    Content-hashed, gzip/brotli-precompressed static files for WhiteNoise.
+
+    A {% static %} path that collectstatic never saw (a logo that was not
+    committed, say) is linked under its plain name instead of raising, so a
+    missing asset costs a 404 for that file rather than a 500 for the page.
+    """
+
+    def stored_name(self, name):
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            logger.warning("Static file %r is not in the manifest; linking it unhashed.", name)
+            return name
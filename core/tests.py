@@ -1,3 +1,1307 @@
-from django.test import TestCase
+import csv
+import os
+import re
+import tempfile
+from datetime import date
+from io import BytesIO, StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import SESSION_KEY
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.sessions.backends.db import SessionStore
+from django.core import mail
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.mail.backends.base import BaseEmailBackend
+from django.http import HttpResponse
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import IntegrityError, connection, connections
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.template import engines
+from django.urls import resolve, reverse
+from django.utils import timezone
+
+from .activity import ACTIVITY_SOURCES, user_activity_feed
+from .benchmark import benchmark_subjects, compare_reports, run_benchmark, run_write_benchmark
+from .bulk_import import BulkImportError, import_records, read_rows
+from .middleware import PROFILE_COMPLETE_SESSION_KEY, ForceProfileCompletionMiddleware, ReplicaRoutingMiddleware, RequestProfilingMiddleware
+from .models import PROGRESS_FIELDS, AnnualFacultyReport, Awards, Book, CurriculumDevelopment, CustomUser, FacultySubmission, JournalPublication, OutgoingEmail, Patents, PublicationsUpdate, SubmissionContentValue, SubmissionReview, UserActivityCounters, UserFormProgress, UserOTP
+from .otp import OTP_MAX_ATTEMPTS, OTP_RATE_LIMIT, OTP_RATE_WINDOW, OTP_TTL, CacheOTPBackend, DatabaseOTPBackend, OTPRateLimited
+from .outbox import OUTBOX_MAX_ATTEMPTS, OUTBOX_RETENTION_DAYS, queue_mail, retry_delay, send_queued
+from .pagination import KeysetPaginator
+from .profiling import Histogram, ProfileRecorder, recorder, summarize
+from .review_queue import review_queryset
+from .search import SEARCH_RESULT_LIMIT, get_search_backend
+from .routers import REPLICA_PIN_COOKIE, PrimaryReplicaRouter, request_routing
+from .seeding import seed_institution
+from .slow_queries import SlowQueryLogger, candidate_columns, plan_problems
+from .storage import PortalStaticFilesStorage
+from .views import submission_status_stats
+
+
+def make_user(username, **extra):
+    extra.setdefault('is_profile_complete', True)
+    return CustomUser.objects.create_user(
+        username=username,
+        email=f'{username}@iilm.edu',
+        password='testpass123',
+        **extra
+    )
+
+
+def seed_activity(user, per_category=1):
+    """Create `per_category` records in every category model for `user`."""
+    for kind, model, title_field, date_field in ACTIVITY_SOURCES:
+        for i in range(per_category):
+            model.objects.create(user=user, **{title_field: f'{kind} {i}'})
+
+
+class SubmissionListViewTests(TestCase):
+
+    def setUp(self):
+        self.user = make_user('faculty1')
+        self.client.force_login(self.user)
+
+    def _count_queries(self, cold=True, **params):
+        if cold:
+            cache.clear()
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('submission_list'), params)
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def test_feed_covers_every_category(self):
+        seed_activity(self.user)
+        seed_activity(make_user('other'))
+
+        rows = list(user_activity_feed(self.user))
+        self.assertEqual(len(rows), len(ACTIVITY_SOURCES))
+        self.assertEqual(
+            {row['kind'] for row in rows},
+            {source[0] for source in ACTIVITY_SOURCES},
+        )
+
+    def test_year_only_categories_get_dates(self):
+        JournalPublication.objects.create(user=self.user, title_of_paper='Paper', year_of_publication=2023, month='march')
+        JournalPublication.objects.create(user=self.user, title_of_paper='Undated paper', year_of_publication=2021)
+        Book.objects.create(user=self.user, title_of_book='Book', publication_year=2022)
+        Awards.objects.create(user=self.user, title_of_award='Award', date_of_award=date(2024, 6, 1))
+        rows = [(row['title'], row['date']) for row in user_activity_feed(self.user)]
+        self.assertEqual(rows, [
+            ('Award', date(2024, 6, 1)),
+            ('Paper', date(2023, 3, 1)),
+            ('Book', date(2022, 1, 1)),
+            ('Undated paper', date(2021, 1, 1)),
+        ])
+
+    def test_feed_sorting(self):
+        seed_activity(self.user)
+        titles = [row['title'] for row in user_activity_feed(self.user, 'title')]
+        self.assertEqual(titles, sorted(titles))
+        titles = [row['title'] for row in user_activity_feed(self.user, '-title')]
+        self.assertEqual(titles, sorted(titles, reverse=True))
+
+    def test_query_count_is_constant(self):
+        # session + user + counters + COUNT + page SELECT, plus the DatabaseCache
+        # reads and writes of the two fragments, independent of categories and rows
+        UserActivityCounters.for_user(self.user)
+        seed_activity(self.user)
+        few = self._count_queries()
+        seed_activity(self.user, per_category=5)
+        many = self._count_queries()
+        paged = self._count_queries(page=2, sort='title')
+
+        self.assertEqual(few, many)
+        self.assertEqual(many, paged)
+        self.assertEqual(many, 17)
+        # a repeat render is session + user + counters + one read per fragment, without the feed
+        self.assertEqual(self._count_queries(cold=False, page=2, sort='title'), 5)
+
+    def test_cached_feed_follows_edits(self):
+        UserActivityCounters.for_user(self.user)
+        seed_activity(self.user)
+        self.client.get(reverse('submission_list'))
+        award = Awards.objects.get(user=self.user)
+        award.title_of_award = 'Renamed award'
+        award.save()
+        self.assertContains(self.client.get(reverse('submission_list')), 'Renamed award')
+
+
+class ActivityCountersTests(TestCase):
+
+    def setUp(self):
+        self.user = make_user('faculty1')
+
+    def test_signals_track_creates_and_deletes(self):
+        counters = UserActivityCounters.for_user(self.user)
+        self.assertEqual(sum(counters.as_dict().values()), 0)
+
+        seed_activity(self.user, per_category=2)
+        Awards.objects.filter(user=self.user).first().delete()
+        CurriculumDevelopment.objects.create(user=self.user)
+
+        counters.refresh_from_db()
+        self.assertEqual(counters.journal_publications, 2)
+        self.assertEqual(counters.awards, 1)
+        self.assertEqual(counters.curriculum_developments, 1)
+        self.assertEqual(counters.as_dict(), UserActivityCounters.counts_for(self.user.pk))
+
+    def test_rebuild_command(self):
+        UserActivityCounters.for_user(self.user)
+        # bulk_create bypasses signals, which is what the rebuild command is for
+        Patents.objects.bulk_create([Patents(user=self.user) for _ in range(3)])
+        self.assertEqual(UserActivityCounters.for_user(self.user).patents, 0)
+
+        call_command('rebuild_activity_counters', stdout=StringIO())
+        self.assertEqual(UserActivityCounters.for_user(self.user).patents, 3)
+
+    def test_form_view_counts_only_own_records(self):
+        other = make_user('other')
+        AnnualFacultyReport.objects.create(user=other)
+        AnnualFacultyReport.objects.create(user=self.user)
+        self.client.force_login(self.user)
+
+        UserActivityCounters.for_user(self.user)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('form_view'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['form_submissions']['annual_reports'], 1)
+        # session + user + recent submissions + counters row
+        self.assertEqual(len(ctx.captured_queries), 4)
+
+
+def make_submission(user, **extra):
+    extra.setdefault('submission_type', 'journal_publication')
+    extra.setdefault('title', 'Paper')
+    extra.setdefault('department', user.department)
+    return FacultySubmission.objects.create(user=user, **extra)
+
+
+class QueryCountGuardMixin:
+    """
+    Fails when a view's query count grows with the number of rows it renders,
+    cold or warm, under the configured cache backend (whose reads are queries
+    too with DatabaseCache). `grow` adds more rows between the two measurements.
+    """
+
+    def count_queries(self, url, params=None):
+        """Queries for a request on an empty cache and for the warm repeat after it."""
+        cache.clear()
+        counts = []
+        for _ in range(2):
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get(url, params or {})
+            self.assertEqual(response.status_code, 200)
+            counts.append(len(ctx.captured_queries))
+        return counts
+
+    def assertQueriesDoNotScale(self, url, grow, params=None):
+        before = self.count_queries(url, params)
+        grow()
+        after = self.count_queries(url, params)
+        self.assertEqual(
+            before, after,
+            f"{url} went from {before} to {after} queries after adding rows (N+1?)"
+        )
+        return after
+
+
+class SubmissionStatsTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.faculty = make_user('faculty1', department='CSE')
+        self.cluster_head = make_user('head1', department='CSE', role='cluster_head')
+        for status in ['pending', 'pending', 'under_review', 'needs_revision', 'approved']:
+            make_submission(self.faculty, status=status)
+
+    def test_single_aggregate_query(self):
+        with self.assertNumQueries(1):
+            counts = submission_status_stats(FacultySubmission.objects.filter(user=self.faculty))
+        self.assertEqual(counts['total'], 5)
+        self.assertEqual(counts['pending'], 2)
+        self.assertEqual(counts['approved'], 1)
+        self.assertEqual(counts['rejected'], 0)
+
+    def test_my_submissions(self):
+        self.client.force_login(self.faculty)
+        # session + user + stats aggregate + page SELECT
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse('my_submissions'))
+        self.assertEqual(response.context['stats']['total'], 5)
+        self.assertEqual(response.context['submissions'].paginator.count, 5)
+
+        response = self.client.get(reverse('my_submission_stats'), {'status': 'pending'})
+        self.assertEqual(response.json()['stats']['total'], 2)
+
+    def test_review_stats_endpoint_matches_dashboard(self):
+        self.client.force_login(self.cluster_head)
+        dashboard = self.client.get(reverse('review_dashboard'))
+        stats = self.client.get(reverse('review_stats')).json()['stats']
+        self.assertEqual(stats, dashboard.context['stats'])
+        self.assertEqual(stats['total_submissions'], 4)
+        self.assertEqual(dashboard.context['submissions'].paginator.count, 4)
+
+    def test_review_stats_requires_reviewer(self):
+        self.client.force_login(self.faculty)
+        response = self.client.get(reverse('review_stats'))
+        self.assertEqual(response.status_code, 302)
+
+
+class KeysetPaginatorTests(TestCase):
+
+    def setUp(self):
+        self.faculty = make_user('faculty1')
+        # identical timestamps exercise the id tie-breaker
+        stamp = timezone.now()
+        for i in range(25):
+            make_submission(self.faculty, title=f'Paper {i}')
+        FacultySubmission.objects.filter(pk__lte=FacultySubmission.objects.order_by('pk')[10].pk).update(submitted_at=stamp)
+        self.expected = list(FacultySubmission.objects.order_by('-submitted_at', '-id').values_list('pk', flat=True))
+
+    def test_walks_forward_and_back(self):
+        paginator = KeysetPaginator(FacultySubmission.objects.all(), 10)
+        seen, page = [], paginator.get_page()
+        pages = [page]
+        while True:
+            seen.extend(obj.pk for obj in page)
+            if not page.has_next():
+                break
+            page = paginator.get_page(after=page.next_token)
+            pages.append(page)
+        self.assertEqual(seen, self.expected)
+        self.assertEqual(len(pages), 3)
+
+        back = paginator.get_page(before=pages[2].previous_token)
+        self.assertEqual([obj.pk for obj in back], [obj.pk for obj in pages[1]])
+        self.assertTrue(back.has_previous())
+
+    def test_each_page_is_one_query(self):
+        paginator = KeysetPaginator(FacultySubmission.objects.all(), 10)
+        first = paginator.get_page()
+        with self.assertNumQueries(1):
+            paginator.get_page(after=first.next_token)
+
+    def test_bad_token_falls_back_to_first_page(self):
+        page = KeysetPaginator(FacultySubmission.objects.all(), 10).get_page(after='not-a-token')
+        self.assertEqual([obj.pk for obj in page], self.expected[:10])
+        self.assertFalse(page.has_previous())
+
+    def test_my_submissions_cursor_links(self):
+        self.client.force_login(self.faculty)
+        first = self.client.get(reverse('my_submissions'), {'status': 'pending'})
+        token = first.context['submissions'].next_token
+        self.assertContains(first, f'after={token}')
+        self.assertContains(first, 'status=pending')
+
+        second = self.client.get(reverse('my_submissions'), {'status': 'pending', 'after': token})
+        self.assertEqual([obj.pk for obj in second.context['submissions']], self.expected[10:20])
+
+
+class ViewQueryCountTests(QueryCountGuardMixin, TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.head = make_user('head1', department='CSE', role='cluster_head')
+        self.dean = make_user('dean1', department='CSE', role='dean')
+        self.faculty = [make_user(f'faculty{i}', department='CSE') for i in range(3)]
+        for user in self.faculty:
+            make_submission(user)
+
+    def grow_submissions(self, reviewed=False):
+        def grow():
+            for i in range(3):
+                extra = make_user(f'extra{FacultySubmission.objects.count()}', department='CSE')
+                make_submission(extra, reviewed_by=self.head if reviewed else None)
+        return grow
+
+    def test_cluster_head_dashboard(self):
+        self.client.force_login(self.head)
+        self.assertQueriesDoNotScale(reverse('review_dashboard'), self.grow_submissions())
+
+    def test_dean_dashboard(self):
+        self.client.force_login(self.dean)
+        self.grow_submissions(reviewed=True)()
+        self.assertQueriesDoNotScale(reverse('review_dashboard'), self.grow_submissions(reviewed=True))
+
+    def test_submission_detail_review_history(self):
+        submission = make_submission(self.faculty[0])
+        reviewers = [make_user(f'head{i}', department='CSE', role='cluster_head') for i in range(2, 6)]
+
+        def add_history():
+            for reviewer in reviewers:
+                SubmissionReview.objects.create(submission=submission, reviewer=reviewer, action='reviewed')
+
+        self.client.force_login(self.head)
+        self.assertQueriesDoNotScale(reverse('submission_detail_review', args=[submission.pk]), add_history)
+
+    def test_my_submissions(self):
+        user = self.faculty[0]
+        self.client.force_login(user)
+        self.assertQueriesDoNotScale(reverse('my_submissions'), lambda: [make_submission(user) for _ in range(3)])
+
+    def test_submission_list_and_form_view(self):
+        user = self.faculty[0]
+        self.client.force_login(user)
+        seed_activity(user)
+        UserActivityCounters.for_user(user)
+        self.assertQueriesDoNotScale(reverse('submission_list'), lambda: seed_activity(user))
+        self.assertQueriesDoNotScale(reverse('form_view'), lambda: seed_activity(user))
+
+
+class ReviewQueueCacheTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.head = make_user('head1', department='CSE', role='cluster_head')
+        self.faculty = make_user('faculty1', department='CSE')
+        for i in range(15):
+            make_submission(self.faculty, title=f'Paper {i}')
+        self.client.force_login(self.head)
+
+    def test_second_hit_skips_queue_scan(self):
+        url = reverse('review_dashboard')
+        self.client.get(url)
+        # session + user + one keyset page, plus one cache read each for the queue
+        # versions, the counts, the sidebar, the filters and the whole page of rows
+        with self.assertNumQueries(8):
+            response = self.client.get(url)
+        self.assertEqual(response.context['stats']['total_submissions'], 15)
+
+    def test_invalidation_follows_the_submission_scope(self):
+        url = reverse('review_stats')
+        self.client.get(url)
+        with self.captureOnCommitCallbacks(execute=True):
+            make_submission(make_user('ece1', department='ECE'))
+            FacultySubmission.objects.first().save(update_fields=['title'])
+        # another department's submission and a title edit leave the cached counts alone:
+        # session + user + the version and counts cache reads
+        with self.assertNumQueries(4):
+            self.assertEqual(self.client.get(url).json()['stats']['total_submissions'], 15)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            make_submission(self.faculty)
+        self.assertEqual(self.client.get(url).json()['stats']['total_submissions'], 16)
+        with self.captureOnCommitCallbacks(execute=True):
+            make_submission(self.faculty, department='')
+        self.assertEqual(self.client.get(url).json()['stats']['total_submissions'], 17)
+
+    def test_versions_are_bumped_on_commit(self):
+        url = reverse('review_stats')
+        self.client.get(url)
+        with self.captureOnCommitCallbacks() as callbacks:
+            make_submission(self.faculty)
+            # until the write commits, readers keep the old version and its counts
+            self.assertEqual(self.client.get(url).json()['stats']['total_submissions'], 15)
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.client.get(url).json()['stats']['total_submissions'], 16)
+
+    def test_moving_a_submission_expires_the_department_it_left(self):
+        url = reverse('review_stats')
+        self.client.get(url)
+        submission = FacultySubmission.objects.first()
+        with self.captureOnCommitCallbacks(execute=True):
+            submission.department = 'ECE'
+            submission.save(update_fields=['department'])
+        self.assertEqual(self.client.get(url).json()['stats']['total_submissions'], 14)
+
+    def test_filters_are_cached_separately(self):
+        make_submission(self.faculty, submission_type='patents')
+        all_stats = self.client.get(reverse('review_stats')).json()['stats']
+        patent_stats = self.client.get(reverse('review_stats'), {'submission_type': 'patents'}).json()['stats']
+        self.assertEqual(all_stats['total_submissions'], 16)
+        self.assertEqual(patent_stats['total_submissions'], 1)
+
+    def test_review_invalidates_queue(self):
+        url = reverse('review_dashboard')
+        self.assertEqual(self.client.get(url).context['stats']['total_submissions'], 15)
+
+        submission = FacultySubmission.objects.first()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('review_submission', args=[submission.pk]), {'action': 'approved'})
+        self.assertEqual(self.client.get(url).context['stats']['total_submissions'], 14)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            SubmissionReview.objects.create(submission=FacultySubmission.objects.last(), reviewer=self.head, action='rejected')
+        self.assertEqual(self.client.get(url).context['stats']['total_submissions'], 13)
+
+    def test_cached_rows_follow_status_changes(self):
+        url = reverse('review_dashboard')
+        submission = FacultySubmission.objects.order_by('-submitted_at', '-id').first()
+        response = self.client.get(url)
+        self.assertContains(response, 'id="review-action-form"')
+        self.assertContains(response, f'formaction="{reverse("review_submission", args=[submission.pk])}"', count=3)
+        self.assertNotContains(response, 'status-badge status-under_review')
+
+        # the review signal saves status alone; updated_at must move with it to expire the row
+        SubmissionReview.objects.create(submission=submission, reviewer=self.head, action='reviewed')
+        self.assertContains(self.client.get(url), 'status-badge status-under_review')
+
+    def test_paginates_queue(self):
+        url = reverse('review_dashboard')
+        expected = list(
+            FacultySubmission.objects.order_by('-submitted_at', '-id').values_list('pk', flat=True)
+        )
+        first = self.client.get(url).context['submissions']
+        second = self.client.get(url, {'after': first.next_token}).context['submissions']
+        self.assertEqual([s.pk for s in first] + [s.pk for s in second], expected)
+        self.assertFalse(second.has_next())
+
+        back = self.client.get(url, {'before': second.previous_token}).context['submissions']
+        self.assertEqual([s.pk for s in back], [s.pk for s in first])
+        self.assertFalse(back.has_previous())
+
+
+class SubmissionSearchTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.head = make_user('head1', department='CSE', role='cluster_head')
+        self.faculty = make_user('faculty1', department='CSE')
+        self.graph = make_submission(self.faculty, title='Graph neural networks for traffic')
+        self.quantum = make_submission(
+            self.faculty, title='Annual report',
+            description='Includes a section on graph theory',
+            content={'journal_name': 'Quantum Computing Letters', 'authors': ['Ada']},
+        )
+        make_submission(self.faculty, title='Soil chemistry survey')
+        make_submission(make_user('other', department='ECE'), title='Graph colouring', department='ECE')
+
+    def search(self, query):
+        backend = get_search_backend()
+        return list(backend.search(FacultySubmission.objects.all(), query))
+
+    def test_ranks_title_above_description(self):
+        results = self.search('graph')
+        self.assertEqual(len(results), 3)
+        # both title matches outrank the description-only match
+        self.assertEqual(results[-1].pk, self.quantum.pk)
+        self.assertGreater(results[0].search_rank, results[-1].search_rank)
+
+    def test_matches_json_content_and_prefixes(self):
+        self.assertEqual([r.pk for r in self.search('quantum comp')], [self.quantum.pk])
+
+    def test_index_follows_updates_and_deletes(self):
+        self.graph.title = 'Protein folding'
+        self.graph.save()
+        self.assertEqual([r.pk for r in self.search('protein')], [self.graph.pk])
+        self.graph.delete()
+        self.assertEqual(self.search('protein'), [])
+
+    def test_ranking_matches_once_and_seeks_the_scope(self):
+        seed_institution(1, 2, 20, 10)
+        for user in (self.head, make_user('dean1', role='dean')):
+            scoped, filter_form = review_queryset(user, {})
+            sql, params = get_search_backend().ranked_sql(scoped, 'graph water', SEARCH_RESULT_LIMIT)
+            with connection.cursor() as cursor:
+                cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+                plan = [row[-1] for row in cursor.fetchall()]
+            fts_steps = [step for step in plan if 'core_submission_fts' in step]
+            # one MATCH pass ('M'); '=M' would re-run the MATCH for every submission row
+            self.assertEqual(len(fts_steps), 1, plan)
+            self.assertNotIn('=M', fts_steps[0])
+            self.assertIn('SEARCH core_facultysubmission USING INTEGER PRIMARY KEY (rowid=?)', plan)
+
+    def test_search_syntax_is_ignored(self):
+        self.assertEqual(self.search('"graph" OR -*'), self.search('graph OR'))
+        self.assertEqual(self.search('***'), [])
+
+    def test_dashboard_search_respects_scope(self):
+        self.client.force_login(self.head)
+        response = self.client.get(reverse('review_dashboard'), {'q': 'graph'})
+        pks = [s.pk for s in response.context['submissions']]
+        self.assertEqual(pks, [self.graph.pk, self.quantum.pk])
+        self.assertEqual(response.context['stats']['total_submissions'], 2)
+        self.assertNotContains(response, 'best matches of')
+
+    def test_dashboard_search_says_when_results_are_cut(self):
+        for i in range(SEARCH_RESULT_LIMIT):
+            make_submission(self.faculty, title=f'Graph paper {i}')
+        self.client.force_login(self.head)
+        response = self.client.get(reverse('review_dashboard'), {'q': 'graph'})
+        self.assertEqual(len(response.context['submissions']), SEARCH_RESULT_LIMIT)
+        self.assertContains(response, f'Showing the {SEARCH_RESULT_LIMIT} best matches of {SEARCH_RESULT_LIMIT + 2}')
+
+
+class PromotedContentTests(TestCase):
+
+    def setUp(self):
+        self.faculty = make_user('faculty1', department='CSE')
+        self.high = make_submission(self.faculty, content={'impact_factor': '7.25', 'year_of_publication': 2025})
+        self.low = make_submission(self.faculty, content={'impact_factor': 2, 'year_of_publication': 2025})
+        self.old = make_submission(self.faculty, content={'impact_factor': 9.1, 'year_of_publication': 2019})
+
+    def filter(self, **lookups):
+        return list(SubmissionContentValue.filter_submissions(
+            FacultySubmission.objects.all(), 'journal_publication', **lookups
+        ))
+
+    def test_extracts_registered_keys_on_save(self):
+        make_submission(self.faculty, submission_type='awards', content={'date_of_award': '2025-03-01', 'note': 'x'})
+        values = SubmissionContentValue.objects.filter(submission_type='awards')
+        self.assertEqual([(v.key, v.date.isoformat()) for v in values], [('date_of_award', '2025-03-01')])
+        self.assertEqual(SubmissionContentValue.objects.filter(submission=self.high).count(), 2)
+
+    def test_filters_on_several_keys(self):
+        self.assertEqual(self.filter(impact_factor__gt=5, year_of_publication=2025), [self.high])
+        with self.assertRaises(ValueError):
+            self.filter(journal_name='Nature')
+
+    def test_content_changes_are_resynced(self):
+        self.low.content = {'impact_factor': 6, 'year_of_publication': 2025}
+        self.low.save()
+        self.assertCountEqual(self.filter(impact_factor__gt=5, year_of_publication=2025), [self.high, self.low])
+
+    def test_status_only_save_skips_sync(self):
+        with CaptureQueriesContext(connection) as ctx:
+            self.high.status = 'approved'
+            self.high.save(update_fields=['status'])
+        self.assertFalse(any('core_submissioncontentvalue' in q['sql'] for q in ctx.captured_queries))
+
+    def test_rebuild_command(self):
+        SubmissionContentValue.objects.all().delete()
+        call_command('rebuild_promoted_content', stdout=StringIO())
+        self.assertEqual(self.filter(impact_factor__gte=9), [self.old])
+
+
+class BulkImportTests(TestCase):
+
+    CSV = (
+        "Title Of Patent,status,jurisdiction,type,date_of_published,num_of_authors_from_iilm\n"
+        "Solar cell coating,Granted,national,utility,2024-05-01,2\n"
+        ",,,,,\n"
+        "Battery anode,filed,national,utility,not-a-date,1\n"
+        "Soil sensor,filed,international,Design,,1\n"
+    )
+
+    def setUp(self):
+        self.faculty = make_user('faculty1', department='CSE')
+
+    def rows(self, text=CSV):
+        return read_rows(BytesIO(text.encode()), 'patents.csv')
+
+    def test_imports_valid_rows_and_reports_the_rest(self):
+        UserActivityCounters.for_user(self.faculty)
+        result = import_records('patents', self.faculty, self.rows(), batch_size=1)
+        self.assertEqual((result.created, result.failed), (2, 1))
+        line, errors = result.errors[0]
+        self.assertEqual(line, 4)
+        self.assertIn('date_of_published', errors)
+        granted = Patents.objects.get(title_of_patent='Solar cell coating')
+        self.assertEqual((granted.user, granted.status), (self.faculty, 'granted'))
+        self.assertEqual(UserActivityCounters.for_user(self.faculty).patents, 2)
+        self.assertTrue(UserFormProgress.objects.get(user=self.faculty).patents_progress)
+
+    def test_imported_records_are_queued_for_review(self):
+        import_records('patents', self.faculty, self.rows())
+        submissions = FacultySubmission.objects.filter(user=self.faculty, submission_type='patents')
+        self.assertEqual(
+            sorted(submissions.values_list('title', 'status', 'department')),
+            [('Soil sensor', 'pending', 'CSE'), ('Solar cell coating', 'pending', 'CSE')],
+        )
+        self.assertEqual(submissions.get(title='Solar cell coating').content['status'], 'granted')
+
+    def test_decode_error_part_way_keeps_committed_chunks(self):
+        # well past the reader's first chunk, so earlier chunks are committed before the bad byte
+        data = self.CSV.encode() + b'Soil sensor,filed,national,utility,,1\n' * 1000 + b'Caf\xe9,filed,national,utility,,1\n'
+        result = import_records('patents', self.faculty, read_rows(BytesIO(data), 'patents.csv'), batch_size=100)
+        # only whole chunks read before the decode error are kept
+        self.assertGreater(result.chunks, 1)
+        self.assertEqual(result.created, result.chunks * 100)
+        self.assertEqual(Patents.objects.count(), result.created)
+        self.assertEqual(FacultySubmission.objects.count(), result.created)
+        self.assertIn('is not valid UTF-8', result.stopped)
+        self.assertIn(f'through line {result.imported_through} were imported', result.stopped)
+
+    def test_failed_chunk_is_reported(self):
+        failure = IntegrityError('NOT NULL constraint failed')
+        with mock.patch.object(UserActivityCounters, 'adjust', side_effect=[None, failure]):
+            result = import_records('patents', self.faculty, self.rows(), batch_size=1)
+        # the first chunk stays; the failed one is rolled back whole
+        self.assertEqual(list(Patents.objects.values_list('title_of_patent', flat=True)), ['Solar cell coating'])
+        self.assertEqual(FacultySubmission.objects.count(), 1)
+        self.assertIn('Chunk 2 (lines 5-5) could not be saved', result.stopped)
+
+    def test_reads_back_submission_ids_when_bulk_insert_returns_none(self):
+        # MySQL cannot return ids from a bulk insert; content values still need them
+        with mock.patch.object(type(connection.features), 'can_return_rows_from_bulk_insert', False):
+            import_records('patents', self.faculty, self.rows())
+        submission = FacultySubmission.objects.get(title='Solar cell coating')
+        self.assertEqual(
+            list(SubmissionContentValue.objects.values_list('submission', 'key')),
+            [(submission.pk, 'date_of_published')],
+        )
+
+    def test_unreadable_uploads_show_a_form_error(self):
+        self.client.force_login(self.faculty)
+        for name, data in [('patents.csv', b'title_of_patent\n\xff\xfe\n'), ('patents.xlsx', b'not a workbook')]:
+            upload = SimpleUploadedFile(name, data)
+            response = self.client.post(reverse('bulk_import'), {'record_type': 'patents', 'file': upload})
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(response.context['form'].errors['file'])
+        self.assertFalse(Patents.objects.exists())
+
+    def test_rejects_unknown_file_types(self):
+        with self.assertRaises(BulkImportError):
+            list(read_rows(BytesIO(b''), 'patents.txt'))
+
+    def test_upload_view(self):
+        self.client.force_login(self.faculty)
+        upload = SimpleUploadedFile('patents.csv', self.CSV.encode(), content_type='text/csv')
+        response = self.client.post(reverse('bulk_import'), {'record_type': 'patents', 'file': upload})
+        self.assertEqual(response.context['result'].created, 2)
+        self.assertContains(response, 'date_of_published')
+        self.assertEqual(Patents.objects.filter(user=self.faculty).count(), 2)
+
+    def test_management_command(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as f:
+            f.write(self.CSV)
+        self.addCleanup(os.remove, f.name)
+        out, err = StringIO(), StringIO()
+        call_command('import_records', 'patents', f.name, user='faculty1', stdout=out, stderr=err)
+        self.assertIn('Imported 2 record(s); 1 row(s) rejected', out.getvalue())
+        self.assertIn('Row 4', err.getvalue())
+
+    def test_reads_xlsx(self):
+        import openpyxl
+        workbook = openpyxl.Workbook()
+        sheet = workbook.active
+        sheet.append(['title_of_patent', 'status', 'jurisdiction', 'type', 'date_of_published', 'num_of_authors_from_iilm'])
+        sheet.append(['Solar cell coating', 'Granted', 'National', 'utility', timezone.datetime(2024, 5, 1), 2])
+        buffer = BytesIO()
+        workbook.save(buffer)
+        buffer.seek(0)
+        result = import_records('patents', self.faculty, read_rows(buffer, 'patents.xlsx'))
+        self.assertEqual((result.created, result.failed), (1, 0))
+        self.assertEqual(str(Patents.objects.get().date_of_published), '2024-05-01')
+
+
+class ExportTests(TestCase):
+
+    def setUp(self):
+        self.dean = make_user('dean1', role='dean')
+        self.head = make_user('head1', department='CSE', role='cluster_head')
+        self.faculty = make_user('faculty1', department='CSE')
+        make_submission(self.faculty, title='Graph paper', content={'impact_factor': 5.5, 'authors': ['Ada', 'Alan']})
+        make_submission(self.faculty, title='Soil survey', content={'journal_name': 'Soil Letters'})
+        make_submission(make_user('other', department='ECE'), title='ECE paper', department='ECE')
+        Patents.objects.create(user=self.faculty, title_of_patent='Solar cell coating')
+        Patents.objects.create(user=CustomUser.objects.get(username='other'), title_of_patent='Antenna')
+
+    def export(self, user, **params):
+        self.client.force_login(user)
+        response = self.client.get(reverse('review_export'), params)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def csv_rows(self, response):
+        return list(csv.DictReader(StringIO(b''.join(response.streaming_content).decode())))
+
+    def test_csv_flattens_content_within_scope(self):
+        rows = self.csv_rows(self.export(self.head))
+        self.assertEqual(sorted(r['title'] for r in rows), ['Graph paper', 'Soil survey'])
+        graph = next(r for r in rows if r['title'] == 'Graph paper')
+        self.assertEqual(graph['content.impact_factor'], '5.5')
+        self.assertEqual(graph['content.authors'], '["Ada", "Alan"]')
+        self.assertEqual(graph['content.journal_name'], '')
+
+    def test_category_export_scoping(self):
+        head_rows = self.csv_rows(self.export(self.head, kind='patents'))
+        dean_rows = self.csv_rows(self.export(self.dean, kind='patents'))
+        self.assertEqual([r['title_of_patent'] for r in head_rows], ['Solar cell coating'])
+        self.assertEqual(len(dean_rows), 2)
+
+    def test_xlsx(self):
+        import openpyxl
+        response = self.export(self.head, format='xlsx')
+        workbook = openpyxl.load_workbook(BytesIO(b''.join(response.streaming_content)))
+        rows = list(workbook.active.iter_rows(values_only=True))
+        self.assertEqual(rows[0][:3], ('id', 'submission_type', 'title'))
+        self.assertEqual(len(rows), 3)
+
+    def test_formula_cells_are_neutralised(self):
+        make_submission(self.faculty, title='=HYPERLINK("http://evil.example","x")', description='@SUM(A1)', content={'note': '+1'})
+        rows = self.csv_rows(self.export(self.head))
+        formula = next(r for r in rows if r['title'].startswith("'="))
+        self.assertEqual(formula['title'], '\'=HYPERLINK("http://evil.example","x")')
+        self.assertEqual((formula['description'], formula['content.note']), ("'@SUM(A1)", "'+1"))
+
+        import openpyxl
+        response = self.export(self.head, format='xlsx')
+        workbook = openpyxl.load_workbook(BytesIO(b''.join(response.streaming_content)))
+        titles = [row[2] for row in workbook.active.iter_rows(min_row=2, values_only=True)]
+        self.assertIn('\'=HYPERLINK("http://evil.example","x")', titles)
+
+    def test_cluster_head_without_department_gets_no_category_export(self):
+        self.client.force_login(make_user('head2', role='cluster_head'))
+        self.assertEqual(self.client.get(reverse('review_export'), {'kind': 'patents'}).status_code, 403)
+
+    def test_faculty_cannot_export(self):
+        self.client.force_login(self.faculty)
+        self.assertNotEqual(self.client.get(reverse('review_export')).status_code, 200)
+
+
+class FlakyEmailBackend(BaseEmailBackend):
+    """Counts connections and fails every send while `failing` is set."""
+    opened = 0
+    failing = False
+
+    def open(self):
+        FlakyEmailBackend.opened += 1
+        return True
+
+    def send_messages(self, messages):
+        if FlakyEmailBackend.failing:
+            raise ConnectionRefusedError("smtp down")
+        mail.outbox.extend(messages)
+        return len(messages)
+
+
+@override_settings(EMAIL_BACKEND='core.tests.FlakyEmailBackend')
+class OutboxTests(TestCase):
+
+    def setUp(self):
+        FlakyEmailBackend.opened = 0
+        FlakyEmailBackend.failing = False
+
+    def test_signup_queues_instead_of_sending(self):
+        response = self.client.post(reverse('signup'), {
+            'username': 'newbie', 'email': 'newbie@iilm.edu',
+            'password1': 'a-long-Passw0rd', 'password2': 'a-long-Passw0rd',
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(mail.outbox, [])
+        queued = OutgoingEmail.objects.get()
+        self.assertEqual((queued.recipients, queued.status), (['newbie@iilm.edu'], 'queued'))
+
+    def test_worker_sends_batch_over_one_connection(self):
+        for n in range(3):
+            queue_mail(f'Hello {n}', 'body', 'portal@example.com', [f'u{n}@example.com'])
+        call_command('send_queued_mail', once=True, stdout=StringIO())
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(FlakyEmailBackend.opened, 1)
+        self.assertEqual(OutgoingEmail.objects.filter(status='sent').count(), 3)
+        # delivered bodies (which may carry OTP codes) are not kept
+        self.assertFalse(OutgoingEmail.objects.exclude(body='').exists())
+
+    def test_purge_keeps_recent_and_queued_mail(self):
+        old = timezone.now() - timezone.timedelta(days=OUTBOX_RETENTION_DAYS + 1)
+        stale_sent = queue_mail('Sent', 'body', '', ['u@example.com'])
+        stale_failed = queue_mail('Failed', 'body', '', ['u@example.com'])
+        stale_queued = queue_mail('Queued', 'body', '', ['u@example.com'])
+        recent_sent = queue_mail('Recent', 'body', '', ['u@example.com'])
+        OutgoingEmail.objects.filter(pk=stale_sent.pk).update(status='sent', sent_at=old)
+        OutgoingEmail.objects.filter(pk__in=[stale_failed.pk, stale_queued.pk]).update(created_at=old)
+        OutgoingEmail.objects.filter(pk=stale_failed.pk).update(status='failed')
+        OutgoingEmail.objects.filter(pk=recent_sent.pk).update(status='sent', sent_at=timezone.now())
+
+        out = StringIO()
+        call_command('purge_outbox', stdout=out)
+        self.assertIn('Purged 2 outbox message(s)', out.getvalue())
+        self.assertEqual(set(OutgoingEmail.objects.values_list('subject', flat=True)), {'Queued', 'Recent'})
+
+    def test_failures_back_off_then_give_up(self):
+        email = queue_mail('Hello', 'body', '', ['u@example.com'])
+        FlakyEmailBackend.failing = True
+        for attempt in range(1, OUTBOX_MAX_ATTEMPTS + 1):
+            before = timezone.now()
+            self.assertEqual(send_queued(), (0, 1))
+            email.refresh_from_db()
+            self.assertEqual(email.attempts, attempt)
+            self.assertIn('smtp down', email.last_error)
+            if attempt < OUTBOX_MAX_ATTEMPTS:
+                self.assertEqual(email.body, 'body')
+                self.assertGreaterEqual(email.next_attempt_at, before + retry_delay(attempt))
+                # not due yet
+                self.assertEqual(send_queued(), (0, 0))
+                OutgoingEmail.objects.filter(pk=email.pk).update(next_attempt_at=timezone.now())
+        self.assertEqual((email.status, email.body), ('failed', ''))
+
+
+class OTPBackendTestsMixin:
+    backend_class = None
+
+    def setUp(self):
+        cache.clear()
+        self.backend = self.backend_class()
+
+    def test_code_is_single_use(self):
+        code = self.backend.issue('Newbie@iilm.edu')
+        self.assertFalse(self.backend.verify('newbie@iilm.edu', '000000' if code != '000000' else '111111'))
+        self.assertTrue(self.backend.verify('newbie@iilm.edu', code))
+        self.assertFalse(self.backend.verify('newbie@iilm.edu', code))
+
+    def test_reissue_replaces_code(self):
+        first = self.backend.issue('newbie@iilm.edu')
+        second = self.backend.issue('newbie@iilm.edu')
+        if first != second:
+            self.assertFalse(self.backend.verify('newbie@iilm.edu', first))
+        self.assertTrue(self.backend.verify('newbie@iilm.edu', second))
+
+    def test_rate_limit_per_email(self):
+        for _ in range(OTP_RATE_LIMIT):
+            self.backend.issue('newbie@iilm.edu')
+        with self.assertRaises(OTPRateLimited):
+            self.backend.issue('newbie@iilm.edu')
+        self.backend.issue('someone-else@iilm.edu')
+
+    def test_too_many_wrong_guesses_burn_the_code(self):
+        code = self.backend.issue('newbie@iilm.edu')
+        wrong = f"{(int(code) + 1) % 1000000:06d}"
+        for _ in range(OTP_MAX_ATTEMPTS):
+            self.assertFalse(self.backend.verify('newbie@iilm.edu', wrong))
+        self.assertFalse(self.backend.verify('newbie@iilm.edu', code))
+
+
+class DatabaseOTPBackendTests(OTPBackendTestsMixin, TestCase):
+    backend_class = DatabaseOTPBackend
+
+    def test_expired_codes_are_rejected_and_purged(self):
+        code = self.backend.issue('newbie@iilm.edu')
+        stale = timezone.now() - timezone.timedelta(seconds=max(OTP_TTL, OTP_RATE_WINDOW) + 1)
+        UserOTP.objects.update(created_at=stale, window_started_at=stale)
+        self.assertFalse(self.backend.verify('newbie@iilm.edu', code))
+        out = StringIO()
+        call_command('purge_expired_otps', stdout=out)
+        self.assertIn('Purged 1', out.getvalue())
+        self.assertFalse(UserOTP.objects.exists())
+
+    def test_signup_then_verify(self):
+        self.client.post(reverse('signup'), {
+            'username': 'newbie', 'email': 'newbie@iilm.edu',
+            'password1': 'a-long-Passw0rd', 'password2': 'a-long-Passw0rd',
+        })
+        code = re.search(r'Your OTP is (\d{6})', OutgoingEmail.objects.get().body).group(1)
+        response = self.client.post(reverse('verify_otp'), {'email': 'newbie@iilm.edu', 'otp': code})
+        self.assertRedirects(response, reverse('dashboard'), fetch_redirect_response=False)
+        self.assertTrue(CustomUser.objects.filter(username='newbie').exists())
+
+
+class CacheOTPBackendTests(OTPBackendTestsMixin, TestCase):
+    backend_class = CacheOTPBackend
+
+
+class ForceProfileCompletionMiddlewareTests(TestCase):
+
+    def setUp(self):
+        self.middleware = ForceProfileCompletionMiddleware(lambda request: 'passed')
+        self.factory = RequestFactory()
+
+    def call(self, path, user, session=None):
+        request = self.factory.get(path)
+        if session is None:
+            session = SessionStore()
+            if isinstance(user, CustomUser):
+                session[SESSION_KEY] = str(user.pk)
+        request.session = session
+        request.user = user
+        return self.middleware(request)
+
+    def test_incomplete_profile_is_redirected(self):
+        user = make_user('new', is_profile_complete=False)
+        self.assertEqual(self.call('/dashboard/', user).url, reverse('profile_completion'))
+        self.assertEqual(self.call(reverse('logout'), user), 'passed')
+
+    def test_exempt_paths_never_touch_the_user(self):
+        for path in ['/static/css/style.css', '/media/cv/x.pdf', '/admin/', reverse('login')]:
+            self.assertEqual(self.call(path, Untouchable(), session=Untouchable()), 'passed')
+
+    def test_anonymous_and_complete_users_pass(self):
+        self.assertEqual(self.call('/dashboard/', AnonymousUser()), 'passed')
+        # anonymous sessions never evaluate the lazy user
+        self.assertEqual(self.call('/dashboard/', Untouchable(), session=SessionStore()), 'passed')
+        user = make_user('done')
+        session = SessionStore()
+        session[SESSION_KEY] = str(user.pk)
+        self.assertEqual(self.call('/dashboard/', user, session), 'passed')
+        self.assertEqual(session[PROFILE_COMPLETE_SESSION_KEY], str(user.pk))
+
+    def test_session_flag_skips_the_user_lookup(self):
+        user = make_user('done')
+        self.client.force_login(user)
+        self.assertEqual(self.client.session[PROFILE_COMPLETE_SESSION_KEY], str(user.pk))
+        session = SessionStore()
+        session.update({SESSION_KEY: str(user.pk), PROFILE_COMPLETE_SESSION_KEY: str(user.pk)})
+        self.assertEqual(self.call('/review-dashboard/stats/', Untouchable(), session), 'passed')
+
+    def test_completing_the_profile_sets_the_flag(self):
+        user = make_user('new', is_profile_complete=False)
+        self.client.force_login(user)
+        self.assertNotIn(PROFILE_COMPLETE_SESSION_KEY, self.client.session)
+        CustomUser.objects.filter(pk=user.pk).update(is_profile_complete=True)
+        self.client.get(reverse('profile_completion'))
+        self.assertEqual(self.client.session[PROFILE_COMPLETE_SESSION_KEY], str(user.pk))
+
+
+class Untouchable:
+    """Stand-in for request.user / request.session that fails the test if it is read."""
+
+    def __getattr__(self, name):
+        raise AssertionError(f"{name} was read")
+
+    def __contains__(self, key):
+        raise AssertionError(f"{key} was read")
+
+    def get(self, key, default=None):
+        raise AssertionError(f"{key} was read")
+
+
+class FormProgressPercentTests(TestCase):
+
+    def setUp(self):
+        self.faculty = make_user('faculty1')
+        self.client.force_login(self.faculty)
+
+    def test_percent_is_maintained_on_save(self):
+        progress = UserFormProgress.objects.create(user=self.faculty, patents_progress=True)
+        self.assertEqual((progress.completed_count, progress.percent), (1, 100 // len(PROGRESS_FIELDS)))
+        progress.book_progress = True
+        progress.save(update_fields=['book_progress'])
+        progress.refresh_from_db()
+        self.assertEqual((progress.completed_count, progress.percent), (2, 200 // len(PROGRESS_FIELDS)))
+
+    def test_update_progress_and_dashboard(self):
+        response = self.client.post(reverse('update_progress'), {'field': 'awards_progress', 'value': 'true'})
+        self.assertEqual(response.json()['percent'], 100 // len(PROGRESS_FIELDS))
+        self.assertEqual(self.client.get(reverse('dashboard')).context['percent'], 100 // len(PROGRESS_FIELDS))
+        # only step flags can be written through this endpoint
+        response = self.client.post(reverse('update_progress'), {'field': 'user_id', 'value': 'true'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_recompute_command(self):
+        UserFormProgress.objects.create(user=self.faculty)
+        UserFormProgress.objects.update(**{field: True for field in PROGRESS_FIELDS})
+        out = StringIO()
+        call_command('recompute_form_progress', stdout=out)
+        self.assertIn('1 changed', out.getvalue())
+        self.assertEqual(UserFormProgress.objects.get().percent, 100)
+
+
+class CategorySubmissionViewTests(TestCase):
+    PATENT = {'title_of_patent': 'Solar cell', 'status': 'filed', 'jurisdiction': 'national', 'type': 'utility', 'num_of_authors_from_iilm': 1}
+
+    def setUp(self):
+        self.faculty = make_user('faculty1')
+        self.client.force_login(self.faculty)
+
+    def test_post_saves_record_submission_and_progress(self):
+        response = self.client.post(reverse('patents'), self.PATENT)
+        self.assertRedirects(response, reverse('dashboard'))
+        patent = Patents.objects.get()
+        self.assertEqual(patent.user, self.faculty)
+        submission = FacultySubmission.objects.get()
+        self.assertEqual((submission.submission_type, submission.title), ('patents', 'Solar cell'))
+        self.assertEqual(submission.content['status'], 'filed')
+        progress = UserFormProgress.objects.get(user=self.faculty)
+        self.assertTrue(progress.patents_progress)
+        self.assertEqual(progress.completed_count, 1)
+
+        # a second patent leaves the already-set flag and its count alone
+        self.client.post(reverse('patents'), self.PATENT)
+        self.assertEqual(Patents.objects.count(), 2)
+        self.assertEqual(UserFormProgress.objects.get(user=self.faculty).completed_count, 1)
+
+    def test_category_without_progress_flag(self):
+        response = self.client.post(reverse('publications_update'), {'title_of_publication': 'Notes'})
+        self.assertRedirects(response, reverse('dashboard'), fetch_redirect_response=False)
+        self.assertEqual(PublicationsUpdate.objects.get().user, self.faculty)
+        self.assertEqual(FacultySubmission.objects.get().title, 'Notes')
+        self.assertFalse(UserFormProgress.objects.exists())
+
+    def test_owner_is_not_a_form_field(self):
+        other = make_user('faculty2')
+        response = self.client.get(reverse('patents'))
+        self.assertNotIn('user', response.context['form'].fields)
+        self.client.post(reverse('patents'), dict(self.PATENT, user=other.pk))
+        self.assertEqual(Patents.objects.get().user, self.faculty)
+
+    def test_login_required(self):
+        self.client.logout()
+        response = self.client.get(reverse('curriculum_development'))
+        self.assertEqual(response.status_code, 302)
+        self.assertIn(reverse('login'), response['Location'])
+
+
+class BenchmarkTests(TestCase):
+
+    def test_seed_institution(self):
+        institution = seed_institution(schools=1, departments=2, faculty=4, submissions_per_user=20, seed=7)
+        self.assertEqual((len(institution.deans), len(institution.cluster_heads), len(institution.faculty)), (1, 2, 4))
+        self.assertEqual(institution.rows['FacultySubmission'], 80)
+        self.assertEqual(FacultySubmission.objects.count(), 80)
+        self.assertEqual(sum(model.objects.count() for model in UserActivityCounters.COUNTED_MODELS.values()), 80)
+        self.assertEqual(SubmissionReview.objects.count(), institution.rows['SubmissionReview'])
+        self.assertFalse(FacultySubmission.objects.exclude(department__in=[head.department for head in institution.cluster_heads]).exists())
+
+        # bulk_create skips the receivers, so the denormalized rows are written by the seeder
+        user = institution.faculty[0]
+        self.assertEqual(UserActivityCounters.objects.get(user=user).as_dict(), UserActivityCounters.counts_for(user.pk))
+        progress = UserFormProgress.objects.get(user=user)
+        self.assertEqual(progress.completed_count, len(PROGRESS_FIELDS))
+        self.assertEqual(SubmissionContentValue.objects.count(), sum(
+            len(SubmissionContentValue.extract(submission)) for submission in FacultySubmission.objects.all()
+        ))
+        # submitted_at is spread out rather than stamped at insert time
+        self.assertGreater(FacultySubmission.objects.values('submitted_at').distinct().count(), 1)
+        self.assertGreater(
+            FacultySubmission.objects.order_by('submitted_at').first().submitted_at,
+            timezone.now() - timezone.timedelta(days=4 * 365),
+        )
+
+    def test_seed_is_deterministic(self):
+        seed_institution(1, 1, 2, 5, seed=3, prefix='a-')
+        seed_institution(1, 1, 2, 5, seed=3, prefix='b-')
+        titles = {}
+        for prefix in ('a-', 'b-'):
+            titles[prefix] = list(
+                FacultySubmission.objects.filter(user__username__startswith=prefix).order_by('pk').values_list('title', 'status', 'content')
+            )
+        self.assertEqual(titles['a-'], titles['b-'])
+
+    def test_seed_portal_command(self):
+        out = StringIO()
+        call_command('seed_portal', faculty=3, submissions_per_user=4, schools=1, departments=1, stdout=out, stderr=StringIO())
+        self.assertEqual(FacultySubmission.objects.count(), 12)
+        self.assertIn('12 FacultySubmission', out.getvalue())
+
+    def test_report_and_baseline_comparison(self):
+        users, submission = benchmark_subjects(seed_institution(1, 1, 2, 18))
+        routes = run_benchmark(users, submission, names={'dashboard', 'review_dashboard', 'submission_detail_review'}, repeat=2)
+        self.assertEqual(set(routes), {'dashboard', 'review_dashboard', 'submission_detail_review'})
+        self.assertEqual(routes['review_dashboard']['faculty']['status'], 302)
+        self.assertEqual(routes['submission_detail_review']['dean']['status'], 200)
+        result = routes['dashboard']['faculty']
+        self.assertEqual(result['status'], 200)
+        self.assertGreater(result['queries'], 0)
+        self.assertLessEqual(result['p50_ms'], result['p95_ms'])
+
+        report = {'routes': routes}
+        self.assertEqual(compare_reports(report, report), [])
+        baseline = {'routes': {'dashboard': {'faculty': dict(result, queries=result['queries'] - 1)}}}
+        self.assertEqual(len(compare_reports(report, baseline)), 1)
+
+    def test_write_benchmark_needs_a_submission_per_review(self):
+        institution = seed_institution(1, 1, 2, 3)
+        ids = list(FacultySubmission.objects.values_list('pk', flat=True))
+        with self.assertRaises(ValueError):
+            run_write_benchmark(institution.deans, ids, writers=2, per_writer=4)
+
+
+class RequestProfilingTests(TestCase):
+
+    def setUp(self):
+        recorder.reset()
+        self.addCleanup(recorder.reset)
+
+    def view(self, request):
+        CustomUser.objects.count()
+        return HttpResponse(engines['django'].from_string('{{ n }}').render({'n': 1}))
+
+    def test_histogram(self):
+        histogram = Histogram()
+        for value in (0.5, 3, 3, 40, 70000):
+            histogram.add(value)
+        self.assertEqual((histogram.count, histogram.max), (5, 70000))
+        self.assertEqual(histogram.percentile(0.5), 5)
+        self.assertEqual(histogram.percentile(1.0), 70000)
+        merged = Histogram.from_dict(histogram.as_dict())
+        merged.merge(histogram)
+        self.assertEqual(merged.count, 10)
+
+    def test_off_unless_enabled(self):
+        with self.assertRaises(MiddlewareNotUsed):
+            RequestProfilingMiddleware(self.view)
+
+    @override_settings(PORTAL_PROFILING=True)
+    def test_sampled_requests_are_recorded_by_url_name(self):
+        middleware = RequestProfilingMiddleware(self.view)
+        middleware.sample_rate, middleware.memory_rate = 1.0, 0.0
+        request = RequestFactory().get('/dashboard/')
+        request.resolver_match = resolve('/dashboard/')
+        for _ in range(3):
+            middleware(request)
+        middleware.memory_rate = 1.0
+        middleware(request)
+
+        [row] = summarize(recorder.collect())
+        self.assertEqual(row['view'], 'dashboard')
+        self.assertEqual(row['wall_ms']['count'], 3)
+        self.assertEqual(row['sql_count']['mean'], 1)
+        self.assertGreater(row['render_ms']['max'], 0)
+        self.assertEqual(row['peak_kib']['count'], 1)
+
+        # unsampled requests are not measured at all
+        middleware.sample_rate = 0.0
+        middleware(request)
+        self.assertEqual(summarize(recorder.collect())[0]['wall_ms']['count'], 3)
+
+    def test_stats_endpoint_and_command(self):
+        recorder.record('dashboard', {'wall_ms': 12.0, 'sql_count': 4})
+        self.client.force_login(make_user('faculty1'))
+        self.assertEqual(self.client.get(reverse('portal_stats')).status_code, 302)
+        self.client.force_login(make_user('admin1', is_staff=True))
+        response = self.client.get(reverse('portal_stats'))
+        self.assertEqual(response.json()['views'][0]['wall_ms']['count'], 1)
+
+        out = StringIO()
+        call_command('portal_stats', stdout=out)
+        self.assertIn('dashboard', out.getvalue())
+
+    def test_command_reads_snapshots_flushed_by_other_processes(self):
+        worker = ProfileRecorder()
+        worker.key = 'portal_stats:web-2:4242'
+        worker.record('review_dashboard', {'wall_ms': 30.0, 'sql_count': 6})
+        worker.flush()
+
+        out = StringIO()
+        call_command('portal_stats', stdout=out)
+        self.assertIn('review_dashboard', out.getvalue())
+
+
+class SQLitePragmaTests(TestCase):
+
+    def test_new_sqlite_connections_get_the_configured_pragmas(self):
+        with tempfile.TemporaryDirectory() as directory:
+            wrapper = type(connections['default'])({**connection.settings_dict, 'NAME': os.path.join(directory, 'wal.sqlite3')}, 'pragma_check')
+            try:
+                with wrapper.cursor() as cursor:
+                    values = {}
+                    for pragma in ('journal_mode', 'synchronous', 'busy_timeout', 'cache_size'):
+                        cursor.execute(f"PRAGMA {pragma}")
+                        values[pragma] = cursor.fetchone()[0]
+            finally:
+                wrapper.close()
+        self.assertEqual(values, {'journal_mode': 'wal', 'synchronous': 1, 'busy_timeout': 5000, 'cache_size': -32000})
+
+    def test_tracked_database_file_keeps_its_journal_mode(self):
+        with tempfile.TemporaryDirectory() as directory:
+            name = os.path.join(directory, 'db.sqlite3')
+            wrapper = type(connections['default'])({**connection.settings_dict, 'NAME': name}, 'pragma_check')
+            try:
+                with override_settings(SQLITE_TRACKED_FILES=[name]), wrapper.cursor() as cursor:
+                    cursor.execute("PRAGMA journal_mode")
+                    journal_mode = cursor.fetchone()[0]
+                    cursor.execute("PRAGMA busy_timeout")
+                    busy_timeout = cursor.fetchone()[0]
+            finally:
+                wrapper.close()
+            self.assertFalse(os.path.exists(name + '-wal'))
+        self.assertEqual((journal_mode, busy_timeout), ('delete', 5000))
+
+
+class SlowQueryLogTests(TestCase):
+
+    def test_slow_queries_are_logged_with_plan_and_origin(self):
+        make_user('faculty1')
+        with self.assertLogs('core.slow_queries', 'WARNING') as logs:
+            with connection.execute_wrapper(SlowQueryLogger(connection, threshold_ms=0)):
+                list(CustomUser.objects.filter(username='faculty1'))
+        entry = logs.records[0].slow_query
+        self.assertIn('core_customuser', entry['sql'])
+        self.assertTrue(entry['plan'])
+        self.assertIn('core/tests.py', entry['frame'])
+        self.assertIn('test_slow_queries_are_logged_with_plan_and_origin', entry['frame'])
+
+    def test_plan_reading_and_candidates(self):
+        table = 'core_facultysubmission'
+        self.assertEqual(plan_problems(['SCAN core_facultysubmission', 'USE TEMP B-TREE FOR ORDER BY'], table), ['full scan', 'sort'])
+        self.assertEqual(plan_problems(['SCAN core_facultysubmission USING INDEX core_facult_submitt_2a9dae_idx'], table), [])
+        self.assertEqual(plan_problems(['Sort  (cost=1.0..2.0)', '  ->  Seq Scan on core_facultysubmission'], table), ['full scan', 'sort'])
+
+        sql = (
+            'SELECT "core_facultysubmission"."submitted_at" AS "submitted_at", "core_facultysubmission"."id" AS "pk" '
+            'FROM "core_facultysubmission" WHERE ("core_facultysubmission"."reviewed_by_id" IS NOT NULL '
+            'AND "core_facultysubmission"."status" IN (%s, %s)) ORDER BY 1 ASC, 2 ASC'
+        )
+        self.assertEqual(candidate_columns(sql, table), ['status', 'submitted_at', 'id'])
+        unordered = sql.partition(' ORDER BY ')[0]
+        self.assertEqual(candidate_columns(unordered, table), ['status', 'reviewed_by_id'])
+
+    def test_index_report_command(self):
+        seed_institution(1, 1, 2, 18)
+        out = StringIO()
+        call_command('index_report', stdout=out)
+        # every review-queue and my-submissions page is read in index order, without a sort
+        self.assertIn('No full scans or unindexed sorts', out.getvalue())
+
+
+class ReplicaRoutingTests(TestCase):
+
+    def setUp(self):
+        self.router = PrimaryReplicaRouter()
+        self.user = make_user('faculty1')
+        self.factory = RequestFactory()
+
+    def route(self, request, write=False):
+        """Run `request` through ReplicaRoutingMiddleware and report where the view's reads would go."""
+        routed = {}
+
+        def get_response(request):
+            middleware.process_view(request, None, (), {})
+            routed['read'] = self.router.db_for_read(FacultySubmission)
+            routed['session'] = self.router.db_for_read(SessionStore().model)
+            if write:
+                self.router.db_for_write(FacultySubmission)
+                routed['after_write'] = self.router.db_for_read(FacultySubmission)
+            return HttpResponse()
+
+        request.user = self.user
+        request.resolver_match = resolve(request.path)
+        # no replica alias exists under test; the middleware only checks for one at startup
+        with mock.patch('core.middleware.REPLICA_DATABASE', 'default'):
+            middleware = ReplicaRoutingMiddleware(get_response)
+        return middleware(request), routed
+
+    def test_middleware_is_dropped_without_a_replica(self):
+        with self.assertRaises(MiddlewareNotUsed):
+            ReplicaRoutingMiddleware(lambda request: HttpResponse())
+
+    def test_reads_go_to_the_primary_outside_requests(self):
+        self.assertEqual(self.router.db_for_read(FacultySubmission), 'default')
+        self.assertEqual(self.router.db_for_write(FacultySubmission), 'default')
+        with request_routing() as state:
+            self.assertEqual(self.router.db_for_read(FacultySubmission), 'default')
+            state['replica'] = True
+            self.assertEqual(self.router.db_for_read(FacultySubmission), 'replica')
+        self.assertFalse(self.router.allow_migrate('replica', 'core'))
+
+    def test_read_only_views_read_from_the_replica_until_they_write(self):
+        response, routed = self.route(self.factory.get(reverse('my_submissions')), write=True)
+        self.assertEqual(routed, {'read': 'replica', 'session': 'default', 'after_write': 'default'})
+        # having written, the client stays on the primary for its next requests
+        self.assertIn(REPLICA_PIN_COOKIE, response.cookies)
+
+        response, routed = self.route(self.factory.get(reverse('review_dashboard')))
+        self.assertEqual(routed['read'], 'replica')
+        self.assertNotIn(REPLICA_PIN_COOKIE, response.cookies)
+
+        response, routed = self.route(self.factory.get(reverse('dashboard')))
+        self.assertEqual(routed['read'], 'default')
+
+    def test_posts_pin_the_client_to_the_primary(self):
+        response, routed = self.route(self.factory.post(reverse('my_submissions')))
+        self.assertEqual(routed['read'], 'default')
+        self.assertEqual(response.cookies[REPLICA_PIN_COOKIE]['max-age'], 15)
+
+        request = self.factory.get(reverse('my_submissions'))
+        request.COOKIES[REPLICA_PIN_COOKIE] = '1'
+        response, routed = self.route(request)
+        self.assertEqual(routed['read'], 'default')
+
+
+class StaticAssetTests(TestCase):
+
+    def test_pages_link_their_stylesheet_instead_of_inlining_it(self):
+        self.client.force_login(make_user('faculty1'))
+        response = self.client.get(reverse('submission_list'))
+        self.assertContains(response, '/static/css/pages/submissions.css')
+        self.assertNotContains(response, '<style')
+
+    def test_uncollected_files_are_linked_unhashed(self):
+        with tempfile.TemporaryDirectory() as directory:
+            storage = PortalStaticFilesStorage(location=directory, base_url='/static/')
+            with self.assertLogs('core.storage', 'WARNING'):
+                self.assertEqual(storage.stored_name('images/iilm.png'), 'images/iilm.png')
@@ -26,6 +26,7 @@ urlpatterns = [
     path('industry-collaboration/', views.industry_collaboration_view, name='industry_collaboration'),
     path('form/', views.form_view, name='form_view'),  # 👈 New form view route
     path('submissions/', views.submission_list_view, name='submission_list'),  # 👈 New route for submissions
+    path('submissions/import/', views.bulk_import_view, name='bulk_import'),
     # path('submissions/<int:submission_id>/', views.submission_detail_view, name='submission_detail'),  # 👈 Detail view for submissions
     path("update-progress/", views.update_progress, name="update_progress"),
     path("annual-faculty-report/", views.annual_faculty_report_view, name="annual_faculty_report"),
@@ -38,8 +39,11 @@ urlpatterns = [
     
     # Review System URLs
     path("review-dashboard/", views.review_dashboard, name="review_dashboard"),
+    path("review-dashboard/stats/", views.review_stats, name="review_stats"),
+    path("review-dashboard/export/", views.review_export, name="review_export"),
     # path("submission-review/<int:submission_id>/", views.submission_detail_review, name="submission_detail_review"),
     path("my-submissions/", views.my_submissions, name="my_submissions"),
+    path("my-submissions/stats/", views.my_submission_stats, name="my_submission_stats"),
     path("faculty-forms/", views.FacultyForms, name="faculty_forms"),
 
     path('password-reset/', auth_views.PasswordResetView.as_view(template_name='password_reset.html'), name='password_reset'),
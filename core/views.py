@@ -1,32 +1,44 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth import login, authenticate, logout
 from django.utils import timezone
-from .forms import SignupForm, LoginForm, ProfileCompletionForm, JournalPublicationForm, ConferencePublicationForm, ResearchProjectsForm, PatentsForm, CopyRightsForm, PhdGuidanceForm, BookChapterForm, BookForm, ConsultancyProjectsForm, EditorialRolesForm, ReviewerRolesForm, AwardsForm, IndustryCollaborationForm, UserFormProgressForm, AnnualFacultyReportForm, ResearchGrantApplicationForm, ConferenceTravelRequestForm, PublicationsUpdateForm, CurriculumDevelopmentForm
-from django.core.mail import send_mail
+from .forms import SignupForm, LoginForm, ProfileCompletionForm
+from .outbox import queue_mail
+from .otp import OTP_TTL, OTPRateLimited, get_otp_backend
+from .middleware import remember_profile_complete
 from django.conf import settings
-import random
 from django.contrib.auth.decorators import login_required
-from .models import UserOTP, JournalPublication
+from .models import JournalPublication
 from django.contrib import messages
 
 from .models import (
-    JournalPublication, ConferencePublication, ResearchProjects, Patents, CopyRights, PhdGuidance, BookChapter, Book, ConsultancyProjects, EditorialRoles, ReviewerRoles, Awards, IndustryCollaboration, UserFormProgress, CustomUser, AnnualFacultyReport, ResearchGrantApplication, ConferenceTravelRequest, PublicationsUpdate, CurriculumDevelopment, Task
+    JournalPublication, ConferencePublication, ResearchProjects, Patents, CopyRights, PhdGuidance, BookChapter, Book, ConsultancyProjects, EditorialRoles, ReviewerRoles, Awards, IndustryCollaboration, UserFormProgress, CustomUser, AnnualFacultyReport, ResearchGrantApplication, ConferenceTravelRequest, PublicationsUpdate, CurriculumDevelopment, Task, UserActivityCounters, PROGRESS_FIELDS
 )
 
-from django.http import JsonResponse
+from django.http import FileResponse, Http404, HttpResponseForbidden, JsonResponse, StreamingHttpResponse
 # Review System Views
 from django.contrib.auth.decorators import user_passes_test
 from django.core.paginator import Paginator
-from .forms import SubmissionReviewForm, SubmissionFilterForm
+from django.utils.functional import SimpleLazyObject
+from .forms import SubmissionReviewForm, SubmissionFilterForm, BulkImportForm
 from .models import FacultySubmission, SubmissionReview
 from django.views.decorators.http import require_POST
-from django.db.models import Q
+from django.views.generic.edit import FormView
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.db import transaction
+from django.urls import reverse_lazy
+from .pagination import KeysetPage, KeysetPaginator
+from .review_queue import cached_review_queue, review_queryset, review_rows_version, submission_status_stats
+from .search import get_search_backend
+from .bulk_import import BulkImportError, import_records, read_rows
+from .export import EXPORT_MODELS, category_rows, csv_stream, submission_rows, xlsx_file
+from .categories import SUBMISSION_CATEGORIES, submission_content, submission_title
+from .activity import user_activity_feed, ACTIVITY_LABELS, ACTIVITY_SORTS, DEFAULT_ACTIVITY_SORT
+from .profiling import TIMING_METRICS, MEMORY_METRICS, recorder, summarize
+from django.contrib.admin.views.decorators import staff_member_required
 
 
 
 
-otp_storage = {} # Temporary storage for OTPs
-
 def signup_view(request):
 
     
@@ -35,8 +47,9 @@ def signup_view(request):
 
     - For POST requests:
         1. Validates the submitted signup form.
-        2. Generates a 6-digit OTP and stores it temporarily in `otp_storage` using the email as the key.
-        3. Sends the OTP to the user's email address.
+        2. Issues a 6-digit OTP for the email through the shared OTP backend (core/otp.py),
+           which expires it after OTP_TTL seconds and rate-limits requests per email.
+        3. Queues the OTP email for the outbox worker (`manage.py send_queued_mail`).
         4. Saves the submitted form data in the session for later use during verification.
         5. Redirects the user to the OTP verification page.
 
@@ -48,14 +61,16 @@ def signup_view(request):
         form = SignupForm(request.POST)
         if form.is_valid():
             email = form.cleaned_data['email']
-            otp = str(random.randint(100000, 999999))
-            otp_storage[email] = otp
-            send_mail(
+            try:
+                otp = get_otp_backend().issue(email)
+            except OTPRateLimited:
+                form.add_error('email', "Too many codes have been requested for this email. Please try again later.")
+                return render(request, 'signup.html', {'form': form})
+            queue_mail(
                 subject = "OTP for First-Time Signup - IILM University",
-                message = f"Dear {form.cleaned_data['username']}\n\nWelcome to IILM University’s portal.\n\nTo complete your first-time signup, please use the One-Time Password (OTP) given below:\n\nYour OTP is {otp}\n\nThis OTP is valid for the next 5 minutes. Please do not share it with anyone for security reasons.\n\nIf you did not request this signup, please ignore this email.\n\nBest Regards, \n\nIILM University",
+                message = f"Dear {form.cleaned_data['username']}\n\nWelcome to IILM University’s portal.\n\nTo complete your first-time signup, please use the One-Time Password (OTP) given below:\n\nYour OTP is {otp}\n\nThis OTP is valid for the next {OTP_TTL // 60} minutes. Please do not share it with anyone for security reasons.\n\nIf you did not request this signup, please ignore this email.\n\nBest Regards, \n\nIILM University",
                 from_email = settings.EMAIL_HOST_USER,
                 recipient_list = [email],
-                fail_silently = False
             )
             request.session['signup_data'] = request.POST
             return render(request, 'verify_otp.html', {'email': email})
@@ -70,13 +85,13 @@ def verify_otp_view(request):
     """
     Handles OTP verification during user signup.
     - Retrieves email and entered OTP from POST data.
-    - Compares with stored OTP for validation.
+    - Checks it against the shared OTP backend; a correct code can only be used once.
     - If valid, creates a new user, logs them in, and redirects to dashboard.
     - If invalid, re-renders OTP page with an error message.
     """
     email = request.POST.get('email')
     entered_otp = request.POST.get('otp')
-    if otp_storage.get(email) == entered_otp:
+    if get_otp_backend().verify(email, entered_otp):
         data = request.session.get('signup_data')
         form = SignupForm(data)
         if form.is_valid():
@@ -123,14 +138,12 @@ def resend_otp(request):
 
         try:
             user = CustomUser.objects.get(username=username)
-            user_otp, created = UserOTP.objects.get_or_create(user=user)
-            user_otp.generate_otp()
-            send_mail(
+            otp = get_otp_backend().issue(user.email)
+            queue_mail(
                 'Your OTP Code',
-                f'Your new OTP is {user_otp.otp}',
+                f'Your new OTP is {otp}',
                 settings.EMAIL_HOST_USER,
                 [user.email],
-                fail_silently=False
             )
 
             messages.success(request, 'OTP has been resent to your email.')
@@ -139,6 +152,9 @@ def resend_otp(request):
         except CustomUser.DoesNotExist:
             messages.error(request, 'User does not exist.')
             return redirect('resend_otp')
+        except OTPRateLimited:
+            messages.error(request, 'Too many codes have been requested. Please try again later.')
+            return redirect('resend_otp')
     
     return render(request, 'resend_otp.html')
 
@@ -158,19 +174,13 @@ def dashboard(request):
     if user.is_authenticated:
         pending_tasks_count = Task.objects.filter(user=user, is_completed=False).count()
 
-    # Get or create user progress
+    # Get or create user progress; the percentage is stored on the row
     progress, created = UserFormProgress.objects.get_or_create(user=user)
-    
-    # Calculate progress percentage
-    fields = [f.name for f in UserFormProgress._meta.get_fields() if f.name.endswith("_progress")]
-    total_fields = len(fields)
-    completed_fields = sum(getattr(progress, f) for f in fields)
-    percent = int((completed_fields / total_fields) * 100) if total_fields > 0 else 0
 
     return render(request, 'dashboard.html', {
         'user': user,
         'progress': progress,
-        'percent': percent
+        'percent': progress.percent
     })
 
 @login_required
@@ -185,6 +195,7 @@ def profile_completion_view(request):
     user = request.user
 
     if user.is_profile_complete:
+        remember_profile_complete(request, user)
         return redirect('dashboard')
     
     if request.method == 'POST':
@@ -194,6 +205,7 @@ def profile_completion_view(request):
             user = form.save(commit=False)
             user.is_profile_complete = True
             user.save()
+            remember_profile_complete(request, user)
             return redirect('dashboard')
     else:
         form = ProfileCompletionForm(instance = user)
@@ -221,467 +233,77 @@ def view_profile(request):
 
 
 
-def journal_publication_view(request):
-
-
-    """
-    Handle journal publication form submission for authenticated users.
-
-    - Redirects to login if the user is not authenticated.
-    - On POST: validates and saves journal publication details linked to the user,
-      updates progress tracking, and redirects to the dashboard.
-    - On GET: displays an empty JournalPublicationForm.
-
-    Args:
-        request (HttpRequest): The HTTP request object.
-
-    Returns:
-        HttpResponse: Rendered template or redirect response.
-    """
-
-    user = request.user
-    if not user.is_authenticated:
-        return redirect('login')
-
-    if request.method == 'POST':
-        form = JournalPublicationForm(request.POST)
-        if form.is_valid():
-            journal_pub = form.save(commit=False)
-            journal_pub.user = request.user  # 👈 Associate user
-            journal_pub.save()
-            messages.success(request, 'Journal publication details saved successfully.')
-
-
-            progress, created = UserFormProgress.objects.get_or_create(user=request.user)
-            progress.journal_publication_progress = True
-            progress.save()
-            return redirect('dashboard')
-    else:
-        form = JournalPublicationForm()
-
-    return render(request, 'journal_publication.html', {'form': form})
-
-def conference_publication_view(request):
-
-    """
-    Handle conference publication form submission for authenticated users.
-
-    - Redirects to login if the user is not authenticated.
-    - On POST: validates and saves conference publication details linked to the user,
-      updates progress tracking, and redirects to the dashboard.
-    - On GET: displays an empty ConferencePublicationForm.
-
-    Args:
-        request (HttpRequest): The HTTP request object.
-
-    Returns:
-        HttpResponse: Rendered template or redirect response.
-    """
-
-    user = request.user
-    if not user.is_authenticated:
-        return redirect('login')
-
-    if request.method == 'POST':
-        form = ConferencePublicationForm(request.POST)
-
-        if form.is_valid():
-            conference_pub = form.save(commit=False)
-            conference_pub.user = request.user  # 👈 Associate user
-            conference_pub.save()  # Save the form data
-
-            
-
-            progress, created = UserFormProgress.objects.get_or_create(user=request.user)
-            progress.conference_publication_progress = True
-            progress.save()  # Save the progress
-            messages.success(request, 'Conference publication details saved successfully.')
-
-            
-            return redirect('dashboard')
-    else:
-        form = ConferencePublicationForm()
-
-    return render(request, 'conference_publication.html', {'form': form})
-
-
-def research_projects_view(request):
-
-    """
-    Handle research projects form submission for authenticated users.
-
-    - Redirects to login if the user is not authenticated.
-    - On POST: validates and saves research project details linked to the user,
-      updates progress tracking, and redirects to the dashboard.
-    - On GET: displays an empty ResearchProjectsForm.
-
-    Args:
-        request (HttpRequest): The HTTP request object.
-
-    Returns:
-        HttpResponse: Rendered template or redirect response
-    """
-
-
-    if request.method == 'POST':
-        form = ResearchProjectsForm(request.POST)
-
-        if form.is_valid():
-            research_project = form.save(commit=False)
-            research_project.user = request.user  # Associate user
-            research_project.save()  # Save the form data
-
-            
-
-            progress, created = UserFormProgress.objects.get_or_create(user=request.user)
-            progress.research_projects_progress = True
-            progress.save()  # Save the progress
-            messages.success(request, 'Research project details saved successfully.')
-
-            
-            return redirect('dashboard')
-    else:
-        form = ResearchProjectsForm()
-
-    return render(request, 'research_projects.html', {'form': form})
-
-
-
-def patents_view(request):
-
-    """
-    Handle patents form submission for authenticated users.
-    - Redirects to login if the user is not authenticated.
-    - On POST: validates and saves patent details linked to the user,
-      updates progress tracking, and redirects to the dashboard.
-    - On GET: displays an empty PatentsForm.
-    Args:
-        request (HttpRequest): The HTTP request object.
-    Returns:
-        HttpResponse: Rendered template or redirect response.
-    """
-
-    if request.method == 'POST':
-        form = PatentsForm(request.POST)
-
-        if form.is_valid():
-            patent = form.save(commit=False)
-            patent.user = request.user  # Associate user
-            patent.save()  # Save the form data
-
-        
-            
-            progress, created = UserFormProgress.objects.get_or_create(user=request.user)
-            progress.patents_progress = True
-            progress.save()  # Save the progress
-            messages.success(request, 'Patent details saved successfully.')
-            return redirect('dashboard')
-    else:
-        form = PatentsForm()
-
-    return render(request, 'patents.html', {'form': form})
-
-def copyrights_view(request):
-
-    """
-    Handle copyrights form submission for authenticated users.
-    - Redirects to login if the user is not authenticated.
-    - On POST: validates and saves copyright details linked to the user,
-      updates progress tracking, and redirects to the dashboard.
-    - On GET: displays an empty CopyRightsForm.
-    Args:
-        request (HttpRequest): The HTTP request object.
-    Returns:
-        HttpResponse: Rendered template or redirect response.
-    """
-
-    if request.method == 'POST':
-        form = CopyRightsForm(request.POST)
-
-        if form.is_valid():
-            copyright = form.save(commit=False)
-            copyright.user = request.user  # Associate user
-            copyright.save()
-
-            
-            progress, created = UserFormProgress.objects.get_or_create(user=request.user)
-            progress.copyrights_progress = True
-            progress.save()  # Save the progress
-            messages.success(request, 'Copyright details saved successfully.')
-            return redirect('dashboard')
-    else:
-        form = CopyRightsForm()
-
-    return render(request, 'copy_rights.html', {'form': form})
-
-def phd_guidance_view(request):
-
-    """
-    Handle PhD guidance form submission for authenticated users.
-    - Redirects to login if the user is not authenticated.
-    - On POST: validates and saves PhD guidance details linked to the user,
-      updates progress tracking, and redirects to the dashboard.
-    - On GET: displays an empty PhdGuidanceForm.
-    Args:
-        request (HttpRequest): The HTTP request object.
-    Returns:
-        HttpResponse: Rendered template or redirect response.
-    """
-
-    if request.method == 'POST':
-        form = PhdGuidanceForm(request.POST)
-
-        if form.is_valid():
-            phd_guidance = form.save(commit=False)
-            phd_guidance.user = request.user  # Associate user
-            phd_guidance.save()  # Save the form data
-
-            
-
-            progress, created = UserFormProgress.objects.get_or_create(user=request.user)
-            progress.phd_guidance_progress = True
-            progress.save()  # Save the progress
-            messages.success(request, 'PhD guidance details saved successfully.')
-            return redirect('dashboard')
-    else:
-        form = PhdGuidanceForm()
-
-    return render(request, 'phd_guidance_form.html', {'form': form})
-
-def book_chapter_view(request):
-
-    """
-    Handle book chapter form submission for authenticated users.
-    - Redirects to login if the user is not authenticated.
-    - On POST: validates and saves book chapter details linked to the user,
-      updates progress tracking, and redirects to the dashboard.
-    - On GET: displays an empty BookChapterForm.
-    Args:
-        request (HttpRequest): The HTTP request object.
-    Returns:
-        HttpResponse: Rendered template or redirect response.
-    """
-
-    if request.method == 'POST':
-        form = BookChapterForm(request.POST)
-
-        if form.is_valid():
-            book_chapter = form.save(commit=False)
-            book_chapter.user = request.user  # Associate user
-            book_chapter.save()  # Save the form data
-
-            
-
-            progress, created = UserFormProgress.objects.get_or_create(user=request.user)
-            progress.book_chapter_progress = True
-            progress.save()  # Save the progress
-            messages.success(request, 'Book chapter details saved successfully.')
-            return redirect('dashboard')
-    else:
-        form = BookChapterForm()
-
-    return render(request, 'bookchapter_form.html', {'form': form})
-
-def book_view(request):
-    """
-    Handle book form submission for authenticated users.
-    - Redirects to login if the user is not authenticated.
-    - On POST: validates and saves book details linked to the user,
-      updates progress tracking, and redirects to the dashboard.
-    - On GET: displays an empty BookForm.
-    Args:
-        request (HttpRequest): The HTTP request object.
-    Returns:
-        HttpResponse: Rendered template or redirect response.
-    """
-
-    if request.method == 'POST':
-        form = BookForm(request.POST)
-
-        if form.is_valid():
-            book = form.save(commit=False)
-            book.user = request.user  # Associate user
-            book.save()  # Save the form data
-
-            
-            progress, created = UserFormProgress.objects.get_or_create(user=request.user)
-            progress.book_progress = True
-            progress.save()  # Save the progress
-            
-            messages.success(request, 'Book details saved successfully.')
-            return redirect('dashboard')
-    else:
-        form = BookForm()
-
-    return render(request, 'book_form.html', {'form': form})
-
-def consultancy_projects_view(request):
+class CategorySubmissionView(LoginRequiredMixin, FormView):
 
     """
-    Handle consultancy projects form submission for authenticated users.
-    - Redirects to login if the user is not authenticated.
-    - On POST: validates and saves consultancy project details linked to the user,
-      updates progress tracking, and redirects to the dashboard.
-    - On GET: displays an empty ConsultancyProjectsForm.
-    Args:
-        request (HttpRequest): The HTTP request object.
-    Returns:
-        HttpResponse: Rendered template or redirect response.
-    """
+    Form page for one faculty submission category, driven by SUBMISSION_CATEGORIES.
 
-    if request.method == 'POST':
-        form = ConsultancyProjectsForm(request.POST)
-
-        if form.is_valid():
-            consultancy_project = form.save(commit=False)
-            consultancy_project.user = request.user  # Associate user
-            consultancy_project.save()  # Save the form data
+    - GET: displays the category's empty ModelForm in its template.
+    - POST: in a single transaction, saves the record for the logged-in user, sets
+      the category's UserFormProgress flag (one conditional UPDATE, skipped for
+      categories without a flag) and creates the matching FacultySubmission for
+      review via create_submission_record; then redirects to the dashboard.
 
-        
-            
-            progress, created = UserFormProgress.objects.get_or_create(user=request.user)
-            progress.consultancy_projects_progress = True
-            progress.save()  # Save the progress
-            messages.success(request, 'Consultancy project details saved successfully.')
-            return redirect('dashboard')
-    else:
-        form = ConsultancyProjectsForm()
-
-    return render(request, 'consultancy_project.html', {'form': form})
-
-def editorial_roles_view(request):
-
-    """
-    Handle editorial roles form submission for authenticated users.
-    - Redirects to login if the user is not authenticated.
-    - On POST: validates and saves editorial role details linked to the user,
-      updates progress tracking, and redirects to the dashboard.
-    - On GET: displays an empty EditorialRolesForm.
-    Args:
-        request (HttpRequest): The HTTP request object.
-    Returns:
-        HttpResponse: Rendered template or redirect response.
+    Each URL binds a category, e.g. CategorySubmissionView.as_view(category='patents').
     """
 
-    if request.method == 'POST':
-        form = EditorialRolesForm(request.POST)
+    category = None
+    success_url = reverse_lazy('dashboard')
 
-        if form.is_valid():
-            editorial_role = form.save(commit=False)
-            editorial_role.user = request.user  # Associate user
-            editorial_role.save()
+    @property
+    def spec(self):
+        return SUBMISSION_CATEGORIES[self.category]
 
+    def get_form_class(self):
+        return self.spec.form_class
 
-            progress, created = UserFormProgress.objects.get_or_create(user=request.user)
-            progress.editorial_roles_progress = True
-            progress.save()
-            messages.success(request, 'Editorial role details saved successfully.')
-            return redirect('dashboard')
-    else:
-        form = EditorialRolesForm()
-
-    return render(request, 'editorial_roles.html', {'form': form})
+    def get_template_names(self):
+        return [self.spec.template_name]
 
+    def get_form_kwargs(self):
+        kwargs = super().get_form_kwargs()
+        kwargs['instance'] = self.spec.form_class._meta.model(user=self.request.user)
+        return kwargs
 
-def reviewer_roles_view(request):
+    def get_form(self, form_class=None):
+        form = super().get_form(form_class)
+        # the owner is always the logged-in user, never a form choice
+        form.fields.pop('user', None)
+        return form
 
-    """
-    Handle reviewer roles form submission for authenticated users.
-    - Redirects to login if the user is not authenticated.
-    - On POST: validates and saves reviewer role details linked to the user,
-      updates progress tracking, and redirects to the dashboard.
-    - On GET: displays an empty ReviewerRolesForm.
-    Args:
-        request (HttpRequest): The HTTP request object.
-    Returns:
-        HttpResponse: Rendered template or redirect response.
-    """
-
-    if request.method == 'POST':
-        form = ReviewerRolesForm(request.POST)
-
-        if form.is_valid():
-            reviewer_role = form.save(commit=False)
-            reviewer_role.user = request.user  # Associate user
-            reviewer_role.save()
-
-
-            progress, created = UserFormProgress.objects.get_or_create(user=request.user)
-            progress.reviewer_roles_progress = True
-            progress.save()
-            messages.success(request, 'Reviewer role details saved successfully.')
-            return redirect('dashboard')
-    else:
-        form = ReviewerRolesForm()
-
-    return render(request, 'reviewer_roles.html', {'form': form})
-
-
-def awards_view(request):
-
-    """
-    Handle awards form submission for authenticated users.
-    - Redirects to login if the user is not authenticated.
-    - On POST: validates and saves award details linked to the user,
-      updates progress tracking, and redirects to the dashboard.
-    - On GET: displays an empty AwardsForm.
-    Args:
-        request (HttpRequest): The HTTP request object.
-    Returns:
-        HttpResponse: Rendered template or redirect response.
-    """
-
-    if request.method == 'POST':
-        form = AwardsForm(request.POST)
-
-        if form.is_valid():
-            award = form.save(commit=False)
-            award.user = request.user  # Associate user
-            award.save()
-
-
-            progress, created = UserFormProgress.objects.get_or_create(user=request.user)
-            progress.awards_progress = True
-            progress.save()
-            messages.success(request, 'Award details saved successfully.')
-            return redirect('dashboard')
-    else:
-        form = AwardsForm()
-
-    return render(request, 'award_form.html', {'form': form})
-
-def industry_collaboration_view(request):
-
-    """
-    Handle industry collaboration form submission for authenticated users.
-    - Redirects to login if the user is not authenticated.
-    - On POST: validates and saves industry collaboration details linked to the user,
-      updates progress tracking, and redirects to the dashboard.
-    - On GET: displays an empty IndustryCollaborationForm.
-    Args:
-        request (HttpRequest): The HTTP request object.
-    Returns:
-        HttpResponse: Rendered template or redirect response.
-    """
-
-    if request.method == 'POST':
-        form = IndustryCollaborationForm(request.POST)
-
-        if form.is_valid():
-            industry_collaboration = form.save(commit=False)
-            industry_collaboration.user = request.user  # Associate user
-            industry_collaboration.save()
-
-
-            progress, created = UserFormProgress.objects.get_or_create(user=request.user)
-            progress.industry_collaboration_progress = True
-            progress.save()
-            messages.success(request, 'Industry collaboration details saved successfully.')
-            return redirect('dashboard')
-    else:
-        form = IndustryCollaborationForm()
-
-    return render(request, 'industry_collaboration.html', {'form': form})
+    def form_valid(self, form):
+        user = self.request.user
+        with transaction.atomic():
+            record = form.save()
+            if self.spec.progress_field:
+                UserFormProgress.mark_complete(user, self.spec.progress_field)
+            create_submission_record(
+                user, self.category,
+                submission_title(self.category, record),
+                submission_content(record, form.fields),
+            )
+        messages.success(self.request, self.spec.success_message)
+        return super().form_valid(form)
+
+
+journal_publication_view = CategorySubmissionView.as_view(category='journal_publication')
+conference_publication_view = CategorySubmissionView.as_view(category='conference_publication')
+research_projects_view = CategorySubmissionView.as_view(category='research_projects')
+patents_view = CategorySubmissionView.as_view(category='patents')
+copyrights_view = CategorySubmissionView.as_view(category='copyrights')
+phd_guidance_view = CategorySubmissionView.as_view(category='phd_guidance')
+book_chapter_view = CategorySubmissionView.as_view(category='book_chapter')
+book_view = CategorySubmissionView.as_view(category='book')
+consultancy_projects_view = CategorySubmissionView.as_view(category='consultancy_projects')
+editorial_roles_view = CategorySubmissionView.as_view(category='editorial_roles')
+reviewer_roles_view = CategorySubmissionView.as_view(category='reviewer_roles')
+awards_view = CategorySubmissionView.as_view(category='awards')
+industry_collaboration_view = CategorySubmissionView.as_view(category='industry_collaboration')
+annual_faculty_report_view = CategorySubmissionView.as_view(category='annual_faculty_report')
+research_grant_application_view = CategorySubmissionView.as_view(category='research_grant_application')
+conference_travel_request_view = CategorySubmissionView.as_view(category='conference_travel_request')
+publications_update_view = CategorySubmissionView.as_view(category='publications_update')
+curriculum_development_view = CategorySubmissionView.as_view(category='curriculum_development')
 
 
 def form_view(request):
@@ -693,32 +315,10 @@ def form_view(request):
         return redirect('login')
     
     # Get all submissions for the current user
-    user_submissions = FacultySubmission.objects.filter(user=user).order_by('-submitted_at')[:10]
+    user_submissions = list(FacultySubmission.objects.filter(user=user).order_by('-submitted_at')[:10])
     
-    # Get individual form submissions to show completion status
-    # Only count models that have user fields
-    form_submissions = {
-        'journal_publications': JournalPublication.objects.filter(user=user).count(),
-        'conference_publications': ConferencePublication.objects.filter(user=user).count(),
-        'research_projects': ResearchProjects.objects.filter(user=user).count(),
-        'patents': Patents.objects.filter(user=user).count(),
-        'copyrights': CopyRights.objects.filter(user=user).count(),
-        'phd_guidance': PhdGuidance.objects.filter(user=user).count(),
-        'book_chapters': BookChapter.objects.filter(user=user).count(),
-        'books': Book.objects.filter(user=user).count(),
-        'consultancy_projects': ConsultancyProjects.objects.filter(user=user).count(),
-        'editorial_roles': EditorialRoles.objects.filter(user=user).count(),
-        'reviewer_roles': ReviewerRoles.objects.filter(user=user).count(),
-        'awards': Awards.objects.filter(user=user).count(),
-        'industry_collaborations': IndustryCollaboration.objects.filter(user=user).count(),
-        # These models don't have user fields, so we'll count all instances for now
-        # TODO: Add user fields to these models in future migrations
-        'annual_reports': AnnualFacultyReport.objects.count(),
-        'research_grants': ResearchGrantApplication.objects.count(),
-        'conference_travels': ConferenceTravelRequest.objects.count(),
-        'publications_updates': PublicationsUpdate.objects.count(),
-        'curriculum_developments': CurriculumDevelopment.objects.count(),
-    }
+    # Per-category counts come from the denormalized counters row (one lookup)
+    form_submissions = UserActivityCounters.for_user(user).as_dict()
     
     context = {
         'user': user,
@@ -728,215 +328,81 @@ def form_view(request):
     
     return render(request, 'form_page.html', context)
 
-def annual_faculty_report_view(request):
-
-    """
-    Handle annual faculty report form submission for authenticated users.
-    - Redirects to login if the user is not authenticated.
-    - On POST: validates and saves annual report details linked to the user,
-      updates progress tracking, and redirects to the dashboard.
-    - On GET: displays an empty AnnualFacultyReportForm.
-    Args:
-        request (HttpRequest): The HTTP request object.
-    Returns:
-        HttpResponse: Rendered template or redirect response.
-    """
-
-    if request.method == 'POST':
-        form = AnnualFacultyReportForm(request.POST, request.FILES)
-
-        if form.is_valid():
-            annual_report = form.save(commit=False)
-            annual_report.user = request.user  # Associate user
-            annual_report.save()
-
-
-            progress, created = UserFormProgress.objects.get_or_create(user=request.user)
-            # progress.annual_faculty_report = True  # Field not in model
-            progress.save()
-            messages.success(request, 'Annual faculty report details saved successfully.')
-            return redirect('dashboard')
-    else:
-        form = AnnualFacultyReportForm()
-
-    return render(request, 'Annual_faculty.html', {'form': form})
-
-def research_grant_application_view(request):
-
-    """
-    Handle research grant application form submission for authenticated users.
-    - Redirects to login if the user is not authenticated.
-    - On POST: validates and saves research grant application details linked to the user,
-      updates progress tracking, and redirects to the dashboard.
-    - On GET: displays an empty ResearchGrantApplicationForm.
-    Args:
-        request (HttpRequest): The HTTP request object.
-    Returns:
-        HttpResponse: Rendered template or redirect response.
-    """
-
-    if request.method == 'POST':
-        form = ResearchGrantApplicationForm(request.POST, request.FILES)
-
-        if form.is_valid():
-            research_grant = form.save(commit=False)
-            research_grant.user = request.user  # Associate user
-            research_grant.save()
-
-
-            progress, created = UserFormProgress.objects.get_or_create(user=request.user)
-            # progress.research_grant_application = True  # Field not in model
-            progress.save()
-            messages.success(request, 'Research grant application details saved successfully.')
-            return redirect('dashboard')
-    else:
-        form = ResearchGrantApplicationForm()
-
-    return render(request, 'research_grant.html', {'form': form})
-
-def conference_travel_request_view(request):
-
-    """
-    Handle conference travel request form submission for authenticated users.
-    - Redirects to login if the user is not authenticated.
-    - On POST: validates and saves conference travel request details linked to the user,
-      updates progress tracking, and redirects to the dashboard.
-    - On GET: displays an empty ConferenceTravelRequestForm.
-    Args:
-        request (HttpRequest): The HTTP request object.
-    Returns:
-        HttpResponse: Rendered template or redirect response.
-    """
-
-    if request.method == 'POST':
-        form = ConferenceTravelRequestForm(request.POST, request.FILES)
-
-        if form.is_valid():
-            travel_request = form.save(commit=False)
-            travel_request.user = request.user  # Associate user
-            travel_request.save()
-
-
-            progress, created = UserFormProgress.objects.get_or_create(user=request.user)
-            # progress.conference_travel_request = True  # Field not in model
-            progress.save()
-            messages.success(request, 'Conference travel request details saved successfully.')
-            return redirect('dashboard')
-    else:
-        form = ConferenceTravelRequestForm()
-
-    return render(request, 'conference_travel.html', {'form': form})
-
-def publications_update_view(request):
-
+def submission_list_view(request):
     """
-    Handle publications update form submission for authenticated users.
+    Handle submission list view for authenticated users.
     - Redirects to login if the user is not authenticated.
-    - On POST: validates and saves publications update details linked to the user,
-      updates progress tracking, and redirects to the dashboard.
-    - On GET: displays an empty PublicationsUpdateForm.
+    - Displays a single paginated feed of every research-output record made by the user.
+    - Supports sorting via the `sort` query parameter (see ACTIVITY_SORTS).
     Args:
         request (HttpRequest): The HTTP request object.
     Returns:
         HttpResponse: Rendered template or redirect response.
     """
+    user = request.user
+    
+    # Ensure user is authenticated
+    if not user.is_authenticated:
+        return redirect('login')
+    
+    sort = request.GET.get('sort', DEFAULT_ACTIVITY_SORT)
+    if sort not in ACTIVITY_SORTS:
+        sort = DEFAULT_ACTIVITY_SORT
+    page_number = request.GET.get('page')
 
-    if request.method == 'POST':
-        form = PublicationsUpdateForm(request.POST)
-
-        if form.is_valid():
-            publications_update = form.save(commit=False)
-            publications_update.user = request.user  # Associate user
-            publications_update.save()
-
-
-            progress, created = UserFormProgress.objects.get_or_create(user=request.user)
-            # progress.publications_update = True  # Field not in model
-            progress.save()
-            messages.success(request, 'Publications update details saved successfully.')
-            return redirect('dashboard')
-    else:
-        form = PublicationsUpdateForm()
-
-    return render(request, 'Publications_update.html', {'form': form})
+    def activity_page():
+        # One UNION ALL over all category models; Paginator adds a single COUNT on top
+        page_obj = Paginator(user_activity_feed(user, sort), 20).get_page(page_number)
+        page_obj.object_list = list(page_obj.object_list)
+        for activity in page_obj.object_list:
+            activity['label'] = ACTIVITY_LABELS.get(activity['kind'], activity['kind'])
+        return page_obj
+
+    # The feed is only queried if the template's cached activity table (keyed on
+    # the counters' updated_at, bumped by every category save) has to be rebuilt.
+    page_obj = SimpleLazyObject(activity_page)
+    return render(request, 'submissions.html', {
+        'activities': SimpleLazyObject(lambda: page_obj.object_list),
+        'page_obj': page_obj,
+        'page_number': page_number,
+        'sort': sort,
+        'activity_version': UserActivityCounters.for_user(user).updated_at,
+    })
 
-def curriculum_development_view(request):
+@login_required
+def bulk_import_view(request):
 
     """
-    Handle curriculum development form submission for authenticated users.
-    - Redirects to login if the user is not authenticated.
-    - On POST: validates and saves curriculum development details linked to the user,
-      updates progress tracking, and redirects to the dashboard.
-    - On GET: displays an empty CurriculumDevelopmentForm.
+    Import many research-output records for the logged-in user from one CSV/XLSX upload.
+    - On GET: displays an empty BulkImportForm.
+    - On POST: streams the file row by row through the category's ModelForm, writes
+      valid rows (each with a pending FacultySubmission for review) in committed chunks,
+      and shows per-row errors for the rest. An unreadable file imports nothing; one
+      that fails part-way keeps the chunks before the failure and says where it stopped.
     Args:
         request (HttpRequest): The HTTP request object.
     Returns:
-        HttpResponse: Rendered template or redirect response.
+        HttpResponse: The upload page, with the import result after a POST.
     """
 
+    result = None
     if request.method == 'POST':
-        form = CurriculumDevelopmentForm(request.POST, request.FILES)
-
+        form = BulkImportForm(request.POST, request.FILES)
         if form.is_valid():
-            curriculum = form.save(commit=False)
-            curriculum.user = request.user  # Associate user
-            curriculum.save()
-
-            progress, created = UserFormProgress.objects.get_or_create(user=request.user)
-            # progress.curriculum_development = True  # Field not in model
-            progress.save()
-            messages.success(request, 'Curriculum development details saved successfully.')
-            return redirect('dashboard')
+            upload = form.cleaned_data['file']
+            kind = form.cleaned_data['record_type']
+            try:
+                result = import_records(kind, request.user, read_rows(upload.file, upload.name))
+            except BulkImportError as e:
+                form.add_error('file', str(e))
+            else:
+                if result.stopped:
+                    messages.warning(request, result.stopped)
+                messages.success(request, f'Imported {result.created} record(s); {result.failed} row(s) had errors.')
     else:
-        form = CurriculumDevelopmentForm()
+        form = BulkImportForm()
 
-    return render(request, 'curriculum_development.html', {'form': form})
-
-def submission_list_view(request):
-    """
-    Handle submission list view for authenticated users.
-    - Redirects to login if the user is not authenticated.
-    - Displays a list of all submissions made by the user.
-    Args:
-        request (HttpRequest): The HTTP request object.
-    Returns:
-        HttpResponse: Rendered template or redirect response.
-    """
-    user = request.user
-    
-    # Ensure user is authenticated
-    if not user.is_authenticated:
-        return redirect('login')
-    
-    # Filter all submissions by the current user
-    journal_pubs = JournalPublication.objects.filter(user=user)
-    conference_pubs = ConferencePublication.objects.filter(user=user)
-    research_projects = ResearchProjects.objects.filter(user=user)
-    patents = Patents.objects.filter(user=user)
-    copyrights = CopyRights.objects.filter(user=user)
-    phd_guidance = PhdGuidance.objects.filter(user=user)
-    book_chapters = BookChapter.objects.filter(user=user)
-    books = Book.objects.filter(user=user)
-    consultancy_projects = ConsultancyProjects.objects.filter(user=user)
-    editorial_roles = EditorialRoles.objects.filter(user=user)
-    reviewer_roles = ReviewerRoles.objects.filter(user=user)
-    awards = Awards.objects.filter(user=user)
-    industry_collaborations = IndustryCollaboration.objects.filter(user=user)
-    return render(request, 'submissions.html', {
-        'journal_pubs': journal_pubs,
-        'conference_pubs': conference_pubs,
-        'research_projects': research_projects,
-        'patents': patents,
-        'copyrights': copyrights,
-        'phd_guidance': phd_guidance,
-        'book_chapters': book_chapters,
-        'books': books,
-        'consultancy_projects': consultancy_projects,
-        'editorial_roles': editorial_roles,
-        'reviewer_roles': reviewer_roles,
-        'awards': awards,
-        'industry_collaborations': industry_collaborations,
-    })
+    return render(request, 'bulk_import.html', {'form': form, 'result': result})
 
 @login_required
 def update_progress(request):
@@ -953,24 +419,19 @@ def update_progress(request):
 
     if request.method == "POST":
         field = request.POST.get("field")  # e.g., 'journal_publication_progress'
-        value = request.POST.get("value").lower() == "true"  # convert to boolean
+        value = request.POST.get("value", "").lower() == "true"  # convert to boolean
 
-        progress, created = UserFormProgress.objects.get_or_create(user=request.user)
-        if hasattr(progress, field):
+        # only the step flags may be toggled from here
+        if field in PROGRESS_FIELDS:
+            progress, created = UserFormProgress.objects.get_or_create(user=request.user)
             setattr(progress, field, value)
-            progress.save()
-
-            # calculate completion %
-            fields = [f.name for f in UserFormProgress._meta.get_fields() if f.name.endswith("_progress")]
-            total_fields = len(fields)
-            completed_fields = sum(getattr(progress, f) for f in fields)
-            percent = int((completed_fields / total_fields) * 100)
+            progress.save()  # refreshes completed_count / percent
 
             return JsonResponse({
                 "success": True,
                 "field": field,
                 "value": value,
-                "percent": percent
+                "percent": progress.percent
             })
 
     return JsonResponse({"success": False}, status=400)
@@ -989,6 +450,27 @@ def is_reviewer(user):
     return user.is_authenticated and user.can_review_submissions()
 
 
+def review_stats_context(counts):
+    return {
+        'total_submissions': counts['total'],
+        'pending_review': counts['pending'],
+        'under_review': counts['under_review'],
+        'approved': counts['approved'],
+        'rejected': counts['rejected'],
+        'needs_revision': counts['needs_revision'],
+    }
+
+
+def my_submissions_stats_context(counts):
+    return {
+        'total': counts['total'],
+        'pending': counts['pending'],
+        'approved': counts['approved'],
+        'rejected': counts['rejected'],
+        'needs_revision': counts['needs_revision'],
+    }
+
+
 @user_passes_test(is_reviewer)
 def review_dashboard(request):
     """
@@ -996,77 +478,127 @@ def review_dashboard(request):
 
     """
 
-    filter_form = SubmissionFilterForm(request.GET)
-    submissions = FacultySubmission.objects.all()
+    search_query = request.GET.get('q', '').strip()
+    if search_query:
+        return review_search_results(request, search_query)
 
-    user = request.user
-
-    # Scope submissions based on role
-    if user.is_dean():
-        # Dean sees only submissions that have been touched by Cluster Head
-        submissions = submissions.filter(
-            reviewed_by__isnull=False,  # cluster head reviewed
-            status__in=['pending', 'under_review', 'needs_revision']  # still open
-        )
-    elif user.is_cluster_head():
-        dept = user.department or ''
-        submissions = submissions.filter(
-            Q(department=dept) | Q(department__isnull=True) | Q(department='')
-        ).filter(
-            reviewed_by__isnull=True  # not yet reviewed by dean
-        )
-    else:
+    # Role-scoped, filtered queue; its statistics are cached until a submission in scope changes
+    submissions, counts, filter_form = cached_review_queue(request.user, request.GET)
+    if submissions is None:
         messages.error(request, "You do not have access to the review dashboard.")
         return redirect("home")
 
-    # Apply default filter (pending-ish statuses)
-    if 'status' not in request.GET or not request.GET.get('status'):
-        submissions = submissions.filter(status__in=['pending', 'under_review', 'needs_revision'])
-    
-    # Apply filters from form
-    if filter_form.is_valid():
-        if filter_form.cleaned_data['status']:
-            submissions = submissions.filter(status=filter_form.cleaned_data['status'])
-        if filter_form.cleaned_data['submission_type']:
-            submissions = submissions.filter(submission_type=filter_form.cleaned_data['submission_type'])
-        if filter_form.cleaned_data['department']:
-            submissions = submissions.filter(department__icontains=filter_form.cleaned_data['department'])
-        if filter_form.cleaned_data['date_from']:
-            submissions = submissions.filter(submitted_at__gte=filter_form.cleaned_data['date_from'])
-        if filter_form.cleaned_data['date_to']:
-            submissions = submissions.filter(submitted_at__lte=filter_form.cleaned_data['date_to'])
-    
-    # Pagination
-    paginator = Paginator(submissions, 10)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
-    
-    # Statistics (always scoped to current role’s queryset)
-    stats = {
-        'total_submissions': submissions.count(),
-        'pending_review': submissions.filter(status='pending').count(),
-        'under_review': submissions.filter(status='under_review').count(),
-        'approved': submissions.filter(status='approved').count(),
-        'rejected': submissions.filter(status='rejected').count(),
-        'needs_revision': submissions.filter(status='needs_revision').count(),
-    }
+    # Cursor pagination on (submitted_at, id): constant cost however deep the page
+    paginator = KeysetPaginator(submissions.select_related('user'), 10, count=counts['total'])
+    page_obj = paginator.get_page(after=request.GET.get('after'), before=request.GET.get('before'))
     
     context = {
         'submissions': page_obj,
+        'rows_version': review_rows_version(page_obj),
         'filter_form': filter_form,
-        'stats': stats,
+        'stats': review_stats_context(counts),
         'user_role': request.user.role,
     }
     
     return render(request, 'review_dashboard.html', context)
 
 
+def review_search_results(request, search_query):
+    """
+    Review dashboard in search mode: the best-ranked matches within the
+    reviewer's scope on one page (at most SEARCH_RESULT_LIMIT, with a notice
+    when more matched), with statistics over every match.
+    """
+    submissions, filter_form = review_queryset(request.user, request.GET)
+    if submissions is None:
+        messages.error(request, "You do not have access to the review dashboard.")
+        return redirect("home")
+
+    backend = get_search_backend()
+    counts = submission_status_stats(backend.filter(submissions, search_query))
+    results = list(backend.search(submissions.select_related('user'), search_query))
+    paginator = KeysetPaginator(submissions, len(results), count=counts['total'])
+
+    context = {
+        'submissions': KeysetPage(results, paginator, has_next=False, has_previous=False),
+        'rows_version': review_rows_version(results),
+        'filter_form': filter_form,
+        'stats': review_stats_context(counts),
+        'user_role': request.user.role,
+        'search_query': search_query,
+        # only the best SEARCH_RESULT_LIMIT matches are listed; say so when there are more
+        'search_truncated': counts['total'] > len(results),
+    }
+
+    return render(request, 'review_dashboard.html', context)
+
+
+@user_passes_test(is_reviewer)
+def review_stats(request):
+    """
+    JSON version of the review dashboard statistics, for widgets that poll.
+    Accepts the same filter parameters as review_dashboard.
+    """
+    submissions, counts, filter_form = cached_review_queue(request.user, request.GET)
+    if submissions is None:
+        return JsonResponse({"success": False}, status=403)
+
+    return JsonResponse({
+        "success": True,
+        "stats": review_stats_context(counts),
+    })
+
+
+@user_passes_test(is_reviewer)
+def review_export(request):
+    """
+    Download submissions as CSV or XLSX for accreditation reports.
+    - `kind=submissions` (default) exports FacultySubmission with the same role scoping,
+      filters and search as review_dashboard; `content` is flattened into columns.
+    - `kind=<category>` (e.g. `patents`) exports that research-output model:
+      institution-wide for deans, the cluster head's own department otherwise
+      (403 for a cluster head without one).
+    - `format=csv` (default) is streamed row by row; `format=xlsx` is spooled to a
+      temporary file first. Either way rows are read in chunks, never all at once.
+    """
+    user = request.user
+    if not (user.is_dean() or user.is_cluster_head()):
+        return HttpResponseForbidden("You do not have access to exports.")
+
+    kind = request.GET.get('kind', 'submissions')
+    if kind == 'submissions':
+        submissions, filter_form = review_queryset(user, request.GET)
+        search_query = request.GET.get('q', '').strip()
+        if search_query:
+            submissions = get_search_backend().filter(submissions, search_query)
+        header, rows = submission_rows(submissions.order_by())
+    elif kind in EXPORT_MODELS:
+        model = EXPORT_MODELS[kind]
+        records = model.objects.all()
+        if not user.is_dean():
+            if not user.department:
+                # filter(user__department=None) would match every unassigned faculty member
+                return HttpResponseForbidden("Your profile has no department to export.")
+            records = records.filter(user__department=user.department)
+        header, rows = category_rows(model, records)
+    else:
+        raise Http404("Unknown export type.")
+
+    filename = f"{kind}-{timezone.localdate():%Y%m%d}"
+    if request.GET.get('format') == 'xlsx':
+        return FileResponse(xlsx_file(header, rows), as_attachment=True, filename=f"{filename}.xlsx")
+
+    response = StreamingHttpResponse(csv_stream(header, rows), content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="{filename}.csv"'
+    return response
+
+
 @user_passes_test(is_reviewer)
 def submission_detail_review(request, submission_id):
     """
     Detailed view of a submission for review
     """
-    submission = get_object_or_404(FacultySubmission, id=submission_id)
+    submission = get_object_or_404(FacultySubmission.objects.select_related('user', 'reviewed_by'), id=submission_id)
     
     # Check if user can review this submission
     if not submission.can_be_reviewed_by(request.user):
@@ -1095,7 +627,7 @@ def submission_detail_review(request, submission_id):
         form = SubmissionReviewForm(instance=submission)
     
     # Get review history
-    review_history = submission.review_history.all()
+    review_history = submission.review_history.select_related('reviewer')
     
     context = {
         'submission': submission,
@@ -1118,19 +650,13 @@ def my_submissions(request):
     if status_filter:
         submissions = submissions.filter(status=status_filter)
     
-    # Pagination
-    paginator = Paginator(submissions, 10)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
-    
-    # Statistics for user's submissions
-    stats = {
-        'total': submissions.count(),
-        'pending': submissions.filter(status='pending').count(),
-        'approved': submissions.filter(status='approved').count(),
-        'rejected': submissions.filter(status='rejected').count(),
-        'needs_revision': submissions.filter(status='needs_revision').count(),
-    }
+    # Statistics for user's submissions in one aggregate query
+    counts = submission_status_stats(submissions)
+    stats = my_submissions_stats_context(counts)
+
+    # Cursor pagination on (submitted_at, id)
+    paginator = KeysetPaginator(submissions, 10, count=counts['total'])
+    page_obj = paginator.get_page(after=request.GET.get('after'), before=request.GET.get('before'))
     
     context = {
         'submissions': page_obj,
@@ -1141,6 +667,23 @@ def my_submissions(request):
     return render(request, 'my_submissions.html', context)
 
 
+
+@login_required
+def my_submission_stats(request):
+    """
+    JSON version of the my_submissions statistics, for widgets that poll.
+    """
+    submissions = FacultySubmission.objects.filter(user=request.user)
+    status_filter = request.GET.get('status')
+    if status_filter:
+        submissions = submissions.filter(status=status_filter)
+
+    return JsonResponse({
+        "success": True,
+        "stats": my_submissions_stats_context(submission_status_stats(submissions)),
+    })
+
+
 def create_submission_record(user, submission_type, title, content, description=""):
     """
     Utility function to create a FacultySubmission record
@@ -1218,4 +761,20 @@ def review_submission(request, submission_id):
     )
 
     messages.success(request, f"Status changed from {previous_status} to {action}.")
-    return redirect('review_dashboard')
\ No newline at end of file
+    return redirect('review_dashboard')
+
+@staff_member_required
+def portal_stats_view(request):
+    """
+    JSON dump of the sampled request profiles (see RequestProfilingMiddleware),
+    merged across every process that has pushed its histograms to the cache.
+    `?sort=` picks the metric whose total time orders the views (default wall_ms).
+    """
+    sort = request.GET.get('sort', 'wall_ms')
+    if sort not in TIMING_METRICS + MEMORY_METRICS:
+        sort = 'wall_ms'
+    return JsonResponse({
+        'enabled': getattr(settings, 'PORTAL_PROFILING', False),
+        'sample_rate': getattr(settings, 'PORTAL_PROFILING_SAMPLE_RATE', None),
+        'views': summarize(recorder.collect(), sort),
+    })
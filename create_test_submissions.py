@@ -1,6 +1,9 @@
 #!/usr/bin/env python
 """
 Create test submissions
+
+Creates a handful of FacultySubmission rows for one user. For load-testing
+volumes use `python manage.py seed_portal` instead.
 """
 import os
 import sys
@@ -15,8 +18,7 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'Faculty_Portal.settings')
 # Setup Django
 django.setup()
 
-from core.models import CustomUser, Submissions
-from datetime import date
+from core.models import CustomUser, FacultySubmission
 
 def create_test_submissions():
     print("Creating test submissions...")
@@ -36,25 +38,31 @@ def create_test_submissions():
         
         # Create some test submissions
         submissions_data = [
-            {'title': 'Research Paper on AI', 'status': 'submitted'},
-            {'title': 'Conference Presentation', 'status': 'under_review'},
-            {'title': 'Journal Article Draft', 'status': 'draft'},
-            {'title': 'Patent Application', 'status': 'approved'},
-            {'title': 'Book Chapter', 'status': 'returned'},
+            {'title': 'Research Paper on AI', 'type': 'journal_publication', 'status': 'pending'},
+            {'title': 'Conference Presentation', 'type': 'conference_publication', 'status': 'under_review'},
+            {'title': 'Journal Article Draft', 'type': 'journal_publication', 'status': 'pending'},
+            {'title': 'Patent Application', 'type': 'patents', 'status': 'approved'},
+            {'title': 'Book Chapter', 'type': 'book_chapter', 'status': 'needs_revision'},
         ]
         
         for data in submissions_data:
-            submission, created = Submissions.objects.get_or_create(
+            submission, created = FacultySubmission.objects.get_or_create(
                 user=user,
                 title=data['title'],
-                defaults={'status': data['status']}
+                defaults={
+                    'submission_type': data['type'],
+                    'status': data['status'],
+                    'content': {'title': data['title']},
+                    'department': user.department,
+                    'school': user.school,
+                }
             )
             if created:
                 print(f"✓ Created submission: {submission.title}")
             else:
                 print(f"- Submission already exists: {submission.title}")
         
-        print(f"\nTotal submissions for {user.username}: {Submissions.objects.filter(user=user).count()}")
+        print(f"\nTotal submissions for {user.username}: {FacultySubmission.objects.filter(user=user).count()}")
         
     except Exception as e:
         print(f"Error: {e}")